@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, ValidationInfo
-from typing import List, Optional
+from typing import Dict, List, Optional
 import re
 
 
@@ -21,6 +21,11 @@ class Settings(BaseSettings):
     # ===========================
     model_load_mode: str = "s3"  # "local" 또는 "s3"
     local_model_path: str = "./temp"
+    model_commodities: List[str] = ["corn"]  # 서버 시작 시 미리 로드/워밍업할 품목
+    # 품목별 모델 위치 {품목: S3 prefix(s3 모드) 또는 로컬 폴더(local 모드)}
+    # 등록되지 않은 품목은 model_s3_prefix / local_model_path 사용
+    model_registry: Dict[str, str] = {}
+    model_load_workers: int = 0  # 품목 동시 로드/갱신 스레드 수 (0 = 품목 수)
     
     @field_validator('model_load_mode')
     @classmethod
@@ -41,6 +46,31 @@ class Settings(BaseSettings):
     aws_region: str = "us-west-2"
     model_s3_bucket: Optional[str] = "aitech-storage"
     model_s3_prefix: str = "models/enhanced_tft/champion"
+    # 모델 파일 다운로드 (병렬 범위 GET + 이어받기 + 무결성 검증)
+    s3_download_part_size_mb: int = 16   # 범위 GET 조각 크기 (MB)
+    s3_download_workers: int = 8         # 조각 동시 다운로드 수
+    s3_verify_etag: bool = True          # ETag(MD5)로 검증 (SSE-KMS / SSE-C 오브젝트는 ChecksumSHA256 또는 크기)
+    s3_checksum_suffix: str = ".sha256"  # 게시된 SHA-256 파일 접미사 (<key><suffix>, 빈 값 = 사용 안 함)
+    # 로컬 모델 저장소 (ETag별 버전 보관 → 네트워크 없이 롤백, 품목 간 같은 파일 공유)
+    model_store_dir: str = "./models_cache/store"
+    model_store_max_versions: int = 5    # 품목별로 보관할 버전 수
+    model_store_max_size_mb: int = 0     # 저장소 크기 한도 (MB, 0 = 무제한, 서빙 중인 파일은 항상 유지)
+    
+    @field_validator('s3_download_part_size_mb', 's3_download_workers')
+    @classmethod
+    def validate_s3_download_parts(cls, v: int) -> int:
+        """다운로드 조각 크기 / 동시 수 양수 검증"""
+        if v <= 0:
+            raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
+        return v
+    
+    @field_validator('model_store_max_versions')
+    @classmethod
+    def validate_model_store_max_versions(cls, v: int) -> int:
+        """보관 버전 수 검증 (서빙 중인 버전 1개 이상)"""
+        if v <= 0:
+            raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
+        return v
     
     @field_validator('model_s3_bucket')
     @classmethod
@@ -61,6 +91,11 @@ class Settings(BaseSettings):
     # 모델 업데이트 설정
     # ===========================
     model_update_check_time: str = "03:00"
+    model_update_check_interval_minutes: int = 0  # 0보다 크면 N분마다 확인 (MODEL_UPDATE_CHECK_TIME 대신)
+    # 최신 모델 감지 방법: manifest(포인터 파일 조건부 GET) / list_after(마지막 키 이후만 나열) / full(전체 나열)
+    model_update_detection: str = "list_after"
+    model_manifest_name: str = "latest.json"  # 품목 prefix 아래 포인터 파일 ({"onnx": ..., "pkl": ...})
+    model_update_full_scan_hours: int = 24  # 가벼운 감지 중에도 이 간격으로 전체 나열 (0 = 처음 1번만)
     
     @field_validator('model_update_check_time')
     @classmethod
@@ -73,6 +108,95 @@ class Settings(BaseSettings):
             )
         return v
     
+    @field_validator('model_update_detection')
+    @classmethod
+    def validate_update_detection(cls, v: str) -> str:
+        """모델 변경 감지 방법 검증"""
+        allowed = {'manifest', 'list_after', 'full'}
+        if v.lower() not in allowed:
+            raise ValueError(f"model_update_detection은 {allowed} 중 하나여야 합니다. 입력값: {v}")
+        return v.lower()
+    
+    # ===========================
+    # ONNX Runtime 세션 설정
+    # ===========================
+    web_concurrency: int = 1  # uvicorn 워커 수 (워커당 스레드 예산 계산용)
+    ort_intra_op_threads: int = 0  # 0 = CPU 코어 수 / 워커 수
+    ort_inter_op_threads: int = 1
+    ort_execution_mode: str = "sequential"  # "sequential" 또는 "parallel"
+    ort_graph_optimization_level: str = "all"  # "disable" / "basic" / "extended" / "all"
+    ort_enable_mem_pattern: bool = True
+    ort_enable_cpu_mem_arena: bool = True
+    ort_use_tuned_profile: bool = True  # auto-tune 결과 파일이 있으면 우선 사용
+    ort_tuned_profile_path: str = "./models_cache/ort_profile.json"
+    ort_optimized_model_cache: bool = True  # 그래프 최적화 결과를 파일로 저장/재사용
+    ort_optimized_cache_dir: str = "./models_cache/optimized"
+    ort_io_binding: bool = True  # 스레드별 입출력 버퍼를 미리 할당해 IO binding으로 재사용
+    
+    # 모델 정밀도: "fp32" / "int8" (INT8 동적 양자화, FP32 대비 검증 통과 시에만 사용)
+    model_precision: str = "fp32"
+    int8_cache_dir: str = "./models_cache/quantized"
+    int8_validation_windows_path: str = "./models_cache/validation_windows.npz"
+    int8_max_median_drift_pct: float = 0.5  # 중앙값 최대 상대 오차 (%)
+    int8_max_quantile_drift_pct: float = 1.0  # 하한/상한 최대 상대 오차 (%)
+    
+    @field_validator('ort_execution_mode')
+    @classmethod
+    def validate_execution_mode(cls, v: str) -> str:
+        """ORT 실행 모드 검증"""
+        allowed = {'sequential', 'parallel'}
+        if v.lower() not in allowed:
+            raise ValueError(f"ort_execution_mode는 {allowed} 중 하나여야 합니다. 입력값: {v}")
+        return v.lower()
+    
+    @field_validator('ort_graph_optimization_level')
+    @classmethod
+    def validate_graph_optimization_level(cls, v: str) -> str:
+        """ORT 그래프 최적화 수준 검증"""
+        allowed = {'disable', 'basic', 'extended', 'all'}
+        if v.lower() not in allowed:
+            raise ValueError(
+                f"ort_graph_optimization_level은 {allowed} 중 하나여야 합니다. 입력값: {v}"
+            )
+        return v.lower()
+    
+    @field_validator('model_precision')
+    @classmethod
+    def validate_model_precision(cls, v: str) -> str:
+        """모델 정밀도 검증"""
+        allowed = {'fp32', 'int8'}
+        if v.lower() not in allowed:
+            raise ValueError(f"model_precision은 {allowed} 중 하나여야 합니다. 입력값: {v}")
+        return v.lower()
+    
+    @field_validator('int8_max_median_drift_pct', 'int8_max_quantile_drift_pct')
+    @classmethod
+    def validate_drift_threshold(cls, v: float) -> float:
+        """양수 검증"""
+        if v <= 0:
+            raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
+        return v
+    
+    @field_validator('web_concurrency', 'ort_inter_op_threads')
+    @classmethod
+    def validate_thread_counts(cls, v: int) -> int:
+        """양수 검증"""
+        if v <= 0:
+            raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
+        return v
+    
+    @field_validator(
+        'ort_intra_op_threads', 'inference_executor_workers', 'inference_process_workers',
+        'model_load_workers', 'model_store_max_size_mb', 'model_update_check_interval_minutes',
+        'model_update_full_scan_hours'
+    )
+    @classmethod
+    def validate_non_negative_or_auto(cls, v: int) -> int:
+        """0 이상 검증 (0 = 자동 / 무제한 / 사용 안 함)"""
+        if v < 0:
+            raise ValueError(f"값은 0 이상이어야 합니다. 입력값: {v}")
+        return v
+    
     # ===========================
     # Feature 설정
     # ===========================
@@ -98,6 +222,62 @@ class Settings(BaseSettings):
             raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
         return v
     
+    # ===========================
+    # 추론 설정
+    # ===========================
+    inference_max_batch_size: int = 64  # session.run 1회당 최대 시나리오 수
+    simulation_sweep_max_points: int = 101  # /api/simulate/sweep 최대 격자 점 수
+    baseline_cache_size: int = 256  # 원본(override 없음) 예측 LRU 캐시 크기
+    
+    # 시뮬레이션 결과 캐시 (SimulationResponse 전체, 키에 모델 버전 포함 → DB 조회 전에 hit 판정)
+    simulation_cache_size: int = 1024
+    simulation_cache_ttl_seconds: int = 3600
+    # 워커 간 캐시 무효화 기록 (WEB_CONCURRENCY > 1일 때만 사용, market_metrics 쓰기를 다른 워커에 전달)
+    cache_invalidation_log: str = "./models_cache/cache_invalidations.log"
+    simulation_override_precision: int = 2  # override 값 반올림 자릿수 (UI 슬라이더 정밀도)
+    
+    # 추론 전용 executor
+    inference_executor_workers: int = 0  # 0 = CPU 코어 수 / intra-op 스레드 수 (micro-batching 시 최대 배치 크기)
+    inference_executor_max_queue: int = 32  # 대기 작업 상한 (초과 시 503)
+    
+    # 동시 추론 요청 micro-batching (thread 백엔드 전용)
+    micro_batch_enabled: bool = False
+    micro_batch_window_ms: float = 3.0  # 첫 요청 이후 요청 수집 시간
+    micro_batch_max_size: int = 32  # 한 번에 실행할 최대 행 수
+    
+    # 추론 백엔드: "thread" (API 프로세스 내 세션) / "process" (워커 프로세스 풀, 텐서 생성 + 추론을 워커에서)
+    inference_backend: str = "thread"
+    inference_process_workers: int = 0  # 0 = CPU 코어 수 / intra-op 스레드 수
+    
+    @field_validator('inference_backend')
+    @classmethod
+    def validate_inference_backend(cls, v: str) -> str:
+        """추론 백엔드 검증"""
+        allowed = {'thread', 'process'}
+        if v.lower() not in allowed:
+            raise ValueError(f"inference_backend는 {allowed} 중 하나여야 합니다. 입력값: {v}")
+        return v.lower()
+    
+    @field_validator('micro_batch_window_ms')
+    @classmethod
+    def validate_micro_batch_window(cls, v: float) -> float:
+        """0 이상 검증"""
+        if v < 0:
+            raise ValueError(f"값은 0 이상이어야 합니다. 입력값: {v}")
+        return v
+    
+    @field_validator(
+        'inference_max_batch_size', 'simulation_sweep_max_points', 'baseline_cache_size',
+        'simulation_cache_size', 'simulation_cache_ttl_seconds', 'inference_executor_max_queue',
+        'micro_batch_max_size'
+    )
+    @classmethod
+    def validate_inference_limits(cls, v: int) -> int:
+        """양수 검증"""
+        if v <= 0:
+            raise ValueError(f"값은 양수여야 합니다. 입력값: {v}")
+        return v
+    
     # ===========================
     # 기타 설정
     # ===========================
@@ -131,6 +311,7 @@ def print_settings_info():
         print(f"AWS 리전: {settings.aws_region}")
     
     print(f"모델 업데이트 체크 시간: {settings.model_update_check_time}")
+    print(f"모델 변경 감지 방법: {settings.model_update_detection}")
     print(f"Encoder 길이: {settings.encoder_length}")
     print(f"예측 길이: {settings.prediction_length}")
     print(f"조정 가능 Feature 개수: {len(settings.adjustable_features)}")
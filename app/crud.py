@@ -2,9 +2,10 @@ from sqlalchemy.orm import Session, defer
 from sqlalchemy import func, and_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence
 
 from . import datatable, dataschemas
+from .ml.metrics import stage_timer
 
 
 # ===========================
@@ -207,6 +208,7 @@ def get_historical_features(
     db: Session, 
     commodity: str, 
     end_date: date, 
+    feature_names: Sequence[str],
     days: int = 60
 ) -> Dict[str, any]:
     """
@@ -218,7 +220,8 @@ def get_historical_features(
         db: DB 세션
         commodity: 품목명
         end_date: 종료 날짜
-        days: 조회할 일수 (기본 60일)
+        feature_names: 조회할 feature 목록 (추론할 모델 입력 레이아웃의 관측 feature)
+        days: 조회할 일수 (기본 60일, 모델 encoder 길이)
     
     Returns:
         과거 데이터
@@ -234,23 +237,25 @@ def get_historical_features(
     start_date = end_date - timedelta(days=days-1)
     
     # 기간 내 모든 market_metrics 조회
-    metrics = db.query(datatable.MarketMetrics)\
-        .filter(
-            datatable.MarketMetrics.commodity == commodity,
-            datatable.MarketMetrics.date >= start_date,
-            datatable.MarketMetrics.date <= end_date
-        )\
-        .order_by(datatable.MarketMetrics.date.asc())\
-        .all()
-    
-    # 날짜별로 그룹핑
-    data_by_date = _group_metrics_by_date(metrics)
-    
-    # 날짜 정렬
-    sorted_dates = sorted(data_by_date.keys())
-    
-    # Feature별로 시계열 데이터 구성
-    features = _build_feature_timeseries(data_by_date, sorted_dates)
+    with stage_timer("db_load"):
+        metrics = db.query(datatable.MarketMetrics)\
+            .filter(
+                datatable.MarketMetrics.commodity == commodity,
+                datatable.MarketMetrics.date >= start_date,
+                datatable.MarketMetrics.date <= end_date
+            )\
+            .order_by(datatable.MarketMetrics.date.asc())\
+            .all()
+    
+    with stage_timer("pivot"):
+        # 날짜별로 그룹핑
+        data_by_date = _group_metrics_by_date(metrics)
+        
+        # 날짜 정렬
+        sorted_dates = sorted(data_by_date.keys())
+        
+        # Feature별로 시계열 데이터 구성
+        features = _build_feature_timeseries(data_by_date, sorted_dates, feature_names)
     
     return {
         'dates': sorted_dates,
@@ -274,25 +279,10 @@ def _group_metrics_by_date(metrics: List[datatable.MarketMetrics]) -> Dict[str,
 
 def _build_feature_timeseries(
     data_by_date: Dict[str, Dict[str, float]], 
-    sorted_dates: List[str]
+    sorted_dates: List[str],
+    feature_names: Sequence[str]
 ) -> Dict[str, List[float]]:
-    """Feature별로 시계열 데이터 구성"""
-    # TFT 모델에 필요한 feature 목록
-    feature_names = [
-        # 가격/거래량 (6개)
-        'close', 'open', 'high', 'low', 'volume', 'EMA',
-        # 뉴스 PCA (32개)
-        *[f'news_pca_{i}' for i in range(32)],
-        # 기후 지수 (3개)
-        'pdsi', 'spi30d', 'spi90d',
-        # 거시경제 (2개)
-        '10Y_Yield', 'USD_Index',
-        # Hawkes Intensity (2개)
-        'lambda_price', 'lambda_news',
-        # 기타
-        'news_count'
-    ]
-    
+    """Feature별로 시계열 데이터 구성 (feature_names 순서, 값이 없는 날은 0.0)"""
     features = {}
     for feature in feature_names:
         features[feature] = []
@@ -204,6 +204,13 @@ class SimulationRequest(BaseModel):
     commodity: str
     base_date: date
     feature_overrides: dict
+    include_paths: bool = False  # True면 7일 전체 예측 경로(중앙값/하한/상한) 포함
+
+class ForecastPath(BaseModel):
+    dates: List[date]
+    predictions: List[float]
+    lower_bounds: List[float]
+    upper_bounds: List[float]
 
 class SimulationResponse(BaseModel):
     original_forecast: float
@@ -211,6 +218,28 @@ class SimulationResponse(BaseModel):
     change: float
     change_percent: float
     feature_impacts: List[FeatureImpact]
+    original_path: Optional[ForecastPath] = None
+    simulated_path: Optional[ForecastPath] = None
+
+class SimulationSweepRequest(BaseModel):
+    commodity: str
+    base_date: date
+    feature: str
+    start: float
+    stop: float
+    step: float
+
+class SweepPoint(BaseModel):
+    value: float
+    forecast: float
+    change: float
+    change_percent: float
+
+class SimulationSweepResponse(BaseModel):
+    feature: str
+    current_value: float
+    original_forecast: float
+    points: List[SweepPoint]
 
 #---------------------------------------------------------------------
 # 배치서버용 스키마 (Bulk / Upsert / Delete)
@@ -273,4 +302,29 @@ class DeleteByDate(BaseModel):
 class BatchResult(BaseModel):
     success: bool
     message: str
-    count: int = 0
\ No newline at end of file
+    count: int = 0
+#---------------------------------------------------------------------
+# 모델 관리 (버전 이력 / 롤백)
+#---------------------------------------------------------------------
+
+class ModelVersion(BaseModel):
+    onnx_key: str
+    onnx_etag: str
+    pkl_key: Optional[str] = None
+    pkl_etag: Optional[str] = None
+    installed_at: datetime
+    cached: bool   # 로컬 저장소에 파일이 남아 있음 (롤백 가능)
+    current: bool  # 현재 서빙 중
+
+class ModelVersionsResponse(BaseModel):
+    commodity: str
+    current_version: Optional[str] = None
+    versions: List[ModelVersion]
+
+class ModelRollbackRequest(BaseModel):
+    version: Optional[str] = None  # onnx S3 key 또는 ETag (없으면 바로 이전 버전)
+
+class ModelRollbackResponse(BaseModel):
+    commodity: str
+    previous_version: Optional[str] = None
+    current_version: str
@@ -0,0 +1,147 @@
+# 추론 결과 캐시
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    스레드 안전 LRU 캐시
+
+    - maxsize 초과 시 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초)이 주어지면 저장 후 ttl이 지난 항목은 miss 처리
+    - hit/miss 카운터 제공
+    - predicate 기반 부분 무효화 (품목/날짜 범위 등)
+    """
+
+    def __init__(self, maxsize: int, name: str = "cache", ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.name = name
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """값 조회 (없으면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """값 저장 (용량 초과 시 LRU 제거)"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        predicate(key)가 True인 항목 제거 (None이면 전체)
+
+        Returns:
+            제거된 항목 수
+        """
+        with self._lock:
+            if predicate is None:
+                count = len(self._data)
+                self._data.clear()
+            else:
+                keys = [key for key in self._data if predicate(key)]
+                for key in keys:
+                    del self._data[key]
+                count = len(keys)
+
+        if count:
+            logger.info(f"🧹 [{self.name}] 캐시 무효화: {count}건")
+        return count
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class InvalidationLog:
+    """
+    워커 프로세스 간 공유 캐시 무효화 기록 (append-only JSON lines 파일)
+
+    한 워커가 append()로 무효화 범위를 기록하면 다른 워커는 다음 캐시 조회 전
+    poll()로 새 기록만 읽어 같은 범위를 지운다. 새 기록이 없으면 stat 1번으로 끝난다.
+    생성 이전의 기록은 읽지 않는다 (그때는 로컬 캐시가 비어 있음).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._offset = self._size()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """기록 추가 (한 줄을 O_APPEND write 1번으로 → 워커가 동시에 써도 줄이 섞이지 않음)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(record) + "\n").encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """마지막 poll 이후 추가된 기록 (자기 기록 포함, 쓰는 중인 마지막 줄은 다음에)"""
+        size = self._size()
+        with self._lock:
+            if size < self._offset:   # 파일이 지워지거나 잘림 → 처음부터
+                self._offset = 0
+            if size == self._offset:
+                return []
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            end = data.rfind(b"\n") + 1
+            self._offset += end
+
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"⚠️ 캐시 무효화 기록을 읽을 수 없습니다: {line[:80]!r}")
+        return records
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
@@ -0,0 +1,146 @@
+# 추론 전용 executor
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import logging
+
+from app.config import settings
+from .metrics import REGISTRY, Counter, Gauge
+from .process_pool import default_process_workers
+from .session_options import get_session_profile
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(RuntimeError):
+    """추론 대기열이 가득 찬 경우"""
+
+
+class InferenceExecutor:
+    """
+    CPU 추론 전용 스레드 풀
+
+    Starlette 공용 스레드풀과 분리해, 시뮬레이션 버스트가 다른 sync 라우트
+    (예측 조회, 배치 쓰기)를 굶기지 않도록 한다.
+    - max_workers: 동시에 session.run 하는 스레드 수 (ORT intra-op 스레드를 고려해 산정)
+    - max_queue: 대기 작업 수 상한 (초과 시 InferenceQueueFullError)
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self.completed = 0
+        self.rejected = 0
+        logger.info(f"추론 executor 초기화: workers={max_workers}, max_queue={max_queue}")
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """fn(*args, **kwargs)를 추론 스레드에서 실행하고 결과를 await"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise InferenceQueueFullError(
+                    f"추론 대기열이 가득 찼습니다 (대기 {self._queued}건 / 최대 {self.max_queue}건)"
+                )
+            self._queued += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._call, fn, args, kwargs)
+
+    def _call(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """실행 대기 중인 작업 수"""
+        return self._queued
+
+    def stats(self) -> dict:
+        """executor 상태"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queued,
+            "active": self._active,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ===========================================
+# 싱글톤
+# ===========================================
+
+_inference_executor: Optional[InferenceExecutor] = None
+
+
+def default_executor_workers() -> int:
+    """
+    CPU 코어 수 / 세션당 intra-op 스레드 수 (최소 1)
+
+    micro-batching 사용 시에는 session.run이 batcher 스레드 하나에서 실행되고
+    executor 스레드는 결과를 기다리기만 하므로, 배치를 채울 수 있도록 최대 배치 크기만큼 둔다.
+    process 백엔드에서는 워커 프로세스 수만큼 둔다.
+    """
+    if settings.micro_batch_enabled:
+        return settings.micro_batch_max_size
+    if settings.inference_backend == "process":
+        return settings.inference_process_workers or default_process_workers()
+    cpu_count = os.cpu_count() or 1
+    intra_op_threads = get_session_profile().intra_op_threads
+    return max(1, cpu_count // max(1, intra_op_threads))
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """추론 executor 싱글톤 반환"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor(
+            max_workers=settings.inference_executor_workers or default_executor_workers(),
+            max_queue=settings.inference_executor_max_queue,
+        )
+    return _inference_executor
+
+
+def _collect_executor_metrics():
+    """/metrics 스크레이프 시 executor 대기열 상태"""
+    if _inference_executor is None:
+        return []
+
+    stats = _inference_executor.stats()
+    queue_depth = Gauge("inference_executor_queue_depth", "추론 executor 대기 작업 수")
+    active = Gauge("inference_executor_active", "추론 executor 실행 중 작업 수")
+    completed = Counter("inference_executor_completed_total", "추론 executor 완료 작업 수")
+    rejected = Counter("inference_executor_rejected_total", "대기열 초과로 거부된 추론 요청 수")
+    queue_depth.set(stats["queue_depth"])
+    active.set(stats["active"])
+    completed.inc(stats["completed"])
+    rejected.inc(stats["rejected"])
+    return [queue_depth, active, completed, rejected]
+
+
+REGISTRY.register_collector(_collect_executor_metrics)
+
+
+def shutdown_inference_executor() -> None:
+    """서버 종료 시 executor 정리"""
+    global _inference_executor
+    if _inference_executor is not None:
+        _inference_executor.shutdown()
+        _inference_executor = None
@@ -0,0 +1,267 @@
+# 모델 입력 feature 레이아웃 (pkl / ONNX 메타데이터 → 불변 레이아웃 객체)
+import hashlib
+import json
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# 기본 레이아웃 (메타데이터가 없는 모델용)
+# ===========================================
+
+# Feature 순서 (총 52개)
+DEFAULT_FEATURE_ORDER: Tuple[str, ...] = (
+    # Unknown Time-Varying (46개)
+    'close', 'open', 'high', 'low', 'volume', 'EMA',  # 가격/거래량 6개
+    *[f'news_pca_{i}' for i in range(32)],  # 뉴스 PCA 32개
+    'pdsi', 'spi30d', 'spi90d',  # 기후 지수 3개
+    '10Y_Yield', 'USD_Index',  # 거시경제 2개
+    'lambda_price', 'lambda_news',  # Hawkes Intensity 2개
+    'news_count',  # 뉴스 개수 1개
+    # Known Time-Varying (3개)
+    'time_idx', 'day_of_year', 'relative_time_idx',
+    # Static (3개)
+    'encoder_length', 'close_center', 'close_scale',
+)
+
+# 서비스가 직접 생성하는 feature (DB에서 읽지 않음)
+TIME_FEATURES = frozenset({'time_idx', 'day_of_year', 'relative_time_idx'})
+STATIC_FEATURES = frozenset({'encoder_length', 'close_center', 'close_scale'})
+KNOWN_FEATURES = TIME_FEATURES | STATIC_FEATURES
+
+DEFAULT_ENCODER_LENGTH = 60
+DEFAULT_DECODER_LENGTH = 7
+
+# 메타데이터 키 (pkl dict 키 / ONNX custom metadata 키)
+_ORDER_KEYS = ('feature_order', 'reals', 'feature_names')
+_ENCODER_LENGTH_KEYS = ('encoder_length', 'max_encoder_length')
+_DECODER_LENGTH_KEYS = ('decoder_length', 'prediction_length', 'max_prediction_length')
+
+
+@dataclass(frozen=True, eq=False)
+class FeatureLayout:
+    """
+    모델 입력 레이아웃 (모델 로드 시 1회 컴파일, 이후 읽기 전용)
+
+    DB pivot(crud)과 텐서 빌더가 같은 객체를 공유한다.
+    - feature_order: encoder_cont / decoder_cont 마지막 축의 컬럼 순서
+    - observed_features: market_metrics에서 읽어오는 feature (KNOWN_FEATURES 외 전부)
+    - scalers: {feature: (center, scale)} (pkl에 있을 때만)
+    """
+
+    feature_order: Tuple[str, ...]
+    encoder_length: int = DEFAULT_ENCODER_LENGTH
+    decoder_length: int = DEFAULT_DECODER_LENGTH
+    scalers: Mapping[str, Tuple[float, float]] = field(default_factory=dict)
+    source: str = "default"
+
+    def __post_init__(self):
+        order = tuple(self.feature_order)
+        if len(set(order)) != len(order):
+            raise ValueError(f"feature 이름이 중복됩니다: {order}")
+
+        column_index = {name: i for i, name in enumerate(order)}
+        observed = tuple((name, i) for i, name in enumerate(order) if name not in KNOWN_FEATURES)
+        known_names = tuple(name for name in order if name in KNOWN_FEATURES)
+        total = self.encoder_length + self.decoder_length
+        time_idx = np.arange(total, dtype=np.float64)
+        relative_time = time_idx / float(total)
+        time_idx.setflags(write=False)
+        relative_time.setflags(write=False)
+
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(json.dumps([order, self.encoder_length, self.decoder_length]).encode())
+
+        compiled = {
+            'feature_order': order,
+            'scalers': MappingProxyType(dict(self.scalers)),
+            'column_index': MappingProxyType(column_index),
+            'observed_columns': observed,
+            'observed_index': MappingProxyType(dict(observed)),
+            'observed_features': tuple(name for name, _ in observed),
+            'known_names': known_names,
+            'known_indices': tuple(column_index[name] for name in known_names),
+            'total_length': total,
+            'time_idx_values': time_idx,
+            'relative_time_values': relative_time,
+            'fingerprint': digest.hexdigest(),
+        }
+        for name, value in compiled.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def num_features(self) -> int:
+        return len(self.feature_order)
+
+    def __repr__(self) -> str:
+        return (
+            f"FeatureLayout(features={self.num_features}, encoder={self.encoder_length}, "
+            f"decoder={self.decoder_length}, scalers={len(self.scalers)}, source={self.source})"
+        )
+
+
+DEFAULT_LAYOUT = FeatureLayout(DEFAULT_FEATURE_ORDER)
+
+
+# ===========================================
+# 레이아웃 컴파일
+# ===========================================
+
+def build_layout(preprocessing_info: Optional[dict] = None, session=None) -> FeatureLayout:
+    """
+    모델 메타데이터로 레이아웃 생성
+
+    우선순위: ONNX custom metadata → 전처리 pkl → 기본 레이아웃.
+    feature 순서는 ONNX encoder_cont 입력의 마지막 차원과 개수가 맞을 때만 채택한다.
+
+    Args:
+        preprocessing_info: 전처리 pkl 내용 (dict)
+        session: ONNX InferenceSession (입력 shape / custom metadata 확인용)
+    """
+    info = preprocessing_info if isinstance(preprocessing_info, dict) else {}
+    metadata = _onnx_metadata(session)
+    input_dims = _input_dims(session)
+    expected_features = input_dims.get('encoder_cont', (None, None, None))[2]
+
+    # 1) feature 순서
+    order, source = DEFAULT_FEATURE_ORDER, "default"
+    for candidate_source, values in (("onnx", metadata), ("pkl", info)):
+        candidate = _first(values, _ORDER_KEYS, _as_names)
+        if not candidate:
+            continue
+        if expected_features is not None and len(candidate) != expected_features:
+            logger.info(
+                f"{candidate_source} feature 목록 개수({len(candidate)})가 "
+                f"모델 입력({expected_features})과 다름 → 무시"
+            )
+            continue
+        order, source = candidate, candidate_source
+        break
+
+    if source == "default" and expected_features is not None and expected_features != len(order):
+        raise ValueError(
+            f"모델 입력 feature 수({expected_features})와 기본 레이아웃({len(order)})이 다릅니다. "
+            f"pkl 또는 ONNX 메타데이터에 feature_order를 포함하세요."
+        )
+
+    # 2) Encoder / Decoder 길이 (입력 shape가 고정이면 그 값이 우선)
+    encoder_length = (
+        input_dims.get('encoder_cont', (None, None))[1]
+        or _first(metadata, _ENCODER_LENGTH_KEYS, int)
+        or _first(info, _ENCODER_LENGTH_KEYS, int)
+        or DEFAULT_ENCODER_LENGTH
+    )
+    decoder_length = (
+        input_dims.get('decoder_cont', (None, None))[1]
+        or _first(metadata, _DECODER_LENGTH_KEYS, int)
+        or _first(info, _DECODER_LENGTH_KEYS, int)
+        or DEFAULT_DECODER_LENGTH
+    )
+
+    layout = FeatureLayout(
+        feature_order=tuple(order),
+        encoder_length=int(encoder_length),
+        decoder_length=int(decoder_length),
+        scalers=extract_scalers(info),
+        source=source,
+    )
+    logger.info(f"📐 입력 레이아웃: {layout}")
+    return layout
+
+
+def extract_scalers(info: dict) -> Dict[str, Tuple[float, float]]:
+    """
+    pkl의 스케일러 → {feature: (center, scale)}
+
+    지원 형식:
+    - {'scalers': {feature: scaler}}  (scaler: center_/scale_ 또는 mean_/scale_ 속성, 또는 (center, scale))
+    - {'scaler': StandardScaler, 'feature_names': [...]}  (컬럼별 mean_/scale_)
+    """
+    scalers: Dict[str, Tuple[float, float]] = {}
+
+    per_feature = info.get('scalers')
+    if isinstance(per_feature, dict):
+        for name, scaler in per_feature.items():
+            params = _scaler_params(scaler)
+            if params is not None:
+                scalers[str(name)] = params
+
+    scaler = info.get('scaler')
+    names = _as_names(info.get('feature_names')) or _as_names(getattr(scaler, 'feature_names_in_', None))
+    if scaler is not None and names:
+        center = getattr(scaler, 'mean_', getattr(scaler, 'center_', None))
+        scale = getattr(scaler, 'scale_', None)
+        if center is not None and scale is not None:
+            center = np.broadcast_to(np.asarray(center, dtype=np.float64), len(names))
+            scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), len(names))
+            for name, c, s in zip(names, center, scale):
+                scalers.setdefault(name, (float(c), float(s)))
+
+    return scalers
+
+
+def _scaler_params(scaler) -> Optional[Tuple[float, float]]:
+    """스케일러 1개 → (center, scale) (컬럼 1개짜리만)"""
+    if isinstance(scaler, (tuple, list)) and len(scaler) == 2:
+        return float(scaler[0]), float(scaler[1])
+    if isinstance(scaler, dict) and 'center' in scaler and 'scale' in scaler:
+        return float(scaler['center']), float(scaler['scale'])
+
+    center = getattr(scaler, 'center_', getattr(scaler, 'mean_', None))
+    scale = getattr(scaler, 'scale_', None)
+    if center is None or scale is None:
+        return None
+    center, scale = np.ravel(center), np.ravel(scale)
+    if center.size != 1 or scale.size != 1:
+        return None
+    return float(center[0]), float(scale[0])
+
+
+def _onnx_metadata(session) -> dict:
+    """ONNX custom metadata (JSON 문자열 값은 파싱)"""
+    if session is None or not hasattr(session, 'get_modelmeta'):
+        return {}
+    metadata = {}
+    for key, value in session.get_modelmeta().custom_metadata_map.items():
+        try:
+            metadata[key] = json.loads(value)
+        except (TypeError, ValueError):
+            metadata[key] = value
+    return metadata
+
+
+def _input_dims(session) -> Dict[str, tuple]:
+    """{입력 이름: shape} (심볼릭 차원은 None)"""
+    if session is None:
+        return {}
+    return {
+        model_input.name: tuple(dim if isinstance(dim, int) else None for dim in model_input.shape)
+        for model_input in session.get_inputs()
+    }
+
+
+def _as_names(value) -> Optional[Tuple[str, ...]]:
+    """리스트 / 배열 / 쉼표 구분 문자열 → feature 이름 튜플"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(',') if name.strip()]
+    names = tuple(str(name) for name in value)
+    return names or None
+
+
+def _first(values: dict, keys: Sequence[str], convert):
+    """keys 중 처음으로 있는 값을 convert해서 반환 (없으면 None)"""
+    for key in keys:
+        if values.get(key) is not None:
+            try:
+                return convert(values[key])
+            except (TypeError, ValueError):
+                logger.warning(f"⚠️ 메타데이터 '{key}' 해석 실패: {values[key]!r}")
+    return None
@@ -0,0 +1,224 @@
+# 추론 지표 (Prometheus 텍스트 포맷)
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# 요청 단계별 지연시간 버킷 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# 모델 로드 / S3 다운로드 버킷 (초)
+LOAD_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """라벨별 값을 보관하는 지표 공통 부분"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._labels(k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    """현재 값"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """버킷 누적 히스토그램 (_bucket / _sum / _count)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], list] = {}   # {라벨: [버킷별 개수, 합계, 개수]}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 소요 시간(초) 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = self._labels(key, [("le", _format_value(bound))])
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    지표 레지스트리
+
+    - register: 요청 경로에서 직접 갱신하는 지표
+    - register_collector: 스크레이프 시점에 값을 읽어 만드는 지표 (캐시 통계 등)
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Prometheus 텍스트 포맷 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ===========================================
+# 지표 정의
+# ===========================================
+
+INFERENCE_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "inference_stage_seconds",
+    "추론 요청 단계별 소요 시간 (db_load, pivot, tensor_build, session_run, parse, worker_infer)",
+    ["stage"],
+))
+
+MODEL_LOAD_SECONDS = REGISTRY.register(Histogram(
+    "model_load_seconds",
+    "모델 로드(다운로드 + 세션 생성) 소요 시간",
+    ["commodity", "mode"],
+    buckets=LOAD_BUCKETS,
+))
+
+S3_DOWNLOAD_SECONDS = REGISTRY.register(Histogram(
+    "model_s3_download_seconds",
+    "S3 모델 파일 다운로드 소요 시간",
+    ["file"],
+    buckets=LOAD_BUCKETS,
+))
+
+S3_DOWNLOAD_BYTES = REGISTRY.register(Counter(
+    "model_s3_download_bytes_total",
+    "S3 모델 파일 다운로드 누적 바이트",
+    ["file"],
+))
+
+MODEL_UPDATE_CHECKS = REGISTRY.register(Counter(
+    "model_update_checks_total",
+    "S3 최신 모델 확인 횟수 (manifest_not_modified, manifest, list_after, full)",
+    ["method"],
+))
+
+MICRO_BATCH_ROWS = REGISTRY.register(Histogram(
+    "micro_batch_rows",
+    "micro-batching 1회 실행 행 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+))
+
+MICRO_BATCH_QUEUE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "micro_batch_queue_wait_seconds",
+    "micro-batching 대기열 대기 시간",
+))
+
+
+def stage_timer(stage: str):
+    """추론 단계 소요 시간 기록 (with stage_timer("tensor_build"): ...)"""
+    return INFERENCE_STAGE_SECONDS.time(stage=stage)
+
+
+def render_metrics() -> str:
+    """/metrics 응답 본문"""
+    return REGISTRY.render()
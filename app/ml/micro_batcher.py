@@ -0,0 +1,170 @@
+# 동시 추론 요청 micro-batching
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+import logging
+
+import numpy as np
+
+from .metrics import MICRO_BATCH_QUEUE_WAIT_SECONDS, MICRO_BATCH_ROWS, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# 대기 시간 통계에 보관할 최근 요청 수
+_WAIT_SAMPLES = 1000
+
+
+class _PendingRequest:
+    __slots__ = ("session", "model_inputs", "rows", "future", "enqueued_at")
+
+    def __init__(self, session, model_inputs: Dict[str, np.ndarray]):
+        self.session = session
+        self.model_inputs = model_inputs
+        self.rows = model_inputs['encoder_cont'].shape[0]
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    동시 추론 요청을 모아 한 번의 session.run으로 실행
+
+    첫 요청 도착 후 window_ms 동안(또는 행 수가 max_batch_size에 도달할 때까지)
+    들어온 요청들을 같은 세션끼리 배치 축으로 이어 붙여 추론하고,
+    각 호출자에게 자기 행 범위의 출력만 돌려준다.
+
+    Args:
+        run_fn: (session, model_inputs) → outputs. 실제 추론 함수
+        window_ms: 요청 수집 시간 (밀리초)
+        max_batch_size: 한 번에 실행할 최대 행 수
+    """
+
+    def __init__(self, run_fn: Callable, window_ms: float, max_batch_size: int):
+        self._run_fn = run_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self.batch_sizes: Counter = Counter()      # {실행 행 수: 횟수}
+        self.requests = 0
+        self._waits_ms: deque = deque(maxlen=_WAIT_SAMPLES)
+
+    def run(self, session, model_inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """요청을 큐에 넣고 자기 몫의 출력이 나올 때까지 대기"""
+        return self.submit(session, model_inputs).result()
+
+    def submit(self, session, model_inputs: Dict[str, np.ndarray]) -> Future:
+        """요청을 큐에 넣고 Future 반환"""
+        self._ensure_worker()
+        request = _PendingRequest(session, model_inputs)
+        self._queue.put(request)
+        return request.future
+
+    # ===========================================
+    # 워커 스레드
+    # ===========================================
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._loop, name="micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            rows = first.rows
+            deadline = first.enqueued_at + self.window
+
+            while rows < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    # 수집 시간이 지났어도 이미 대기 중인 요청은 함께 실행
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += item.rows
+
+            self._flush(batch)
+
+    def _flush(self, batch: List[_PendingRequest]):
+        # 같은 세션끼리 묶음 (모델 교체 중 구/신 세션이 섞이지 않도록)
+        groups: Dict[object, List[_PendingRequest]] = {}
+        for request in batch:
+            groups.setdefault(request.session, []).append(request)
+
+        for group in groups.values():
+            started_at = time.monotonic()
+            # 입력 합치기 / 실행 실패는 묶음의 모든 요청에 전달 (워커 스레드는 계속 동작)
+            try:
+                if len(group) == 1:
+                    model_inputs = group[0].model_inputs
+                else:
+                    model_inputs = {
+                        name: np.concatenate([r.model_inputs[name] for r in group], axis=0)
+                        for name in group[0].model_inputs
+                    }
+                # 대기 시간은 micro_batch_queue_wait_seconds, 여기서는 실제 실행 시간만 (묶음당 1번)
+                with stage_timer("session_run"):
+                    outputs = self._run_fn(group[0].session, model_inputs)
+            except Exception as e:
+                for request in group:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in group:
+                request.future.set_result(
+                    [output[offset:offset + request.rows] for output in outputs]
+                )
+                offset += request.rows
+
+            self._record(group, started_at, offset)
+
+    def _record(self, group: List[_PendingRequest], started_at: float, rows: int):
+        MICRO_BATCH_ROWS.observe(rows)
+        with self._stats_lock:
+            self.batch_sizes[rows] += 1
+            self.requests += len(group)
+            for request in group:
+                wait = started_at - request.enqueued_at
+                self._waits_ms.append(wait * 1000)
+                MICRO_BATCH_QUEUE_WAIT_SECONDS.observe(wait)
+
+    # ===========================================
+    # 통계
+    # ===========================================
+
+    def stats(self) -> dict:
+        """배치 크기 분포 / 대기 시간 통계"""
+        with self._stats_lock:
+            batches = sum(self.batch_sizes.values())
+            waits = np.asarray(self._waits_ms) if self._waits_ms else np.zeros(1)
+            return {
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+                "queue_size": self._queue.qsize(),
+                "requests": self.requests,
+                "batches": batches,
+                "avg_requests_per_batch": round(self.requests / batches, 3) if batches else 0.0,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_ms": {
+                    "p50": round(float(np.percentile(waits, 50)), 3),
+                    "p95": round(float(np.percentile(waits, 95)), 3),
+                    "max": round(float(waits.max()), 3),
+                },
+            }
@@ -1,9 +1,28 @@
+import json
 import re
+import threading
+import time
+import weakref
 import onnxruntime as ort
 import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from app.config import settings
+from .feature_layout import DEFAULT_LAYOUT, FeatureLayout, build_layout
+from .preprocessing import Preprocessor, build_preprocessor
+from .metrics import MODEL_LOAD_SECONDS, MODEL_UPDATE_CHECKS, S3_DOWNLOAD_BYTES, S3_DOWNLOAD_SECONDS
+from .quantization import prepare_int8_model, prune_quantized_models, quantized_model_path
+from .model_store import ModelStore
+from .s3_download import MiB, error_code
+from .session_options import (
+    cached_optimized_path,
+    create_session,
+    optimized_source_key,
+    prune_optimized_models,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,15 +31,55 @@ logger = logging.getLogger(__name__)
 _ONNX_PATTERN = re.compile(r"60d_(\d{8})\.onnx$")
 _PKL_PATTERN = re.compile(r"60d_preprocessing_(\d{8})\.pkl$")
 
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    한 품목의 서빙 모델 묶음 (세션 + 전처리 + 버전 정보, 생성 후 불변)
+
+    요청은 시작 시 이 객체를 한 번 잡아 끝까지 같은 버전으로 처리하고,
+    로더는 새 묶음을 따로 만들어 둔 뒤 참조 하나만 바꿔 교체한다.
+    이전 묶음은 처리 중인 요청이 모두 끝나 참조가 사라지면 해제된다.
+    """
+
+    commodity: str
+    session: Any                              # ort.InferenceSession
+    model_path: Path                          # 서빙 중인 onnx 경로 (INT8 모드면 양자화 모델)
+    source_tag: str                           # ONNX 원본 버전 태그 (s3: ETag, local: mtime)
+    onnx_key: str                             # S3 key 또는 로컬 파일 경로
+    pkl_key: Optional[str] = None
+    pkl_etag: Optional[str] = None
+    precision: str = "fp32"
+    preprocessing_info: dict = field(default_factory=dict)
+    layout: FeatureLayout = DEFAULT_LAYOUT
+    preprocessor: Optional[Preprocessor] = None
+    pkl_path: Optional[Path] = None           # 전처리 pkl 로컬 경로 (process 백엔드 워커가 다시 읽음)
+    files: Tuple[Path, ...] = ()              # 이 버전이 사용하는 로컬 파일 (원본 / pkl / INT8 / 최적화 캐시)
+
+    @property
+    def version(self) -> str:
+        """
+        모델 버전 식별자
+
+        - s3 모드  : "<onnx S3 key>@<ETag>"
+        - local 모드: "<onnx 파일 경로>@<mtime>"
+        """
+        version = f"{self.onnx_key}@{self.source_tag}"
+        if self.precision == "int8":
+            version += "+int8"
+        return version
+
 
 class ONNXModelLoader:
     """
     ONNX 모델 로더
 
     두 가지 모드 지원:
-    - local : LOCAL_MODEL_PATH 폴더에서 *.onnx / *.pkl 직접 로드
-    - s3   : S3 prefix 아래에서 날짜(YYYYMMDD) 기준 최신 파일을 찾아 다운로드
-              ETag 기반으로 변경 감지 → 자동 리로드
+    - local : 품목 폴더(MODEL_REGISTRY, 기본 LOCAL_MODEL_PATH)에서 *.onnx / *.pkl 직접 로드
+    - s3   : 품목 S3 prefix(MODEL_REGISTRY, 기본 MODEL_S3_PREFIX) 아래에서
+              날짜(YYYYMMDD) 기준 최신 파일을 찾아 다운로드, ETag 기반으로 변경 감지 → 자동 리로드
 
     S3 키 예시:
       s3://aitech-storage/models/enhanced_tft/champion/60d_20260206.onnx
@@ -31,16 +90,31 @@ class ONNXModelLoader:
         self.mode = settings.model_load_mode
         self.local_path = Path(settings.local_model_path)
 
-        # 캐시 -----------------------------------------------------------------
-        self.sessions: Dict[str, ort.InferenceSession] = {}      # {commodity: session}
-        self.preprocessing_info: Dict[str, dict] = {}             # {commodity: pkl_data}
-        self._loaded_keys: Dict[str, Dict[str, str]] = {}         # {commodity: {"onnx_key":..., "pkl_key":...}}
-        self._etags: Dict[str, Dict[str, str]] = {}               # {commodity: {"model": etag, "pkl": etag}}
+        # 서빙 중인 모델 {commodity: LoadedModel} (교체는 항목 하나의 참조 대입으로만)
+        self._models: Dict[str, LoadedModel] = {}
+        # 진행 중인 로드/업데이트 {key: Future} (같은 key 동시 호출은 1번만 실행)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # 품목별 교체 잠금 (업데이트 확인과 롤백은 같은 품목에서 차례로 실행)
+        self._swap_locks: Dict[str, threading.Lock] = {}
 
-        # S3 클라이언트 (lazy init)
+        # S3 클라이언트 (lazy init, 품목 동시 로드 시 1번만 생성)
         self._s3_client = None
-        # 로컬 캐시 디렉토리 (S3 다운로드용)
-        self._cache_dir = Path("./models_cache")
+        self._s3_client_lock = threading.Lock()
+        # 로컬 모델 저장소 (S3 다운로드용, 버전별 보관 → 롤백)
+        self.store = ModelStore(
+            Path(settings.model_store_dir),
+            max_versions=settings.model_store_max_versions,
+            max_bytes=settings.model_store_max_size_mb * MiB,
+        )
+        # 살아 있는 모델 묶음의 파일 {id(묶음): files} (묶음이 해제되면 weakref.finalize로 제거)
+        # 처리 중인 요청 / 워커 프로세스가 아직 쓰는 버전의 파일은 저장소 정리에서 제외
+        self._live_files: Dict[int, Tuple[Path, ...]] = {}
+        # S3 변경 감지 상태: 마지막으로 확인한 최신 키 / 포인터 파일 (ETag, 키) / 전체 나열 시각
+        self._latest_keys: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._manifests: Dict[str, Tuple[str, Tuple[Optional[str], Optional[str]]]] = {}
+        self._missing_manifests: set = set()
+        self._last_full_scan: Dict[str, float] = {}
 
         logger.info(f"모델 로더 초기화: mode={self.mode}, path={self.local_path}")
 
@@ -55,19 +129,124 @@ class ONNXModelLoader:
         - local 모드: temp/ 폴더에서 파일을 찾아 로드
         - s3 모드  : S3 prefix 아래 최신 파일을 다운로드 후 로드
         """
+        return self.get_model(commodity).session
+
+    def get_model(self, commodity: str = "corn") -> LoadedModel:
+        """
+        현재 서빙 중인 모델 묶음 (미로드 시 로드)
+
+        한 요청 안에서는 이 반환값 하나로 세션 / 레이아웃 / 전처리 / 버전을 모두 읽어야
+        처리 도중 모델이 교체되어도 같은 버전으로 끝난다.
+        미로드 품목에 동시 요청이 몰리면 한 요청만 로드하고 나머지는 그 결과를 기다린다.
+        """
+        model = self._models.get(commodity)
+        if model is not None:
+            return model
+        return self._single_flight(f"load:{commodity}", lambda: self._load(commodity))
+
+    def _load(self, commodity: str) -> LoadedModel:
+        """품목 모델 로드 (single-flight 안에서 실행, 그 사이 로드가 끝났으면 그대로 반환)"""
+        model = self._models.get(commodity)
+        if model is not None:
+            return model
         if self.mode == "local":
             return self._load_local(commodity)
         return self._load_from_s3(commodity)
 
+    def load_all(self, commodities: Optional[List[str]] = None) -> Dict[str, Optional[Exception]]:
+        """
+        여러 품목 모델을 스레드 풀에서 동시에 로드
+
+        Returns:
+            {품목: None(성공) 또는 예외}
+        """
+        return self._map_commodities(self.load_session, commodities)
+
+    def check_and_update_all(
+        self,
+        commodities: Optional[List[str]] = None,
+        prepare: Optional[Callable[[LoadedModel], None]] = None,
+    ) -> List[str]:
+        """
+        여러 품목의 새 모델 여부를 동시에 확인/교체
+
+        Returns:
+            모델이 갱신된 품목 목록
+        """
+        updated = []
+        results = self._map_commodities(
+            partial(self.check_and_update, prepare=prepare), commodities, collect=updated
+        )
+        for commodity, error in results.items():
+            if error is not None:
+                logger.error(f"❌ [{commodity}] 모델 업데이트 확인 실패: {error}")
+        return updated
+
+    def get_model_location(self, commodity: str = "corn") -> str:
+        """품목 모델 위치 (s3 모드: S3 prefix / local 모드: 로컬 폴더)"""
+        location = settings.model_registry.get(commodity)
+        if location:
+            return location
+        return settings.model_s3_prefix if self.mode == "s3" else str(self.local_path)
+
+    @property
+    def sessions(self) -> Dict[str, ort.InferenceSession]:
+        """{품목: 서빙 중인 세션} (읽기 전용 스냅샷)"""
+        return {commodity: model.session for commodity, model in self._models.items()}
+
     def get_preprocessing_info(self, commodity: str = "corn") -> dict:
         """전처리 정보(pkl) 반환. 세션이 없으면 먼저 로드."""
-        if commodity not in self.sessions:
-            self.load_session(commodity)
-        return self.preprocessing_info.get(commodity, {})
+        return self.get_model(commodity).preprocessing_info
 
-    def check_and_update(self, commodity: str = "corn") -> bool:
+    def get_feature_layout(self, commodity: str = "corn") -> FeatureLayout:
+        """
+        현재 모델의 입력 레이아웃 (feature 순서, encoder/decoder 길이, 스케일러)
+
+        모델 로드 시 pkl / ONNX 메타데이터로 컴파일해 둔 객체를 반환하며,
+        아직 로드되지 않았으면 기본 레이아웃을 반환한다 (로드를 유발하지 않음).
+        """
+        model = self._models.get(commodity)
+        return model.layout if model is not None else DEFAULT_LAYOUT
+
+    def get_preprocessor(self, commodity: str = "corn") -> Optional[Preprocessor]:
+        """현재 모델의 전처리 엔진 (미로드 시 None, 로드를 유발하지 않음)"""
+        model = self._models.get(commodity)
+        return model.preprocessor if model is not None else None
+
+    def get_model_version(self, commodity: str = "corn") -> Optional[str]:
+        """현재 로드된 모델 버전 식별자 (LoadedModel.version, 미로드 시 None)"""
+        model = self._models.get(commodity)
+        return model.version if model is not None else None
+
+    def get_model_path(self, commodity: str = "corn") -> Optional[Path]:
+        """현재 서빙 중인 ONNX 파일의 로컬 경로 (INT8 모드면 양자화 모델, 미로드 시 None)"""
+        model = self._models.get(commodity)
+        return model.model_path if model is not None else None
+
+    def get_model_precision(self, commodity: str = "corn") -> Optional[str]:
+        """현재 서빙 중인 모델 정밀도 ("fp32" / "int8", 미로드 시 None)"""
+        model = self._models.get(commodity)
+        return model.precision if model is not None else None
+
+    def get_model_source_tag(self, commodity: str = "corn") -> Optional[str]:
+        """현재 로드된 ONNX 원본 버전 태그 (s3: ETag, local: mtime) - 최적화 모델 캐시 키"""
+        model = self._models.get(commodity)
+        return model.source_tag if model is not None else None
+
+    def check_and_update(
+        self,
+        commodity: str = "corn",
+        prepare: Optional[Callable[[LoadedModel], None]] = None,
+    ) -> bool:
         """
-        S3에 새 모델이 올라왔는지 확인 → 변경됐으면 리로드.
+        S3에 새 모델이 올라왔는지 확인 → 변경됐으면 무중단 교체 (double buffering)
+
+        새 버전은 별도 파일로 받아 세션 / 전처리 묶음을 따로 만들고,
+        prepare(새 묶음)(예: 더미 추론 워밍업)까지 끝난 뒤 참조 하나로 교체한다.
+        그동안 들어온 요청은 기존 모델로 처리되며 로드를 다시 유발하지 않는다.
+        prepare가 실패하면 교체하지 않고 기존 모델로 계속 서빙한다.
+        같은 품목의 확인이 동시에 호출되면 1번만 실행하고 결과를 공유한다.
+        같은 품목의 롤백과는 결과를 공유하지 않고 교체 잠금으로 차례로 실행한다.
 
         Returns:
             True = 모델 갱신됨, False = 변경 없음
@@ -76,69 +255,361 @@ class ONNXModelLoader:
             logger.debug("로컬 모드에서는 자동 업데이트를 건너뜁니다.")
             return False
 
+        return self._single_flight(
+            f"update:{commodity}", lambda: self._check_and_update(commodity, prepare)
+        )
+
+    def _check_and_update(
+        self, commodity: str, prepare: Optional[Callable[[LoadedModel], None]]
+    ) -> bool:
+        with self._swap_lock(commodity):
+            return self._update_locked(commodity, prepare)
+
+    def _update_locked(
+        self, commodity: str, prepare: Optional[Callable[[LoadedModel], None]]
+    ) -> bool:
+        # 아직 로드 전이면 일반 로드 (진행 중인 로드가 있으면 그 결과를 기다림)
+        current = self._models.get(commodity)
+        if current is None:
+            model = self.get_model(commodity)
+            if prepare is not None:
+                prepare(model)
+            return True
+
         s3 = self._get_s3_client()
         bucket = settings.model_s3_bucket
 
         # 최신 파일 키 조회
-        latest_onnx_key, latest_pkl_key = self._find_latest_s3_keys(s3, bucket)
+        latest_onnx_key, latest_pkl_key = self._find_latest_s3_keys(s3, bucket, commodity)
         if not latest_onnx_key:
-            logger.warning("S3에서 ONNX 파일을 찾을 수 없습니다.")
+            logger.warning(f"[{commodity}] S3에서 ONNX 파일을 찾을 수 없습니다.")
             return False
 
+        # 롤백 고정 (저장소 공유 → 다른 워커에서 롤백했어도 같은 버전으로 맞춤)
+        pin = self.store.pinned(commodity)
+        if pin is not None and pin["rolled_back"] == latest_onnx_key:
+            if _is_model_version(current, pin["version"]):
+                logger.debug(f"[{commodity}] 롤백된 모델이므로 건너뜀: {latest_onnx_key}")
+                return False
+            logger.warning(
+                f"⏪ [{commodity}] 롤백 고정 적용: {current.version} → {pin['version']['onnx_key']}"
+            )
+            model = self._build_from_store(commodity, pin["version"])
+            if prepare is not None:
+                prepare(model)
+            self._publish(model)
+            return True
+
         # 현재 로드된 키와 비교
-        loaded = self._loaded_keys.get(commodity, {})
-        if loaded.get("onnx_key") == latest_onnx_key:
-            logger.info(f"[{commodity}] 모델 변경 없음: {latest_onnx_key}")
+        if current.onnx_key == latest_onnx_key:
+            logger.debug(f"[{commodity}] 모델 변경 없음: {latest_onnx_key}")
             return False
 
-        logger.info(
-            f"[{commodity}] 새 모델 감지! "
-            f"({loaded.get('onnx_key', 'None')} → {latest_onnx_key})"
-        )
+        logger.info(f"[{commodity}] 새 모델 감지! ({current.onnx_key} → {latest_onnx_key})")
 
-        # 기존 세션 제거 후 재로드
-        self.sessions.pop(commodity, None)
-        self.preprocessing_info.pop(commodity, None)
-        self._etags.pop(commodity, None)
-        self._loaded_keys.pop(commodity, None)
-        self._load_from_s3(commodity)
+        # 기존 모델은 그대로 서빙하면서 새 묶음 준비
+        model = self._build_from_s3(commodity, latest_onnx_key, latest_pkl_key)
+        if prepare is not None:
+            prepare(model)
+        if pin is not None:
+            self.store.unpin(commodity)
+        self._publish(model)
         return True
 
     # ===========================================
-    # Local 모드
+    # 버전 이력 / 롤백 (s3 모드)
     # ===========================================
 
-    def _load_local(self, commodity: str) -> ort.InferenceSession:
-        """로컬 파일에서 모델 로드"""
-        if commodity in self.sessions:
-            return self.sessions[commodity]
+    def list_versions(self, commodity: str = "corn") -> List[dict]:
+        """
+        저장소에 기록된 품목 모델 버전 (최신 설치 순)
+
+        각 항목: onnx_key, onnx_etag, pkl_key, pkl_etag, installed_at, cached(롤백 가능), current
+        """
+        if self.mode != "s3":
+            return []
+        current = self._models.get(commodity)
+        versions = []
+        for entry in reversed(self.store.history(commodity)):
+            entry["current"] = current is not None and _is_model_version(current, entry)
+            versions.append(entry)
+        return versions
+
+    def rollback(
+        self,
+        commodity: str = "corn",
+        version: Optional[str] = None,
+        prepare: Optional[Callable[[LoadedModel], None]] = None,
+    ) -> LoadedModel:
+        """
+        저장소에 남아 있는 이전 버전으로 교체 (네트워크 없음)
+
+        Args:
+            version: onnx S3 key 또는 ETag (None이면 현재 바로 이전에 설치된 버전)
+            prepare: 교체 전에 새 묶음으로 실행할 준비 작업 (워밍업)
+
+        롤백으로 내린 모델은 더 새 모델이 올라올 때까지 자동 업데이트로 다시 올리지 않는다.
+        고정은 저장소(index.json)에 기록되어 다른 워커도 다음 업데이트 확인 / 재시작 후 로드에서 같은 버전으로 맞춘다.
+        같은 버전으로의 동시 롤백만 결과를 공유하고, 업데이트 확인과는 교체 잠금으로 차례로 실행한다.
+        """
+        if self.mode != "s3":
+            raise ValueError("롤백은 s3 모드에서만 지원합니다.")
+        return self._single_flight(
+            f"rollback:{commodity}:{version or ''}", lambda: self._rollback(commodity, version, prepare)
+        )
+
+    def _rollback(
+        self, commodity: str, version: Optional[str], prepare: Optional[Callable[[LoadedModel], None]]
+    ) -> LoadedModel:
+        with self._swap_lock(commodity):
+            return self._rollback_locked(commodity, version, prepare)
+
+    def _rollback_locked(
+        self, commodity: str, version: Optional[str], prepare: Optional[Callable[[LoadedModel], None]]
+    ) -> LoadedModel:
+        current = self._models.get(commodity)
+        history = [entry for entry in self.store.history(commodity) if entry["cached"]]
+
+        if version is not None:
+            matches = [e for e in history if version in (e["onnx_key"], e["onnx_etag"].strip('"'))]
+        else:
+            # 현재 버전 바로 앞에 설치된 버전
+            index = next(
+                (i for i, e in enumerate(history) if current is not None and _is_model_version(current, e)),
+                len(history),
+            )
+            matches = history[:index]
+        if not matches:
+            raise LookupError(f"[{commodity}] 롤백할 수 있는 저장된 버전이 없습니다: {version or '이전 버전'}")
+
+        entry = matches[-1]
+        model = self._build_from_store(commodity, entry)
+        if prepare is not None:
+            prepare(model)
+
+        # 내린 버전 고정: 이미 고정 중이면 처음 내린 (더 새) 버전 기준
+        pin = self.store.pinned(commodity)
+        rolled_back = pin["rolled_back"] if pin is not None else (current.onnx_key if current else None)
+        if rolled_back is not None and rolled_back != model.onnx_key:
+            self.store.pin(commodity, rolled_back, _version_entry(model))
+        elif pin is not None:
+            self.store.unpin(commodity)
+        logger.warning(f"⏪ [{commodity}] 모델 롤백: {current.version if current else 'None'} → {model.version}")
+        self._publish(model)
+        return model
+
+    def _single_flight(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        같은 key의 동시 호출은 첫 호출만 fn을 실행하고 나머지는 그 결과(또는 예외)를 기다린다
+
+        cold 워커에 요청이 몰려도 S3 조회 / 다운로드 / 세션 생성은 1번만 일어난다.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
 
-        onnx_file, pkl_file = self._find_local_files()
+        if not leader:
+            logger.debug(f"⏳ 진행 중인 작업 대기: {key}")
+            return future.result()
 
-        logger.info(f"ONNX 세션 생성 중... {onnx_file.name}")
-        session = ort.InferenceSession(
-            str(onnx_file), providers=["CPUExecutionProvider"]
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _swap_lock(self, commodity: str) -> threading.Lock:
+        """품목별 교체 잠금 (처음 쓸 때 생성)"""
+        with self._inflight_lock:
+            return self._swap_locks.setdefault(commodity, threading.Lock())
+
+    def _map_commodities(
+        self,
+        fn: Callable[[str], object],
+        commodities: Optional[List[str]] = None,
+        collect: Optional[List[str]] = None,
+    ) -> Dict[str, Optional[Exception]]:
+        """
+        품목별 fn(commodity)을 동시에 실행 (MODEL_LOAD_WORKERS, 0 = 품목 수)
+
+        collect가 주어지면 fn이 참을 반환한 품목을 담는다.
+        """
+        commodities = list(commodities or settings.model_commodities)
+        if not commodities:
+            return {}
+
+        workers = min(settings.model_load_workers or len(commodities), len(commodities))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-load") as pool:
+            futures = {commodity: pool.submit(fn, commodity) for commodity in commodities}
+
+        results: Dict[str, Optional[Exception]] = {}
+        for commodity, future in futures.items():
+            error = future.exception()
+            results[commodity] = error
+            if error is None and collect is not None and future.result():
+                collect.append(commodity)
+        return results
+
+    def _create_serving_session(
+        self, commodity: str, model_path: Path, source_tag: str
+    ) -> Tuple[ort.InferenceSession, Path, str]:
+        """
+        서빙용 세션 생성
+
+        MODEL_PRECISION=int8 이면 INT8 동적 양자화 모델을 만들어
+        FP32 대비 정확도 검증을 통과한 경우에만 INT8로 서빙한다.
+
+        Returns:
+            (session, 서빙 onnx 경로, 정밀도)
+        """
+        precision = "fp32"
+        if settings.model_precision == "int8":
+            int8_path = prepare_int8_model(model_path, source_tag)
+            if int8_path is not None:
+                model_path, precision = int8_path, "int8"
+
+        session = create_session(model_path, source_tag=source_tag)
+        logger.info(f"[{commodity}] 서빙 정밀도: {precision}")
+        return session, Path(model_path), precision
+
+    def _build_model(
+        self,
+        commodity: str,
+        onnx_file: Path,
+        source_tag: str,
+        onnx_key: str,
+        pkl_file: Optional[Path] = None,
+        pkl_key: Optional[str] = None,
+        pkl_etag: Optional[str] = None,
+    ) -> LoadedModel:
+        """
+        파일 → 서빙 모델 묶음 (세션 + pkl + 입력 레이아웃 + 전처리 엔진)
+
+        서빙 중인 모델(self._models)은 건드리지 않는다.
+        """
+        logger.info(f"[{commodity}] ONNX 세션 생성 중... {onnx_file.name}")
+        session, model_path, precision = self._create_serving_session(
+            commodity, onnx_file, source_tag
         )
-        self.sessions[commodity] = session
-        logger.info(f"✅ ONNX 세션 생성 완료: {onnx_file.name}")
+        logger.info(f"✅ [{commodity}] ONNX 세션 생성 완료 (from {onnx_key})")
 
-        if pkl_file and pkl_file.exists():
+        info = {}
+        if pkl_file is not None and pkl_file.exists() and pkl_file.stat().st_size > 0:
             with open(pkl_file, "rb") as f:
-                self.preprocessing_info[commodity] = pickle.load(f)
-            logger.info(f"✅ 전처리 정보 로드 완료: {pkl_file.name}")
+                info = pickle.load(f)
+            logger.info(f"✅ [{commodity}] 전처리 정보 로드 완료 (from {pkl_key})")
         else:
-            logger.warning("⚠️ 전처리 정보 파일이 없습니다")
+            logger.warning(f"⚠️ [{commodity}] 전처리 정보 파일이 없습니다")
 
-        return session
+        # pkl / ONNX 메타데이터 → 입력 레이아웃 + 전처리 엔진 (모델 버전당 1회)
+        layout = build_layout(info, session)
+        files = [onnx_file, pkl_file, model_path, cached_optimized_path(model_path, source_tag)]
+        model = LoadedModel(
+            commodity=commodity,
+            session=session,
+            model_path=model_path,
+            source_tag=source_tag,
+            onnx_key=onnx_key,
+            pkl_key=pkl_key,
+            pkl_etag=pkl_etag,
+            precision=precision,
+            preprocessing_info=info,
+            layout=layout,
+            preprocessor=build_preprocessor(info, layout),
+            pkl_path=pkl_file if info else None,
+            files=tuple(dict.fromkeys(path for path in files if path is not None)),
+        )
+        self._track_files(model)
+        return model
 
-    def _find_local_files(self) -> Tuple[Path, Optional[Path]]:
-        """로컬 경로에서 ONNX, PKL 파일 찾기 (파일명 정렬 → 마지막 = 최신)"""
-        onnx_files = sorted(self.local_path.glob("*.onnx"))
-        pkl_files = sorted(self.local_path.glob("*.pkl"))
+    def _publish(self, model: LoadedModel) -> None:
+        """
+        새 모델 묶음을 서빙 모델로 교체 (dict 항목 하나의 참조 대입 → 원자적)
+
+        이전 묶음은 여기서 닫지 않는다. 처리 중인 요청이 잡고 있는 참조가
+        모두 사라지면 세션과 IO binding 버퍼가 함께 해제된다.
+        """
+        previous = self._models.get(model.commodity)
+        self._models[model.commodity] = model
+        if previous is not None and previous is not model:
+            logger.info(f"🔀 [{model.commodity}] 모델 교체: {previous.version} → {model.version}")
+            weakref.finalize(
+                previous, logger.info, f"♻️ [{model.commodity}] 이전 모델 해제: {previous.version}"
+            )
+
+        if self.mode == "s3":
+            self._record_and_evict(model)
+
+    def _record_and_evict(self, model: LoadedModel) -> None:
+        """저장소 이력에 버전 기록 + 살아 있는 묶음이 쓰지 않는 오래된 파일 / 최적화 캐시 정리"""
+        self.store.record(model.commodity, _version_entry(model))
+        self.store.touch(model.files)
+        live = self._live_file_paths()
+        self.store.evict(live)
+
+        # 최적화 / INT8 캐시: 이력에 남은 버전(롤백 대상 포함) + 살아 있는 묶음 파일은 유지
+        known_sources, int8_files = set(), []
+        for entry in self.store.versions():
+            onnx_file = self.store.object_path(entry["onnx_etag"], ".onnx")
+            int8_file = quantized_model_path(onnx_file, entry["onnx_etag"])
+            known_sources.add(optimized_source_key(onnx_file, entry["onnx_etag"]))
+            known_sources.add(optimized_source_key(int8_file, entry["onnx_etag"]))
+            int8_files.append(int8_file)
+        prune_optimized_models(known_sources, keep=live)
+        prune_quantized_models(keep=[*int8_files, *live])
+
+    def _track_files(self, model: LoadedModel) -> None:
+        """묶음이 살아 있는 동안 파일을 정리 대상에서 제외"""
+        self._live_files[id(model)] = model.files
+        weakref.finalize(model, self._live_files.pop, id(model), None)
+
+    def _live_file_paths(self) -> List[Path]:
+        """살아 있는 모든 묶음(서빙 / 준비 중 / 요청이 잡고 있는 이전 버전)의 파일"""
+        while True:
+            try:
+                return [path for files in list(self._live_files.values()) for path in files]
+            except RuntimeError:
+                continue   # 다른 스레드에서 묶음 해제와 겹침 → 다시 읽기
+
+    # ===========================================
+    # Local 모드
+    # ===========================================
+
+    def _load_local(self, commodity: str) -> LoadedModel:
+        """로컬 파일에서 모델 로드"""
+        start = time.perf_counter()
+        onnx_file, pkl_file = self._find_local_files(commodity)
+
+        model = self._build_model(
+            commodity,
+            onnx_file,
+            source_tag=str(onnx_file.stat().st_mtime_ns),
+            onnx_key=str(onnx_file),
+            pkl_file=pkl_file,
+            pkl_key=str(pkl_file) if pkl_file else None,
+        )
+        self._publish(model)
+
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, commodity=commodity, mode="local")
+        return model
+
+    def _find_local_files(self, commodity: str = "corn") -> Tuple[Path, Optional[Path]]:
+        """품목 폴더에서 ONNX, PKL 파일 찾기 (파일명 정렬 → 마지막 = 최신)"""
+        folder = Path(self.get_model_location(commodity))
+        onnx_files = sorted(folder.glob("*.onnx"))
+        pkl_files = sorted(folder.glob("*.pkl"))
 
         if not onnx_files:
             raise FileNotFoundError(
-                f"ONNX 모델 파일을 찾을 수 없습니다: {self.local_path}"
+                f"[{commodity}] ONNX 모델 파일을 찾을 수 없습니다: {folder}"
             )
 
         onnx_file = onnx_files[-1]
@@ -154,78 +625,208 @@ class ONNXModelLoader:
     # S3 모드
     # ===========================================
 
-    def _load_from_s3(self, commodity: str) -> ort.InferenceSession:
+    def _load_from_s3(self, commodity: str) -> LoadedModel:
         """S3에서 최신 모델을 다운로드하고 세션 생성"""
-        if commodity in self.sessions:
-            return self.sessions[commodity]
-
         s3 = self._get_s3_client()
         bucket = settings.model_s3_bucket
 
-        cache_dir = self._cache_dir / commodity
-        cache_dir.mkdir(parents=True, exist_ok=True)
-
         # S3에서 최신 파일 키 찾기
-        latest_onnx_key, latest_pkl_key = self._find_latest_s3_keys(s3, bucket)
+        latest_onnx_key, latest_pkl_key = self._find_latest_s3_keys(s3, bucket, commodity)
 
         if not latest_onnx_key:
             raise FileNotFoundError(
-                f"S3에서 ONNX 모델 파일을 찾을 수 없습니다: "
-                f"s3://{bucket}/{settings.model_s3_prefix}/"
+                f"[{commodity}] S3에서 ONNX 모델 파일을 찾을 수 없습니다: "
+                f"s3://{bucket}/{self.get_model_location(commodity)}/"
             )
 
-        # --- ONNX 다운로드 ---
-        model_local = cache_dir / "model.onnx"
-        model_etag = self._download_if_changed(
-            s3, bucket, latest_onnx_key, model_local,
-            self._etags.get(commodity, {}).get("model"),
+        # 롤백 고정 중이면 (다른 워커의 롤백 / 재시작 전 롤백) 고정 버전으로 로드
+        pin = self.store.pinned(commodity)
+        if pin is not None and pin["rolled_back"] == latest_onnx_key:
+            try:
+                model = self._build_from_store(commodity, pin["version"])
+            except FileNotFoundError as e:
+                logger.warning(f"⚠️ [{commodity}] 롤백 고정 버전을 로드할 수 없어 최신 모델 사용: {e}")
+            else:
+                logger.info(f"⏪ [{commodity}] 롤백 고정 버전 로드: {model.version}")
+                self._publish(model)
+                return model
+
+        model = self._build_from_s3(commodity, latest_onnx_key, latest_pkl_key)
+        self._publish(model)
+        return model
+
+    def _build_from_store(self, commodity: str, entry: dict) -> LoadedModel:
+        """저장소에 남아 있는 버전(이력 항목)으로 모델 묶음 생성 (네트워크 없음)"""
+        onnx_file = self.store.object_path(entry["onnx_etag"], ".onnx")
+        if not onnx_file.exists():
+            raise FileNotFoundError(f"[{commodity}] 저장소에 모델 파일이 없습니다: {entry['onnx_key']}")
+        return self._build_model(
+            commodity,
+            onnx_file,
+            source_tag=entry["onnx_etag"],
+            onnx_key=entry["onnx_key"],
+            pkl_file=self.store.object_path(entry["pkl_etag"], ".pkl") if entry.get("pkl_etag") else None,
+            pkl_key=entry.get("pkl_key"),
+            pkl_etag=entry.get("pkl_etag"),
         )
 
+    def _build_from_s3(self, commodity: str, onnx_key: str, pkl_key: Optional[str]) -> LoadedModel:
+        """
+        S3 파일을 저장소에 받아 모델 묶음 생성 (서빙 모델은 건드리지 않음)
+
+        파일은 ETag별로 따로 저장되어 서빙 중인 버전의 파일을 덮어쓰지 않고,
+        이미 받은 버전(다른 품목이 받은 같은 오브젝트 포함)은 다시 받지 않는다.
+        """
+        start = time.perf_counter()
+        s3 = self._get_s3_client()
+        bucket = settings.model_s3_bucket
+
+        # --- ONNX 다운로드 ---
+        model_local, model_etag = self._fetch(s3, bucket, onnx_key)
+        if model_local is None:
+            raise FileNotFoundError(f"[{commodity}] S3 오브젝트를 받을 수 없습니다: {onnx_key}")
+
         # --- PKL 다운로드 ---
-        pkl_local = cache_dir / "preprocessing.pkl"
+        pkl_local = None
         pkl_etag = None
-        if latest_pkl_key:
-            pkl_etag = self._download_if_changed(
-                s3, bucket, latest_pkl_key, pkl_local,
-                self._etags.get(commodity, {}).get("pkl"),
-            )
-
-        # 캐시 업데이트
-        self._etags[commodity] = {"model": model_etag, "pkl": pkl_etag}
-        self._loaded_keys[commodity] = {
-            "onnx_key": latest_onnx_key,
-            "pkl_key": latest_pkl_key,
-        }
-
-        # ONNX 세션 생성
-        logger.info(f"[{commodity}] ONNX 세션 생성 중...")
-        session = ort.InferenceSession(
-            str(model_local), providers=["CPUExecutionProvider"]
+        if pkl_key:
+            pkl_local, pkl_etag = self._fetch(s3, bucket, pkl_key)
+
+        model = self._build_model(
+            commodity,
+            model_local,
+            source_tag=model_etag,
+            onnx_key=onnx_key,
+            pkl_file=pkl_local,
+            pkl_key=pkl_key,
+            pkl_etag=pkl_etag,
         )
-        self.sessions[commodity] = session
-        logger.info(f"✅ [{commodity}] ONNX 세션 생성 완료 (from {latest_onnx_key})")
-
-        # 전처리 정보 로드
-        if pkl_local.exists() and pkl_local.stat().st_size > 0:
-            with open(pkl_local, "rb") as f:
-                self.preprocessing_info[commodity] = pickle.load(f)
-            logger.info(f"✅ [{commodity}] 전처리 정보 로드 완료 (from {latest_pkl_key})")
-        else:
-            logger.warning(f"⚠️ [{commodity}] 전처리 정보 파일이 없습니다")
 
-        return session
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, commodity=commodity, mode="s3")
+        return model
 
     def _find_latest_s3_keys(
-        self, s3, bucket: str
+        self, s3, bucket: str, commodity: str = "corn"
     ) -> Tuple[Optional[str], Optional[str]]:
         """
-        S3 prefix 아래 파일 목록을 조회하여 날짜(YYYYMMDD)가 가장 큰
+        품목 최신 ONNX / PKL 파일 키 조회 (MODEL_UPDATE_DETECTION 순서로 가벼운 방법 우선)
+
+        - manifest:   prefix/<MODEL_MANIFEST_NAME> 포인터 파일 조건부 GET (변경 없으면 304)
+        - list_after: 마지막으로 본 키 이후만 나열 (StartAfter)
+        - full:       prefix 전체 나열
+        포인터 파일이 없거나 읽을 수 없으면 list_after로, 기억한 키가 없거나
+        마지막 전체 나열 후 MODEL_UPDATE_FULL_SCAN_HOURS가 지났으면 전체 나열로 확인한다.
+
+        Returns:
+            (latest_onnx_key, latest_pkl_key)  — 없으면 None
+        """
+        detection = settings.model_update_detection
+        keys = None
+        if detection == "manifest":
+            keys = self._read_manifest(s3, bucket, commodity)
+        if keys is None and detection != "full" and not self._full_scan_due(commodity):
+            keys = self._list_after_latest(s3, bucket, commodity)
+        if keys is None:
+            keys = self._scan_latest_s3_keys(s3, bucket, commodity)
+            self._last_full_scan[commodity] = time.monotonic()
+            MODEL_UPDATE_CHECKS.inc(method="full")
+
+        if keys[0] is not None:
+            self._latest_keys[commodity] = keys
+        return keys
+
+    def _read_manifest(
+        self, s3, bucket: str, commodity: str
+    ) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        포인터 파일({"onnx": ..., "pkl": ...})에서 최신 키 읽기 (ETag가 같으면 304로 끝남)
+
+        값이 파일명이면 품목 prefix 아래 키로, '/'가 있으면 전체 키로 본다.
+        포인터 파일이 없거나 형식이 틀리면 None (나열로 대신 확인).
+        """
+        prefix = self.get_model_location(commodity).rstrip("/")
+        key = f"{prefix}/{settings.model_manifest_name}"
+        cached = self._manifests.get(commodity)
+        conditions = {"IfNoneMatch": cached[0]} if cached else {}
+        try:
+            response = s3.get_object(Bucket=bucket, Key=key, **conditions)
+        except Exception as e:
+            code = error_code(e)
+            if code == "304" and cached:
+                MODEL_UPDATE_CHECKS.inc(method="manifest_not_modified")
+                return cached[1]
+            if code in ("404", "NoSuchKey", "403", "AccessDenied"):
+                self._manifests.pop(commodity, None)
+                if commodity not in self._missing_manifests:
+                    self._missing_manifests.add(commodity)
+                    logger.warning(f"⚠️ [{commodity}] 모델 포인터 파일 없음 → 목록 조회로 확인: s3://{bucket}/{key}")
+                return None
+            raise
+
+        try:
+            pointer = json.loads(response["Body"].read())
+            onnx_name, pkl_name = pointer["onnx"], pointer.get("pkl")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ [{commodity}] 모델 포인터 파일 형식 오류 ({e}) → 목록 조회로 확인: {key}")
+            return None
+        finally:
+            response["Body"].close()
+
+        keys = tuple(
+            name if name is None or "/" in name else f"{prefix}/{name}"
+            for name in (onnx_name, pkl_name)
+        )
+        self._manifests[commodity] = (response["ETag"], keys)
+        self._missing_manifests.discard(commodity)
+        MODEL_UPDATE_CHECKS.inc(method="manifest")
+        logger.info(f"[{commodity}] 모델 포인터: {keys[0]}, {keys[1]}")
+        return keys
+
+    def _list_after_latest(
+        self, s3, bucket: str, commodity: str
+    ) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        마지막으로 본 ONNX 키 이후만 나열 (새 ONNX가 있을 때만 PKL도 같은 방식으로)
+
+        기억한 키가 없으면 None (전체 나열로 대신 확인).
+        """
+        onnx_key, pkl_key = self._latest_keys.get(commodity, (None, None))
+        if onnx_key is None:
+            return None
+
+        latest_onnx = _list_newer_key(s3, bucket, onnx_key, _ONNX_PATTERN)
+        if latest_onnx is None:
+            return None
+        if latest_onnx == onnx_key:
+            MODEL_UPDATE_CHECKS.inc(method="list_after")
+            return onnx_key, pkl_key
+
+        latest_pkl = _list_newer_key(s3, bucket, pkl_key, _PKL_PATTERN) if pkl_key else None
+        if latest_pkl is None:
+            return None
+        MODEL_UPDATE_CHECKS.inc(method="list_after")
+        logger.info(f"[{commodity}] S3 새 파일: {latest_onnx}, {latest_pkl}")
+        return latest_onnx, latest_pkl
+
+    def _full_scan_due(self, commodity: str) -> bool:
+        """전체 나열이 필요한지 (아직 안 했거나 MODEL_UPDATE_FULL_SCAN_HOURS 경과)"""
+        last = self._last_full_scan.get(commodity)
+        if last is None:
+            return True
+        hours = settings.model_update_full_scan_hours
+        return hours > 0 and time.monotonic() - last >= hours * 3600
+
+    def _scan_latest_s3_keys(
+        self, s3, bucket: str, commodity: str = "corn"
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        품목 S3 prefix 아래 파일 목록을 모두 조회하여 날짜(YYYYMMDD)가 가장 큰
         ONNX / PKL 파일 키를 반환.
 
         Returns:
             (latest_onnx_key, latest_pkl_key)  — 없으면 None
         """
-        prefix = settings.model_s3_prefix.rstrip("/") + "/"
+        prefix = self.get_model_location(commodity).rstrip("/") + "/"
 
         paginator = s3.get_paginator("list_objects_v2")
         pages = paginator.paginate(Bucket=bucket, Prefix=prefix)
@@ -251,41 +852,56 @@ class ONNXModelLoader:
         latest_pkl = max(pkl_candidates, key=lambda x: x[0])[1] if pkl_candidates else None
 
         if latest_onnx:
-            logger.info(f"S3 최신 ONNX: {latest_onnx}")
+            logger.info(f"[{commodity}] S3 최신 ONNX: {latest_onnx}")
         if latest_pkl:
-            logger.info(f"S3 최신 PKL:  {latest_pkl}")
+            logger.info(f"[{commodity}] S3 최신 PKL:  {latest_pkl}")
 
         return latest_onnx, latest_pkl
 
-    def _download_if_changed(
-        self, s3, bucket: str, key: str, local_path: Path, cached_etag: Optional[str]
-    ) -> Optional[str]:
+    def _fetch(self, s3, bucket: str, key: str) -> Tuple[Optional[Path], Optional[str]]:
         """
-        S3 오브젝트를 ETag 비교 후 변경됐을 때만 다운로드.
+        S3 오브젝트를 저장소에 받기 (변경됐을 때만, 조건부 GET)
+
+        병렬 범위 GET → 임시 파일 → ETag / 게시된 SHA-256 검증 → rename.
+        중단된 다운로드는 남은 조각만 이어받는다 (app/ml/s3_download.py).
 
         Returns:
-            새 ETag, 또는 None (파일이 S3에 없을 때)
+            (저장소 파일 경로, ETag), 파일이 S3에 없으면 (None, None)
         """
+        file_kind = Path(key).suffix.lstrip(".")
+        start = time.perf_counter()
         try:
-            head = s3.head_object(Bucket=bucket, Key=key)
-            remote_etag = head["ETag"]
+            path, result = self.store.fetch(
+                s3, bucket, key,
+                part_size=settings.s3_download_part_size_mb * MiB,
+                workers=settings.s3_download_workers,
+                verify_etag=settings.s3_verify_etag,
+                checksum_suffix=settings.s3_checksum_suffix or None,
+            )
         except Exception as e:
-            logger.warning(f"S3 HEAD 실패: s3://{bucket}/{key} → {e}")
-            return None
+            if error_code(e) in ("404", "NoSuchKey"):
+                logger.warning(f"S3 오브젝트 없음: s3://{bucket}/{key}")
+                return None, None
+            raise
 
-        if cached_etag == remote_etag and local_path.exists():
+        if result.not_modified:
             logger.debug(f"캐시 유효 (ETag 동일): {key}")
-            return remote_etag
-
-        logger.info(f"S3 다운로드: s3://{bucket}/{key} → {local_path}")
-        s3.download_file(bucket, key, str(local_path))
-        logger.info(f"✅ 다운로드 완료: {local_path.name} ({head['ContentLength']} bytes)")
+            return path, result.etag
 
-        return remote_etag
+        S3_DOWNLOAD_SECONDS.observe(time.perf_counter() - start, file=file_kind)
+        S3_DOWNLOAD_BYTES.inc(result.downloaded, file=file_kind)
+        logger.info(
+            f"✅ 다운로드 완료: {key} → {path.name} ({result.size} bytes, "
+            f"받은 양 {result.downloaded} bytes, 검증: {result.verified or '없음'})"
+        )
+        return path, result.etag
 
     def _get_s3_client(self):
-        """boto3 S3 클라이언트 (lazy init)"""
-        if self._s3_client is None:
+        """boto3 S3 클라이언트 (lazy init, 스레드 간 공유)"""
+        with self._s3_client_lock:
+            if self._s3_client is not None:
+                return self._s3_client
+
             import boto3
 
             self._s3_client = boto3.client(
@@ -302,6 +918,43 @@ class ONNXModelLoader:
         return self._s3_client
 
 
+def _list_newer_key(s3, bucket: str, key: str, pattern: re.Pattern) -> Optional[str]:
+    """
+    key와 같은 이름 형식에서 날짜가 더 큰 키 조회 (없으면 key, 형식이 다르면 None)
+
+    prefix를 날짜 첫 자리까지로 좁혀(예: models/60d_2) 다른 종류 파일은 나열하지 않고,
+    StartAfter로 key 이후만 받는다 (같은 형식의 키는 사전순 = 날짜순).
+    """
+    match = pattern.search(key)
+    if match is None:
+        return None
+    latest_date, latest_key = match.group(1), key
+
+    paginator = s3.get_paginator("list_objects_v2")
+    pages = paginator.paginate(Bucket=bucket, Prefix=key[:match.start(1) + 1], StartAfter=key)
+    for page in pages:
+        for obj in page.get("Contents", []):
+            m = pattern.search(obj["Key"])
+            if m and m.group(1) > latest_date:
+                latest_date, latest_key = m.group(1), obj["Key"]
+    return latest_key
+
+
+def _is_model_version(model: LoadedModel, entry: dict) -> bool:
+    """서빙 모델이 저장소 이력 항목과 같은 버전인지"""
+    return model.onnx_key == entry["onnx_key"] and model.source_tag == entry["onnx_etag"]
+
+
+def _version_entry(model: LoadedModel) -> Dict[str, Optional[str]]:
+    """모델 묶음 → 저장소 이력 항목 형식"""
+    return {
+        "onnx_key": model.onnx_key,
+        "onnx_etag": model.source_tag,
+        "pkl_key": model.pkl_key,
+        "pkl_etag": model.pkl_etag,
+    }
+
+
 # ===========================================
 # 싱글톤 & 스케줄러
 # ===========================================
@@ -322,8 +975,10 @@ def start_model_update_scheduler():
     모델 자동 업데이트 스케줄러 시작
 
     S3 모드에서만 동작.
-    MODEL_UPDATE_CHECK_TIME 에 따라 매일 지정 시각에 S3를 확인하고,
-    새 파일(날짜 suffix가 더 큰 파일)이 있으면 자동 리로드.
+    MODEL_UPDATE_CHECK_TIME 에 따라 매일 지정 시각에 (MODEL_UPDATE_CHECK_INTERVAL_MINUTES > 0이면
+    N분마다) MODEL_COMMODITIES 전 품목의 최신 파일을 동시에 확인하고, 새 파일(날짜 suffix가
+    더 큰 파일)이 있는 품목만 새 세션을 만들어 워밍업한 뒤 무중단 교체.
+    확인은 포인터 파일 조건부 GET / StartAfter 나열로 가볍게 한다 (_find_latest_s3_keys).
     """
     if settings.model_load_mode != "s3":
         logger.info("로컬 모드 → 모델 업데이트 스케줄러를 건너뜁니다.")
@@ -331,28 +986,43 @@ def start_model_update_scheduler():
 
     from apscheduler.schedulers.background import BackgroundScheduler
 
-    hour, minute = map(int, settings.model_update_check_time.split(":"))
-
     scheduler = BackgroundScheduler()
 
     def _check_update_job():
-        logger.info("⏰ 스케줄러: 모델 업데이트 확인 중...")
+        logger.debug("⏰ 스케줄러: 모델 업데이트 확인 중...")
+        from .prediction_service import get_prediction_service
+
         loader = get_model_loader()
-        updated = loader.check_and_update("corn")
+        service = get_prediction_service()
+        # 새 세션은 교체 전에 워밍업 (요청은 교체 순간까지 기존 모델로 처리)
+        updated = loader.check_and_update_all(settings.model_commodities, prepare=service.warm_model)
         if updated:
-            logger.info("🔄 모델이 갱신되었습니다.")
+            logger.info(f"🔄 모델이 갱신되었습니다: {updated}")
+            # 이전 모델 캐시 정리
+            service.on_models_updated(updated)
         else:
-            logger.info("✅ 모델 변경 없음.")
+            logger.debug("✅ 모델 변경 없음.")
+
+    interval = settings.model_update_check_interval_minutes
+    if interval > 0:
+        trigger = {"trigger": "interval", "minutes": interval}
+        schedule = f"{interval}분마다"
+    else:
+        hour, minute = map(int, settings.model_update_check_time.split(":"))
+        trigger = {"trigger": "cron", "hour": hour, "minute": minute}
+        schedule = f"매일 {settings.model_update_check_time}"
 
     scheduler.add_job(
         _check_update_job,
-        trigger="cron",
-        hour=hour,
-        minute=minute,
+        **trigger,
         id="model_update_check",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
     scheduler.start()
-    logger.info(f"📅 모델 업데이트 스케줄러 시작: 매일 {settings.model_update_check_time}")
+    logger.info(
+        f"📅 모델 업데이트 스케줄러 시작: {schedule} (감지: {settings.model_update_detection})"
+    )
 
     return scheduler
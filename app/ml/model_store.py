@@ -0,0 +1,237 @@
+# 로컬 모델 저장소 (ETag 기반 content-addressed, 품목 간 공유, LRU 정리, 롤백용 버전 이력)
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from .s3_download import DownloadResult, download_object, file_lock, remove_local
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILE = "index.json"
+
+# 이력에 없는 객체도 받은 지 이 시간 안이면 남김 (다른 스레드/프로세스가 설치 중일 수 있음)
+_UNREFERENCED_GRACE_SECONDS = 3600
+
+
+class ModelStore:
+    """
+    S3 모델 파일의 로컬 저장소
+
+    디렉토리 구조:
+      objects/<ETag><확장자>   버전별 파일 (내용 주소, 같은 S3 오브젝트/내용은 품목 간 1개)
+      downloads/<key 해시>     S3 key별 다운로드 위치 (조건부 GET / 이어받기, objects와 하드링크)
+      index.json               {objects: 크기/최근 사용, keys: S3 key → 최신 객체, history: 품목별 설치 이력,
+                                pins: 품목별 롤백 고정}
+
+    - 품목별로 최근 max_versions개 버전 이력을 보관해 네트워크 없이 롤백할 수 있다
+    - 이력에서 빠진 객체는 바로, 이력에 있는 객체는 크기 한도(max_bytes)를 넘을 때 LRU 순으로 삭제
+    - 서빙 중인 파일(protected)과 롤백 고정 버전은 삭제하지 않는다
+    - index.json은 파일 잠금으로 갱신해 워커 프로세스들이 같은 저장소를 공유할 수 있다
+    """
+
+    def __init__(self, root: Path, max_versions: int = 5, max_bytes: int = 0):
+        self.root = Path(root)
+        self.max_versions = max_versions
+        self.max_bytes = max_bytes
+
+    # ===========================================
+    # 파일
+    # ===========================================
+
+    def object_path(self, etag: str, suffix: str) -> Path:
+        """ETag + 확장자 → objects/ 경로"""
+        name = re.sub(r"[^0-9A-Za-z-]", "_", etag.strip('"'))
+        return self.root / "objects" / f"{name}{suffix}"
+
+    def fetch(self, s3, bucket: str, key: str, **download_options) -> Tuple[Path, DownloadResult]:
+        """
+        S3 오브젝트를 저장소에 받아 (objects 경로, 다운로드 결과) 반환
+
+        같은 key의 최신 버전이 이미 있으면 조건부 GET 304로 끝나고,
+        다른 key라도 ETag가 같은 객체가 있으면 새로 저장하지 않는다.
+        """
+        suffix = Path(key).suffix
+        ref = f"{bucket}/{key}"
+        download_path = self._download_path(ref, suffix)
+        download_path.parent.mkdir(parents=True, exist_ok=True)
+        result = download_object(s3, bucket, key, download_path, **download_options)
+
+        path = self.object_path(result.etag, suffix)
+        if not path.exists():
+            _link_or_copy(download_path, path)
+        with self._index() as index:
+            index["objects"][path.name] = {"size": path.stat().st_size, "last_used": time.time()}
+            index["keys"][ref] = path.name
+        return path, result
+
+    def touch(self, paths: Iterable[Path]) -> None:
+        """최근 사용 시각 갱신 (LRU)"""
+        with self._index() as index:
+            for path in paths:
+                entry = index["objects"].get(Path(path).name)
+                if entry is not None:
+                    entry["last_used"] = time.time()
+
+    # ===========================================
+    # 버전 이력
+    # ===========================================
+
+    def record(self, commodity: str, version: Dict[str, Optional[str]]) -> None:
+        """
+        품목 설치 이력에 버전 추가 (오래된 순, 최근 max_versions개)
+
+        version: {"onnx_key", "onnx_etag", "pkl_key", "pkl_etag"}
+        이미 있는 버전(롤백 포함)은 순서를 바꾸지 않는다.
+        """
+        with self._index() as index:
+            history = index["history"].setdefault(commodity, [])
+            if any(_same_version(entry, version) for entry in history):
+                return
+            history.append({**version, "installed_at": time.time()})
+            del history[:-self.max_versions]
+
+    def history(self, commodity: str) -> List[dict]:
+        """품목 설치 이력 (오래된 순, 각 항목에 cached = 파일이 남아 있는지)"""
+        with self._index() as index:
+            history = [dict(entry) for entry in index["history"].get(commodity, [])]
+        for entry in history:
+            entry["cached"] = self.object_path(entry["onnx_etag"], ".onnx").exists() and (
+                entry.get("pkl_etag") is None or self.object_path(entry["pkl_etag"], ".pkl").exists()
+            )
+        return history
+
+    def versions(self) -> List[dict]:
+        """모든 품목 이력의 버전 + 롤백 고정 버전 (롤백 / 다른 워커가 쓸 수 있는 버전 전체)"""
+        with self._index() as index:
+            return [dict(entry) for history in index["history"].values() for entry in history] + [
+                dict(pin["version"]) for pin in index["pins"].values()
+            ]
+
+    # ===========================================
+    # 롤백 고정 (워커 간 공유)
+    # ===========================================
+
+    def pin(self, commodity: str, rolled_back: str, version: Dict[str, Optional[str]]) -> None:
+        """
+        롤백 고정 기록: 품목은 version으로 서빙하고, S3 최신이 rolled_back인 동안 다시 올리지 않음
+
+        모든 워커가 다음 업데이트 확인(또는 재시작 후 로드)에서 같은 버전으로 맞춘다.
+        """
+        with self._index() as index:
+            index["pins"][commodity] = {"rolled_back": rolled_back, "version": dict(version)}
+
+    def unpin(self, commodity: str) -> None:
+        """롤백 고정 해제 (더 새 모델이 올라옴)"""
+        with self._index() as index:
+            index["pins"].pop(commodity, None)
+
+    def pinned(self, commodity: str) -> Optional[dict]:
+        """품목의 롤백 고정 {rolled_back, version} (없으면 None)"""
+        with self._index() as index:
+            pin = index["pins"].get(commodity)
+        return dict(pin) if pin is not None else None
+
+    # ===========================================
+    # 정리
+    # ===========================================
+
+    def evict(self, protected: Iterable[Path] = ()) -> List[str]:
+        """
+        이력에서 빠진 객체 삭제 + 크기 한도 초과 시 오래 안 쓴 객체부터 삭제
+
+        Returns:
+            삭제된 객체 이름 목록
+        """
+        protected_names = {Path(path).name for path in protected}
+        removed = []
+        with self._index() as index:
+            referenced = {
+                name
+                for history in index["history"].values()
+                for entry in history
+                for name in _entry_objects(self, entry)
+            }
+            # 롤백 고정 버전은 이력에서 빠지거나 크기 한도를 넘어도 유지 (다른 워커가 아직 적용 전일 수 있음)
+            protected_names.update(
+                name for pin in index["pins"].values() for name in _entry_objects(self, pin["version"])
+            )
+            objects = index["objects"]
+            total = sum(entry["size"] for entry in objects.values())
+            now = time.time()
+            for name in sorted(objects, key=lambda n: objects[n]["last_used"]):
+                if name in protected_names:
+                    continue
+                if name not in referenced and now - objects[name]["last_used"] < _UNREFERENCED_GRACE_SECONDS:
+                    continue
+                if name in referenced and (not self.max_bytes or total <= self.max_bytes):
+                    continue
+                total -= objects.pop(name)["size"]
+                (self.root / "objects" / name).unlink(missing_ok=True)
+                removed.append(name)
+
+            # 삭제된 객체를 가리키던 key 다운로드 파일 / 롤백할 수 없게 된 이력 정리
+            for ref, name in list(index["keys"].items()):
+                if name in removed:
+                    remove_local(self._download_path(ref, Path(name).suffix))
+                    del index["keys"][ref]
+            for commodity, history in index["history"].items():
+                history[:] = [
+                    entry for entry in history
+                    if not any(name in removed for name in _entry_objects(self, entry))
+                ]
+
+        if removed:
+            logger.info(f"🧹 모델 저장소 정리: {len(removed)}개 삭제 ({', '.join(removed)})")
+        return removed
+
+    def _download_path(self, ref: str, suffix: str) -> Path:
+        return self.root / "downloads" / f"{hashlib.blake2b(ref.encode(), digest_size=10).hexdigest()}{suffix}"
+
+    @contextmanager
+    def _index(self) -> Iterator[dict]:
+        """index.json을 잠그고 읽어 블록이 끝나면 저장 (프로세스 간 공유)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / _INDEX_FILE
+        with file_lock(path):
+            try:
+                index = json.loads(path.read_text())
+            except (OSError, ValueError):
+                index = {}
+            for section in ("objects", "keys", "history", "pins"):
+                index.setdefault(section, {})
+            yield index
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(json.dumps(index, indent=1))
+            os.replace(tmp, path)
+
+
+def _same_version(entry: dict, version: dict) -> bool:
+    return all(entry.get(k) == version.get(k) for k in ("onnx_key", "onnx_etag", "pkl_key", "pkl_etag"))
+
+
+def _entry_objects(store: ModelStore, entry: dict) -> List[str]:
+    names = [store.object_path(entry["onnx_etag"], ".onnx").name]
+    if entry.get("pkl_etag"):
+        names.append(store.object_path(entry["pkl_etag"], ".pkl").name)
+    return names
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """하드링크 (지원하지 않는 파일시스템이면 복사) - 이미 있으면 그대로"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
@@ -1,60 +1,169 @@
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from pathlib import Path
+import hashlib
 import logging
+import time
 
-from .model_loader import get_model_loader
+from .cache import InvalidationLog, LRUCache
+from .feature_layout import (
+    DEFAULT_FEATURE_ORDER, DEFAULT_LAYOUT, KNOWN_FEATURES, STATIC_FEATURES, TIME_FEATURES,
+    FeatureLayout,
+)
+from .io_binding import run_bound
+from .metrics import REGISTRY, Counter, Gauge, stage_timer
+from .micro_batcher import MicroBatcher
+from . import preprocessing
+from .preprocessing import Preprocessor
+from .model_loader import LoadedModel, get_model_loader
+from .process_pool import ModelRef, create_process_pool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class TFTFeatureConfig:
-    """TFT 모델의 Feature 구성 정보"""
+    """
+    TFT 모델의 기본 Feature 구성 정보
+    
+    실제 입력 레이아웃은 모델 로드 시 pkl / ONNX 메타데이터로 컴파일한
+    FeatureLayout을 사용한다 (메타데이터가 없으면 아래 기본값과 동일).
+    """
     
     # Feature 순서 정의 (총 52개)
-    FEATURE_ORDER = [
-        # Unknown Time-Varying (46개)
-        'close', 'open', 'high', 'low', 'volume', 'EMA',  # 가격/거래량 6개
-        *[f'news_pca_{i}' for i in range(32)],  # 뉴스 PCA 32개
-        'pdsi', 'spi30d', 'spi90d',  # 기후 지수 3개
-        '10Y_Yield', 'USD_Index',  # 거시경제 2개
-        'lambda_price', 'lambda_news',  # Hawkes Intensity 2개
-        'news_count',  # 뉴스 개수 1개
-        # Known Time-Varying (3개)
-        'time_idx', 'day_of_year', 'relative_time_idx',
-        # Static (3개)
-        'encoder_length', 'close_center', 'close_scale'
-    ]
+    FEATURE_ORDER = list(DEFAULT_FEATURE_ORDER)
     
     # 시계열 관련 Feature (동적 생성 필요)
-    TIME_FEATURES = {'time_idx', 'day_of_year', 'relative_time_idx'}
+    TIME_FEATURES = set(TIME_FEATURES)
     
     # Static Feature (모든 시점에서 동일)
-    STATIC_FEATURES = {'encoder_length', 'close_center', 'close_scale'}
+    STATIC_FEATURES = set(STATIC_FEATURES)
     
     # Known Future Features (미래 시점에도 알 수 있는 Feature)
-    KNOWN_FEATURES = TIME_FEATURES | STATIC_FEATURES
+    KNOWN_FEATURES = set(KNOWN_FEATURES)
     
     # Encoder/Decoder 길이
-    ENCODER_LENGTH = 60
-    DECODER_LENGTH = 7
+    ENCODER_LENGTH = DEFAULT_LAYOUT.encoder_length
+    DECODER_LENGTH = DEFAULT_LAYOUT.decoder_length
     
     # 기본값
     DEFAULT_CLOSE_VALUE = 450.0
     DEFAULT_SCALE_VALUE = 1.0
-    DEFAULT_TARGET_CENTER = 450.0
-    DEFAULT_TARGET_SCALE = 10.0
+    DEFAULT_TARGET_CENTER = preprocessing.DEFAULT_TARGET_CENTER
+    DEFAULT_TARGET_SCALE = preprocessing.DEFAULT_TARGET_SCALE
 
 
 class ONNXPredictionService:
     """ONNX 기반 TFT 모델 예측 서비스"""
     
-    def __init__(self):
+    def __init__(self, inference_backend: Optional[str] = None):
+        """
+        Args:
+            inference_backend: "thread" / "process" (None이면 INFERENCE_BACKEND,
+                process 워커 안의 서비스는 "thread")
+        """
         self.model_loader = get_model_loader()
         self.feature_config = TFTFeatureConfig()
+        self._warm_commodities: set = set()
+        self.baseline_cache = LRUCache(settings.baseline_cache_size, name="baseline")
+        self.result_cache = LRUCache(
+            settings.simulation_cache_size,
+            name="simulation",
+            ttl=settings.simulation_cache_ttl_seconds
+        )
+        self.calendar_cache = LRUCache(self.CALENDAR_CACHE_SIZE, name="calendar")
+        # 워커가 여러 개면 market_metrics 쓰기 무효화를 공유 기록으로 다른 워커에 전달
+        self._invalidations = (
+            InvalidationLog(Path(settings.cache_invalidation_log))
+            if settings.web_concurrency > 1 and settings.cache_invalidation_log else None
+        )
+        self._constant_inputs: Dict[tuple, Dict[str, np.ndarray]] = {}   # {(길이, 배치 크기): 상수 입력}
+        
+        # 추론 백엔드 (thread: 프로세스 내 세션 / process: 워커 프로세스 풀)
+        self.process_pool = create_process_pool(inference_backend)
+        
+        # 동시 요청 micro-batching (선택, thread 백엔드 전용 - process 백엔드는 워커에서 텐서를 만듦)
+        self.micro_batcher: Optional[MicroBatcher] = None
+        if settings.micro_batch_enabled and self.process_pool is None:
+            self.micro_batcher = MicroBatcher(
+                self._run_session,
+                window_ms=settings.micro_batch_window_ms,
+                max_batch_size=settings.micro_batch_max_size
+            )
+        elif settings.micro_batch_enabled:
+            logger.warning("⚠️ process 백엔드에서는 micro-batching을 사용하지 않습니다 (MICRO_BATCH_ENABLED 무시)")
         logger.info("TFT 예측 서비스 초기화 완료")
     
+    # ===========================================
+    # 워밍업 / 준비 상태
+    # ===========================================
+    
+    # 워밍업 시 실행할 배치 크기 (단건 예측, 원본+시뮬레이션)
+    WARMUP_BATCH_SIZES = (1, 2)
+    
+    def warm_up(self, commodities: Optional[List[str]] = None) -> bool:
+        """
+        품목별 ONNX 세션을 로드하고 더미 추론으로 워밍업
+        
+        첫 요청이 세션 생성 및 ORT 메모리 할당/커널 초기화 비용을
+        떠안지 않도록 서버 시작 시(또는 모델 교체 후) 호출한다.
+        모델 다운로드/세션 생성은 품목별로 동시에 진행하고,
+        더미 추론(수 ms)은 로드가 끝난 품목부터 순서대로 실행한다.
+        
+        Returns:
+            설정된 모든 품목이 워밍업 완료되었는지 여부
+        """
+        commodities = commodities or settings.model_commodities
+        
+        for commodity in commodities:
+            self._warm_commodities.discard(commodity)
+        load_errors = self.model_loader.load_all(commodities)
+        
+        for commodity in commodities:
+            try:
+                if load_errors.get(commodity) is not None:
+                    raise load_errors[commodity]
+                self.warm_model(self.model_loader.get_model(commodity))
+            except Exception as e:
+                logger.error(f"❌ [{commodity}] 세션 워밍업 실패: {e}")
+                continue
+            self._warm_commodities.add(commodity)
+        
+        return self.is_ready
+    
+    def warm_model(self, model: LoadedModel) -> None:
+        """
+        모델 묶음 1개를 더미 추론으로 워밍업 (실패 시 예외)
+        
+        서빙 모델로 교체되기 전의 새 묶음에도 쓸 수 있어,
+        야간 갱신 시 교체 직후 요청이 초기화 비용을 떠안지 않는다.
+        """
+        start = time.perf_counter()
+        dummy_data = {'dates': [], 'features': {}}
+        for batch_size in self.WARMUP_BATCH_SIZES:
+            model_inputs = self._prepare_batch_inputs(
+                dummy_data, [None] * batch_size, layout=model.layout, preprocessor=model.preprocessor
+            )
+            self._run_session(model.session, model_inputs)
+        if self.process_pool and not self.process_pool.warm_up(
+            self._model_ref(model), dummy_data, [None] * self.WARMUP_BATCH_SIZES[-1]
+        ):
+            raise RuntimeError("워커 프로세스 워밍업 실패")
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"🔥 [{model.commodity}] 세션 워밍업 완료 ({elapsed_ms:.0f}ms, {model.version})")
+    
+    @property
+    def is_ready(self) -> bool:
+        """설정된 모든 품목의 세션이 워밍업되었는지 여부"""
+        return set(settings.model_commodities) <= self._warm_commodities
+    
+    @property
+    def warm_commodities(self) -> List[str]:
+        """워밍업 완료된 품목 목록"""
+        return sorted(self._warm_commodities)
+    
     def predict_tft(
         self, 
         commodity: str, 
@@ -90,24 +199,225 @@ class ONNXPredictionService:
                 'upper_bounds': [...]   # 상한
             }
         """
-        # ONNX 세션 로드
-        session = self.model_loader.load_session(commodity)
+        return self.predict_tft_batch(commodity, historical_data, [feature_overrides])[0]
+    
+    def predict_tft_batch(
+        self,
+        commodity: str,
+        historical_data: Dict[str, any],
+        overrides_list: List[Optional[Dict[str, float]]],
+        base_date: Optional[date] = None,
+        model: Optional[LoadedModel] = None
+    ) -> List[Dict[str, List[float]]]:
+        """
+        여러 시나리오를 배치 축으로 쌓아 한 번의 session.run으로 예측
+        
+        같은 과거 데이터에 대해 override 세트만 다른 시나리오들을
+        [B, T, 52] 텐서 하나로 만들어 추론한다.
+        원본(override 없음) 예측은 base_date가 주어지면
+        (품목, 기준일, 모델 버전, 입력 윈도우) 키로 캐시한다.
+        
+        Args:
+            commodity: 품목명
+            historical_data: 과거 데이터 (predict_tft와 동일)
+            overrides_list: 시나리오별 feature override (None = 원본 예측)
+                예: [None, {"USD_Index": 105.0}, {"USD_Index": 110.0}]
+            base_date: 기준 날짜 (원본 예측 캐시 키)
+            model: 추론할 모델 묶음 (None이면 현재 서빙 모델).
+                과거 데이터를 이 묶음의 입력 레이아웃으로 읽었다면 같은 묶음을 넘긴다.
+        
+        Returns:
+            시나리오 순서대로 예측 결과 리스트 (각 항목은 predict_tft 반환 형식)
+        """
+        if not overrides_list:
+            return []
         
-        # TFT 입력 형식으로 변환
-        model_inputs = self._prepare_model_inputs(historical_data, feature_overrides)
+        # 서빙 모델 (요청이 끝날 때까지 이 버전으로 처리, 도중 교체와 무관)
+        model = model or self.model_loader.get_model(commodity)
+        
+        # 원본 예측 캐시 조회
+        baseline = None
+        baseline_key = None
+        has_baseline = any(not overrides for overrides in overrides_list)
+        if has_baseline and base_date is not None:
+            baseline_key = self._baseline_cache_key(model, base_date, historical_data)
+            baseline = self.baseline_cache.get(baseline_key)
+        
+        # 실제 추론할 시나리오 (원본은 캐시 miss일 때 1행만)
+        scenarios = [overrides for overrides in overrides_list if overrides]
+        run_baseline = has_baseline and baseline is None
+        if run_baseline:
+            scenarios.insert(0, None)
+        
+        run_results = (
+            self._infer(model, historical_data, scenarios, base_date)
+            if scenarios else []
+        )
+        
+        if run_baseline:
+            baseline = run_results.pop(0)
+            if baseline_key is not None:
+                self.baseline_cache.put(baseline_key, baseline)
+        
+        scenario_results = iter(run_results)
+        return [
+            next(scenario_results) if overrides else {k: list(v) for k, v in baseline.items()}
+            for overrides in overrides_list
+        ]
+    
+    def _infer(
+        self,
+        model: LoadedModel,
+        historical_data: Dict[str, any],
+        overrides_list: List[Optional[Dict[str, float]]],
+        base_date: Optional[date] = None
+    ) -> List[Dict[str, List[float]]]:
+        """시나리오 목록 → 입력 텐서 → session.run → 결과 파싱"""
+        if self.process_pool is not None:
+            # 텐서 생성 / 추론 / 결과 파싱 모두 워커 프로세스에서 (입력 윈도우는 공유 메모리)
+            with stage_timer("worker_infer"):
+                return self.process_pool.infer(
+                    self._model_ref(model), historical_data, overrides_list, base_date
+                )
+        
+        # TFT 입력 형식으로 변환 (시나리오 수 = 배치 크기)
+        with stage_timer("tensor_build"):
+            model_inputs = self._prepare_batch_inputs(
+                historical_data, overrides_list, base_date, model.layout, model.preprocessor
+            )
         
         # 로깅
         self._log_inference_info(model_inputs)
         
         # 추론 실행
-        outputs = session.run(None, model_inputs)
+        outputs = self._execute(model, model_inputs)
         
         # 결과 파싱
-        result = self._parse_predictions(outputs)
+        with stage_timer("parse"):
+            results = [
+                self._parse_predictions(outputs, index=b) for b in range(len(overrides_list))
+            ]
         
-        logger.info(f"예측 완료 - 7일 예측: {result['predictions']}")
+        logger.debug(f"예측 완료 - {len(results)}개 시나리오, 1일차: "
+                     f"{[r['predictions'][0] for r in results]}")
         
-        return result
+        return results
+    
+    # ===========================================
+    # 예측 캐시 (원본 예측 / 시뮬레이션 결과)
+    # ===========================================
+    
+    def _baseline_cache_key(
+        self,
+        model: LoadedModel,
+        base_date: date,
+        historical_data: Dict[str, any]
+    ) -> tuple:
+        """(품목, 기준일, 모델 버전, 입력 윈도우 해시) 캐시 키"""
+        return (
+            model.commodity,
+            base_date,
+            model.version,
+            self._window_fingerprint(historical_data),
+        )
+    
+    @staticmethod
+    def _window_fingerprint(historical_data: Dict[str, any]) -> str:
+        """과거 데이터 윈도우(날짜 + feature 값)의 해시"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(list(historical_data.get('dates', []))).encode())
+        features = historical_data['features']
+        for name in sorted(features):
+            digest.update(name.encode())
+            digest.update(np.asarray(features[name], dtype=np.float64).tobytes())
+        return digest.hexdigest()
+    
+    def invalidate_cache(
+        self,
+        commodity: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """
+        품목의 예측 캐시(원본 예측 + 시뮬레이션 결과) 무효화
+        
+        두 캐시 모두 키가 (품목, 기준일, ...)로 시작한다.
+        날짜 범위가 주어지면 입력 윈도우(기준일 이전 ENCODER_LENGTH일)가
+        [start_date, end_date]와 겹치는 기준일만 제거한다.
+        market_metrics 쓰기 시 호출 - 공유 기록에도 남겨 다른 워커가 다음 조회 전에 같은 범위를 지운다.
+        
+        Returns:
+            제거된 항목 수 (이 워커)
+        """
+        if self._invalidations is not None:
+            self._invalidations.append({
+                "commodity": commodity,
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None,
+            })
+        return self._invalidate_local(commodity, start_date, end_date)
+    
+    def sync_invalidations(self) -> int:
+        """
+        다른 워커가 기록한 캐시 무효화 적용 (캐시 조회 전 호출, 새 기록이 없으면 stat 1번)
+        
+        Returns:
+            제거된 항목 수
+        """
+        if self._invalidations is None:
+            return 0
+        removed = 0
+        for record in self._invalidations.poll():
+            removed += self._invalidate_local(
+                record["commodity"],
+                date.fromisoformat(record["start_date"]) if record.get("start_date") else None,
+                date.fromisoformat(record["end_date"]) if record.get("end_date") else None,
+            )
+        return removed
+    
+    def _invalidate_local(
+        self,
+        commodity: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """이 워커의 캐시에서 품목 / 날짜 범위 제거"""
+        window = timedelta(days=self.model_loader.get_feature_layout(commodity).encoder_length - 1)
+        
+        def _affected(key: tuple) -> bool:
+            key_commodity, base_date = key[0], key[1]
+            if key_commodity != commodity:
+                return False
+            if start_date is None or end_date is None:
+                return True
+            return base_date >= start_date and base_date - window <= end_date
+        
+        return self.baseline_cache.invalidate(_affected) + self.result_cache.invalidate(_affected)
+    
+    def cache_stats(self) -> Dict[str, dict]:
+        """캐시별 통계 (size, hits, misses, hit_rate)"""
+        return {
+            self.baseline_cache.name: self.baseline_cache.stats(),
+            self.result_cache.name: self.result_cache.stats(),
+            self.calendar_cache.name: self.calendar_cache.stats(),
+        }
+    
+    def on_model_updated(self, commodity: str) -> None:
+        """모델 교체 후 처리: 이전 버전 캐시 무효화"""
+        self.on_models_updated([commodity])
+    
+    def on_models_updated(self, commodities: List[str]) -> None:
+        """
+        여러 품목 모델 교체 후 처리 (야간 갱신)
+        
+        새 세션은 교체 전에 warm_model로 워밍업되므로 여기서는 캐시만 정리하고,
+        준비 상태(is_ready)를 내렸다 올리지 않는다.
+        """
+        for commodity in commodities:
+            # 모델 버전이 캐시 키에 있으므로 다른 워커에 전달하지 않음 (각 워커가 자기 교체 때 정리)
+            self._invalidate_local(commodity)
+            self._warm_commodities.add(commodity)
+        self._constant_inputs.clear()
     
     def _prepare_model_inputs(
         self, 
@@ -129,169 +439,403 @@ class ONNXPredictionService:
         Returns:
             ONNX 모델 입력 텐서 딕셔너리
         """
-        features = historical_data['features'].copy()
+        return self._prepare_batch_inputs(historical_data, [feature_overrides])
+    
+    def _prepare_batch_inputs(
+        self,
+        historical_data: Dict[str, any],
+        overrides_list: List[Optional[Dict[str, float]]],
+        base_date: Optional[date] = None,
+        layout: Optional[FeatureLayout] = None,
+        preprocessor: Optional[Preprocessor] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        시나리오 B개에 대한 모델 입력 생성 (모든 텐서의 첫 축 = B)
         
-        # Feature override 적용
-        if feature_overrides:
-            features = self._apply_feature_overrides(features, feature_overrides)
+        layout: 모델 입력 레이아웃 (None이면 전처리 엔진의 레이아웃 또는 기본 레이아웃)
+        preprocessor: 모델 전처리 엔진 (None이면 정규화 없이 raw 값 + 기본 target_scale)
+        """
+        layout = layout or (preprocessor.layout if preprocessor else DEFAULT_LAYOUT)
+        features = historical_data['features']
+        batch_size = len(overrides_list)
         
-        # Encoder/Decoder 데이터 생성
-        encoder_cont = self._build_encoder_features(features)
-        decoder_cont = self._build_decoder_features(features)
+        # 시점별 달력 feature (실제 날짜 기준, 기준일/윈도우별 캐시)
+        calendar = self._get_calendar_features(historical_data.get('dates', []), base_date, layout)
         
-        # 범주형 데이터 (group_id)
-        encoder_cat = np.zeros([1, self.feature_config.ENCODER_LENGTH, 1], dtype=np.int64)
-        decoder_cat = np.zeros([1, self.feature_config.DECODER_LENGTH, 1], dtype=np.int64)
+        # Encoder/Decoder 데이터 생성 (override는 컬럼 단위로 적용)
+        encoder_cont, decoder_cont = self._build_cont_tensors(
+            features, overrides_list, calendar, layout
+        )
         
-        # Lengths
-        encoder_lengths = np.array([self.feature_config.ENCODER_LENGTH], dtype=np.int64)
-        decoder_lengths = np.array([self.feature_config.DECODER_LENGTH], dtype=np.int64)
+        # 범주형 / Lengths (배치 크기별 상수)
+        constants = self._get_constant_inputs(batch_size, layout)
         
-        # Target scale
-        target_scale = self._get_target_scale(features)
+        # Target scale + 정규화 (전처리 엔진이 있으면 실제 윈도우 기준)
+        if preprocessor is not None:
+            target_scale = np.repeat(preprocessor.target_scale(features), batch_size, axis=0)
+            preprocessor.transform(encoder_cont, decoder_cont, target_scale)
+        else:
+            target_scale = constants['target_scale']
         
         return {
-            'encoder_cat': encoder_cat,
+            'encoder_cat': constants['encoder_cat'],
             'encoder_cont': encoder_cont,
-            'encoder_lengths': encoder_lengths,
-            'decoder_cat': decoder_cat,
+            'encoder_lengths': constants['encoder_lengths'],
+            'decoder_cat': constants['decoder_cat'],
             'decoder_cont': decoder_cont,
-            'decoder_lengths': decoder_lengths,
+            'decoder_lengths': constants['decoder_lengths'],
             'target_scale': target_scale
         }
     
+    def _get_constant_inputs(self, batch_size: int, layout: FeatureLayout) -> Dict[str, np.ndarray]:
+        """
+        요청과 무관한 입력 텐서 (배치 크기별 1회 생성, 모델 교체 시 재생성)
+        
+        읽기 전용으로 만들어 두어 IO binding 버퍼에 한 번 복사한 뒤에는 다시 복사하지 않는다.
+        """
+        key = (layout.encoder_length, layout.decoder_length, batch_size)
+        constants = self._constant_inputs.get(key)
+        if constants is None:
+            enc_len, dec_len = layout.encoder_length, layout.decoder_length
+            constants = {
+                # 범주형 데이터 (group_id)
+                'encoder_cat': np.zeros([batch_size, enc_len, 1], dtype=np.int64),
+                'decoder_cat': np.zeros([batch_size, dec_len, 1], dtype=np.int64),
+                # Lengths
+                'encoder_lengths': np.full([batch_size], enc_len, dtype=np.int64),
+                'decoder_lengths': np.full([batch_size], dec_len, dtype=np.int64),
+                # Target scale (전처리 엔진이 없을 때의 기본값)
+                'target_scale': np.repeat(self._get_target_scale({}), batch_size, axis=0),
+            }
+            for array in constants.values():
+                array.setflags(write=False)
+            self._constant_inputs[key] = constants
+        return constants
+    
+    def _execute(self, model: LoadedModel, model_inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """
+        현재 프로세스의 세션으로 실행 (micro-batching 사용 시 동시 요청과 합쳐서 실행)
+
+        micro-batching 사용 시 session_run 단계는 배처 워커가 실제 실행만 기록
+        (대기열 대기 시간은 micro_batch_queue_wait_seconds)
+        """
+        if self.micro_batcher is not None:
+            return self.micro_batcher.run(model.session, model_inputs)
+        with stage_timer("session_run"):
+            return self._run_session(model.session, model_inputs)
+    
+    @staticmethod
+    def _model_ref(model: LoadedModel) -> ModelRef:
+        """워커 프로세스가 모델을 찾을 키 (서빙 ONNX 경로 + 버전 태그 + 품목 + pkl 경로)"""
+        return ModelRef(
+            path=str(model.model_path),
+            source_tag=model.source_tag or "",
+            commodity=model.commodity,
+            pkl_path=str(model.pkl_path) if model.pkl_path else "",
+        )
+    
+    @staticmethod
+    def _run_session(session, model_inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """
+        배치 추론 실행
+        
+        배치가 inference_max_batch_size보다 크거나, ONNX 그래프의 배치 차원이
+        고정(예: 1)이면 조각 단위로 나눠 실행 후 합친다.
+        """
+        batch_size = model_inputs['encoder_cont'].shape[0]
+        fixed_batch = ONNXPredictionService._get_fixed_batch_size(session)
+        chunk_size = fixed_batch or settings.inference_max_batch_size
+        
+        if batch_size == fixed_batch or (fixed_batch is None and batch_size <= chunk_size):
+            return ONNXPredictionService._session_run(session, model_inputs)
+        
+        chunk_outputs = []
+        for start in range(0, batch_size, chunk_size):
+            stop = min(start + chunk_size, batch_size)
+            chunk = {}
+            for name, array in model_inputs.items():
+                part = array[start:stop]
+                if fixed_batch and stop - start < fixed_batch:
+                    # 고정 배치: 마지막 조각은 마지막 행을 반복해 고정 크기로 채움
+                    pad = np.repeat(part[-1:], fixed_batch - (stop - start), axis=0)
+                    part = np.concatenate([part, pad], axis=0)
+                chunk[name] = part
+            outputs = ONNXPredictionService._session_run(session, chunk)
+            chunk_outputs.append([output[:stop - start] for output in outputs])
+        
+        return [
+            np.concatenate([outputs[i] for outputs in chunk_outputs], axis=0)
+            for i in range(len(chunk_outputs[0]))
+        ]
+    
+    @staticmethod
+    def _session_run(session, model_inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """session.run 1회 (ORT_IO_BINDING이면 스레드별 재사용 버퍼 사용)"""
+        if settings.ort_io_binding:
+            return run_bound(session, model_inputs)
+        return session.run(None, model_inputs)
+    
+    @staticmethod
+    def _get_fixed_batch_size(session) -> Optional[int]:
+        """encoder_cont 입력의 배치 차원이 고정값이면 반환 (동적이면 None)"""
+        for model_input in session.get_inputs():
+            if model_input.name == 'encoder_cont':
+                dim = model_input.shape[0]
+                return dim if isinstance(dim, int) else None
+        return None
+    
+    # ===========================================
+    # 연속형 텐서 빌더 (NumPy 벡터화)
+    # ===========================================
+    
+    def _build_cont_tensors(
+        self,
+        features: Dict[str, List[float]],
+        overrides_list: List[Optional[Dict[str, float]]],
+        calendar: Optional[Dict[str, np.ndarray]] = None,
+        layout: Optional[FeatureLayout] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        encoder_cont / decoder_cont 텐서를 한 번에 생성
+        
+        미리 할당한 [B, T, F] float32 배열에 컬럼 슬라이스 단위로 값을 채운다.
+        - 가격/뉴스/기후 등: feature 배열을 인코더 구간에 그대로 복사 (디코더는 0)
+        - Static / Time: 전체 시점에 broadcast
+        - override: 해당 컬럼의 관측 구간을 상수로 덮어씀
+        
+        Args:
+            features: feature별 시계열 데이터
+            overrides_list: 배치 행별 feature override (None = 원본)
+            calendar: 시점별 time feature (None이면 날짜 없이 오늘 기준)
+            layout: 모델 입력 레이아웃 (None이면 기본 레이아웃)
+        
+        Returns:
+            (encoder_cont [B, 60, 52], decoder_cont [B, 7, 52])  (기본 레이아웃 기준)
+        """
+        layout = layout or DEFAULT_LAYOUT
+        enc_len = layout.encoder_length
+        batch_size = len(overrides_list)
+        num_features = layout.num_features
+        
+        encoder_cont = np.zeros([batch_size, enc_len, num_features], dtype=np.float32)
+        decoder_cont = np.zeros([batch_size, layout.decoder_length, num_features], dtype=np.float32)
+        
+        # 1) 과거 관측 feature (디코더 구간은 0 유지)
+        present = [
+            (idx, features[name]) for name, idx in layout.observed_columns
+            if features.get(name) is not None
+        ]
+        lengths = {min(len(values), enc_len) for _, values in present}
+        if len(lengths) == 1:
+            # 모든 feature 길이가 같으면 [F, n] 블록을 한 번에 복사
+            n = lengths.pop()
+            columns = [idx for idx, _ in present]
+            block = np.array([values[:n] for _, values in present], dtype=np.float32)
+            encoder_cont[:, :n, columns] = block.T
+        else:
+            for idx, values in present:
+                n = min(len(values), enc_len)
+                encoder_cont[:, :n, idx] = values[:n]
+        
+        # 2) Static / Time 블록 (전체 시점 공통)
+        known_indices = list(layout.known_indices)
+        known_block = self._build_known_block(features, calendar, layout)
+        encoder_cont[:, :, known_indices] = known_block[:enc_len]
+        decoder_cont[:, :, known_indices] = known_block[enc_len:]
+        
+        # 3) Feature override (관측 구간 전체를 동일 값으로)
+        for b, overrides in enumerate(overrides_list):
+            if overrides:
+                self._apply_feature_overrides(
+                    encoder_cont[b], decoder_cont[b], features, overrides, layout
+                )
+        
+        return encoder_cont, decoder_cont
+    
     def _apply_feature_overrides(
-        self, 
-        features: Dict[str, List[float]], 
-        overrides: Dict[str, float]
-    ) -> Dict[str, List[float]]:
-        """Feature override를 적용"""
+        self,
+        encoder_row: np.ndarray,
+        decoder_row: np.ndarray,
+        features: Dict[str, List[float]],
+        overrides: Dict[str, float],
+        layout: FeatureLayout
+    ) -> None:
+        """Feature override를 배치 한 행([T, F])에 적용"""
+        enc_len = layout.encoder_length
+        
         for key, value in overrides.items():
-            if key in features:
-                # 모든 시점에 동일한 값 적용
-                features[key] = [value] * len(features[key])
-        return features
-    
-    def _build_encoder_features(self, features: Dict[str, List[float]]) -> np.ndarray:
-        """Encoder용 feature 배열 생성 (과거 60일)"""
-        encoder_data = []
-        
-        for i in range(self.feature_config.ENCODER_LENGTH):
-            feature_vector = self._get_feature_vector_at_index(features, i, is_encoder=True)
-            encoder_data.append(feature_vector)
-        
-        return np.array([encoder_data], dtype=np.float32)  # [1, 60, 52]
-    
-    def _build_decoder_features(self, features: Dict[str, List[float]]) -> np.ndarray:
-        """Decoder용 feature 배열 생성 (미래 7일)"""
-        decoder_data = []
-        
-        for i in range(self.feature_config.DECODER_LENGTH):
-            feature_vector = self._get_feature_vector_at_index(
-                features, 
-                self.feature_config.ENCODER_LENGTH + i, 
-                is_encoder=False
-            )
-            decoder_data.append(feature_vector)
+            if key not in features:
+                continue
+            length = len(features[key])
+            
+            if key in layout.observed_index:
+                encoder_row[:min(length, enc_len), layout.observed_index[key]] = value
+            
+            # close 변경 시 close_center도 함께 변경
+            if key == 'close' and 'close_center' in layout.column_index:
+                center_idx = layout.column_index['close_center']
+                encoder_row[:min(length, enc_len), center_idx] = value
+                decoder_row[:max(min(length, layout.total_length) - enc_len, 0), center_idx] = value
+    
+    def _build_known_block(
+        self,
+        features: Dict[str, List[float]],
+        calendar: Optional[Dict[str, np.ndarray]] = None,
+        layout: Optional[FeatureLayout] = None
+    ) -> np.ndarray:
+        """Static/Time feature 블록 [T_total, K] 생성 (K = known feature 수)"""
+        config = self.feature_config
+        layout = layout or DEFAULT_LAYOUT
+        total = layout.total_length
+        if calendar is None:
+            calendar = self._get_calendar_features([], None, layout)
         
-        return np.array([decoder_data], dtype=np.float32)  # [1, 7, 52]
+        # close_center: 관측 구간은 close, 그 외는 기본값
+        close_center = np.full(total, config.DEFAULT_CLOSE_VALUE, dtype=np.float64)
+        close = features.get('close')
+        if close is not None:
+            n = min(len(close), total)
+            close_center[:n] = close[:n]
+        
+        columns = {
+            'encoder_length': np.full(total, float(layout.encoder_length)),
+            'close_center': close_center,
+            'close_scale': np.full(total, config.DEFAULT_SCALE_VALUE),
+            **calendar,
+        }
+        return np.stack([columns[name] for name in layout.known_names], axis=1)
     
-    def _get_feature_vector_at_index(
-        self, 
-        features: Dict[str, List[float]], 
-        time_idx: int, 
-        is_encoder: bool
-    ) -> List[float]:
-        """특정 시점의 feature 벡터 생성"""
-        feature_vector = []
+    # ===========================================
+    # 달력 feature (time_idx / day_of_year / relative_time_idx)
+    # ===========================================
+    
+    # (기준일, 날짜 윈도우)별 달력 feature 캐시 크기
+    CALENDAR_CACHE_SIZE = 512
+    
+    def _get_calendar_features(
+        self,
+        dates: List,
+        base_date: Optional[date] = None,
+        layout: Optional[FeatureLayout] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        시점별 달력 feature (기준일 + 인코더 날짜 윈도우 단위로 캐시)
         
-        for fname in self.feature_config.FEATURE_ORDER:
-            value = self._get_feature_value(features, fname, time_idx, is_encoder)
-            feature_vector.append(value)
+        - time_idx / relative_time_idx: 윈도우 내 행 위치 (0 ~ 66)
+        - day_of_year: 해당 행의 실제 날짜 기준 연중 일수
         
-        return feature_vector
+        Returns:
+            {'time_idx': [T_total], 'day_of_year': [T_total], 'relative_time_idx': [T_total]}
+        """
+        layout = layout or DEFAULT_LAYOUT
+        window = tuple(str(d) for d in dates[:layout.encoder_length])
+        key = (
+            layout.encoder_length, layout.decoder_length,
+            str(base_date) if base_date is not None else None, window
+        )
+        
+        # 날짜가 없으면 오늘 기준이므로 날짜가 바뀌면 다시 계산되도록 오늘을 키에 포함
+        if not window and base_date is None:
+            key += (str(date.today()),)
+        
+        calendar = self.calendar_cache.get(key)
+        if calendar is None:
+            calendar = {
+                'time_idx': layout.time_idx_values,
+                'day_of_year': self._day_of_year(self._calendar_dates(window, base_date, layout)),
+                'relative_time_idx': layout.relative_time_values,
+            }
+            self.calendar_cache.put(key, calendar)
+        return calendar
     
-    def _get_feature_value(
-        self, 
-        features: Dict[str, List[float]], 
-        feature_name: str, 
-        time_idx: int, 
-        is_encoder: bool
-    ) -> float:
-        """개별 feature 값 계산"""
-        # Static Features
-        if feature_name == 'encoder_length':
-            return float(self.feature_config.ENCODER_LENGTH)
-        elif feature_name == 'close_scale':
-            return self.feature_config.DEFAULT_SCALE_VALUE
-        elif feature_name == 'close_center':
-            return self._get_close_value(features, time_idx)
-        
-        # Time Features
-        elif feature_name == 'time_idx':
-            return float(time_idx)
-        elif feature_name == 'day_of_year':
-            return self._get_day_of_year(time_idx, is_encoder)
-        elif feature_name == 'relative_time_idx':
-            total_length = self.feature_config.ENCODER_LENGTH + self.feature_config.DECODER_LENGTH
-            return float(time_idx) / float(total_length)
-        
-        # Unknown Features (Decoder에서는 0)
-        elif not is_encoder and feature_name not in self.feature_config.KNOWN_FEATURES:
-            return 0.0
-        
-        # 일반 Features
-        elif feature_name in features:
-            if time_idx < len(features[feature_name]):
-                return features[feature_name][time_idx]
-            return 0.0
-        
-        # 기본값
-        return 0.0
-    
-    def _get_close_value(self, features: Dict[str, List[float]], time_idx: int) -> float:
-        """Close 가격 값 가져오기"""
-        if 'close' in features and time_idx < len(features['close']):
-            return features['close'][time_idx]
-        return self.feature_config.DEFAULT_CLOSE_VALUE
-    
-    def _get_day_of_year(self, time_idx: int, is_encoder: bool) -> float:
-        """연중 몇 번째 날인지 계산"""
-        if is_encoder:
-            # 과거 날짜
-            days_ago = self.feature_config.ENCODER_LENGTH - time_idx
-            target_date = datetime.now() - timedelta(days=days_ago)
+    def _calendar_dates(
+        self,
+        window: Tuple[str, ...],
+        base_date: Optional[date],
+        layout: Optional[FeatureLayout] = None
+    ) -> np.ndarray:
+        """
+        시점별 날짜 [T_total] (datetime64[D])
+        
+        - 인코더: 관측 행은 실제 날짜, 관측이 모자란 뒤쪽 행은 마지막 관측일 이후로 하루씩
+        - 디코더: 기준일 다음 날부터 하루씩 (기준일이 없으면 마지막 관측일 기준)
+        """
+        layout = layout or DEFAULT_LAYOUT
+        enc_len = layout.encoder_length
+        observed = np.array(window, dtype='datetime64[D]')
+        n = len(observed)
+        
+        if base_date is not None:
+            anchor = np.datetime64(str(base_date), 'D')
+        elif n:
+            anchor = observed[-1]
         else:
-            # 미래 날짜
-            days_ahead = time_idx - self.feature_config.ENCODER_LENGTH
-            target_date = datetime.now() + timedelta(days=days_ahead)
+            anchor = np.datetime64(date.today(), 'D') - 1
         
-        return float(target_date.timetuple().tm_yday)
+        last = observed[-1] if n else anchor - enc_len
+        encoder_dates = np.concatenate([observed, last + np.arange(1, enc_len - n + 1)])
+        decoder_dates = anchor + np.arange(1, layout.decoder_length + 1)
+        return np.concatenate([encoder_dates, decoder_dates])
+    
+    @staticmethod
+    def _day_of_year(days: np.ndarray) -> np.ndarray:
+        """datetime64[D] → 연중 일수 (1 ~ 366)"""
+        return (days - days.astype('datetime64[Y]')).astype(np.float64) + 1.0
     
     def _get_target_scale(self, features: Dict[str, List[float]]) -> np.ndarray:
-        """Target scale 파라미터 생성"""
+        """기본 Target scale 파라미터 (전처리 엔진이 없을 때)"""
         return np.array(
             [[self.feature_config.DEFAULT_TARGET_CENTER, self.feature_config.DEFAULT_TARGET_SCALE]], 
             dtype=np.float32
         )
     
-    def _parse_predictions(self, outputs: List[np.ndarray]) -> Dict[str, List[float]]:
-        """ONNX 출력을 파싱하여 예측 결과 반환"""
-        predictions = outputs[0]  # shape: [1, 7, 3]
+    def _parse_predictions(self, outputs: List[np.ndarray], index: int = 0) -> Dict[str, List[float]]:
+        """ONNX 출력을 파싱하여 예측 결과 반환 (index = 배치 내 시나리오 위치)"""
+        predictions = outputs[0]  # shape: [B, 7, 3]
         
         return {
-            'predictions': predictions[0, :, 0].tolist(),      # 중앙값
-            'lower_bounds': predictions[0, :, 1].tolist(),     # 하한
-            'upper_bounds': predictions[0, :, 2].tolist()      # 상한
+            'predictions': predictions[index, :, 0].tolist(),      # 중앙값
+            'lower_bounds': predictions[index, :, 1].tolist(),     # 하한
+            'upper_bounds': predictions[index, :, 2].tolist()      # 상한
         }
     
     def _log_inference_info(self, model_inputs: Dict[str, np.ndarray]):
-        """추론 정보 로깅"""
-        logger.info("TFT 추론 실행")
-        for name, array in model_inputs.items():
-            logger.info(f"  {name}: {array.shape}")
+        """추론 입력 shape 로깅 (DEBUG, 단계별 소요 시간은 /metrics 참고)"""
+        if logger.isEnabledFor(logging.DEBUG):
+            shapes = ", ".join(f"{name}={array.shape}" for name, array in model_inputs.items())
+            logger.debug(f"TFT 추론 실행: {shapes}")
+
+
+# ===========================================
+# 싱글톤
+# ===========================================
+
+_prediction_service: Optional[ONNXPredictionService] = None
 
 
 def get_prediction_service() -> ONNXPredictionService:
-    """예측 서비스 인스턴스 반환"""
-    return ONNXPredictionService()
+    """예측 서비스 싱글톤 반환 (프로세스당 1개, lifespan에서 워밍업)"""
+    global _prediction_service
+    if _prediction_service is None:
+        _prediction_service = ONNXPredictionService()
+    return _prediction_service
+
+
+def _collect_cache_metrics():
+    """/metrics 스크레이프 시 캐시별 hit/miss/hit_rate/size"""
+    if _prediction_service is None:
+        return []
+    
+    hits = Counter("prediction_cache_hits_total", "예측 캐시 hit 수", ["cache"])
+    misses = Counter("prediction_cache_misses_total", "예측 캐시 miss 수", ["cache"])
+    hit_ratio = Gauge("prediction_cache_hit_ratio", "예측 캐시 hit 비율", ["cache"])
+    size = Gauge("prediction_cache_size", "예측 캐시 항목 수", ["cache"])
+    for name, stats in _prediction_service.cache_stats().items():
+        hits.inc(stats["hits"], cache=name)
+        misses.inc(stats["misses"], cache=name)
+        hit_ratio.set(stats["hit_rate"], cache=name)
+        size.set(stats["size"], cache=name)
+    return [hits, misses, hit_ratio, size]
+
+
+REGISTRY.register_collector(_collect_cache_metrics)
@@ -0,0 +1,155 @@
+# 전처리 엔진 (pkl 스케일러 → center/scale 벡터)
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from .feature_layout import FeatureLayout, extract_scalers
+
+logger = logging.getLogger(__name__)
+
+# target_scale 기본값 (pkl에 target normalizer가 없을 때 / 윈도우에 관측 target이 없을 때)
+DEFAULT_TARGET_CENTER = 450.0
+DEFAULT_TARGET_SCALE = 10.0
+
+# 윈도우 표준편차 하한 (상수 구간에서 0으로 나누지 않도록)
+_MIN_TARGET_SCALE = 1e-6
+
+# pkl 키
+_TARGET_KEYS = ('target',)
+_TARGET_NORMALIZER_KEYS = ('target_normalizer', 'target_scaler')
+
+# target 스케일을 담는 static feature (pytorch-forecasting add_target_scales)
+_TARGET_CENTER_FEATURE = '{target}_center'
+_TARGET_SCALE_FEATURE = '{target}_scale'
+
+
+class Preprocessor:
+    """
+    모델 버전별 전처리 엔진 (모델 로드 시 1회 생성)
+
+    - feature 정규화: pkl의 feature별 (center, scale)을 [F] 벡터로 만들어
+      [B, T, F] 텐서 전체에 한 번의 broadcast 연산으로 적용 (스케일러 없는 컬럼은 그대로)
+    - target_scale: pkl target normalizer가 고정 (center, scale)이면 그 값,
+      EncoderNormalizer 방식이면 요청 윈도우의 관측 target 평균 / 표준편차,
+      normalizer가 없으면 기존 기본값 (450, 10)
+    - pkl이 target normalizer를 줄 때만 {target}_center / {target}_scale static feature를
+      target_scale 값으로 채움 (없으면 텐서 빌더가 만든 기존 값 그대로)
+    """
+
+    def __init__(
+        self,
+        layout: FeatureLayout,
+        target: str = 'close',
+        fixed_target_scale: Optional[Tuple[float, float]] = None,
+        window_target_scale: bool = False,
+    ):
+        self.layout = layout
+        self.target = target
+        self.fixed_target_scale = fixed_target_scale
+        self.window_target_scale = window_target_scale and fixed_target_scale is None
+
+        num_features = layout.num_features
+        center = np.zeros(num_features, dtype=np.float32)
+        scale = np.ones(num_features, dtype=np.float32)
+        for name, (c, s) in layout.scalers.items():
+            idx = layout.column_index.get(name)
+            if idx is not None and s:
+                center[idx], scale[idx] = c, s
+        self.scaled_features: List[str] = [
+            name for name in layout.feature_order if name in layout.scalers
+        ]
+
+        # 디코더의 관측 feature 구간은 0(패딩) 그대로 유지
+        decoder_center = center.copy()
+        decoder_center[[idx for _, idx in layout.observed_columns]] = 0.0
+
+        self.encoder_center = center
+        self.decoder_center = decoder_center
+        self.inv_scale = (1.0 / scale).astype(np.float32)
+        self.is_identity = not self.scaled_features
+        for array in (self.encoder_center, self.decoder_center, self.inv_scale):
+            array.setflags(write=False)
+
+        target_features = (
+            _TARGET_CENTER_FEATURE.format(target=target),
+            _TARGET_SCALE_FEATURE.format(target=target),
+        )
+        self._target_columns = [
+            layout.column_index[name] for name in target_features if name in layout.column_index
+        ] if self.fixed_target_scale is not None or self.window_target_scale else []
+
+    def target_scale(self, features: Dict[str, List[float]]) -> np.ndarray:
+        """target_scale [1, 2] (center, scale)"""
+        if self.fixed_target_scale is not None:
+            center, scale = self.fixed_target_scale
+        elif not self.window_target_scale:
+            center, scale = DEFAULT_TARGET_CENTER, DEFAULT_TARGET_SCALE
+        else:
+            values = features.get(self.target)
+            observed = (
+                np.asarray(values[:self.layout.encoder_length], dtype=np.float64)
+                if values is not None else np.empty(0)
+            )
+            if observed.size:
+                center = float(observed.mean())
+                scale = max(float(observed.std()), _MIN_TARGET_SCALE)
+            else:
+                center, scale = DEFAULT_TARGET_CENTER, DEFAULT_TARGET_SCALE
+        return np.array([[center, scale]], dtype=np.float32)
+
+    def transform(
+        self,
+        encoder_cont: np.ndarray,
+        decoder_cont: np.ndarray,
+        target_scale: np.ndarray,
+    ) -> None:
+        """raw 값 텐서를 모델 입력 스케일로 변환 (in-place)"""
+        if len(self._target_columns) == 2:
+            encoder_cont[:, :, self._target_columns] = target_scale[:, None, :]
+            decoder_cont[:, :, self._target_columns] = target_scale[:, None, :]
+
+        if self.is_identity:
+            return
+        encoder_cont -= self.encoder_center
+        encoder_cont *= self.inv_scale
+        decoder_cont -= self.decoder_center
+        decoder_cont *= self.inv_scale
+
+    def __repr__(self) -> str:
+        target = (
+            "fixed" if self.fixed_target_scale is not None
+            else "window" if self.window_target_scale else "default"
+        )
+        return f"Preprocessor(scaled={len(self.scaled_features)}, target={self.target}, target_scale={target})"
+
+
+def build_preprocessor(preprocessing_info: Optional[dict], layout: FeatureLayout) -> Preprocessor:
+    """pkl 내용 + 입력 레이아웃으로 전처리 엔진 생성"""
+    info = preprocessing_info if isinstance(preprocessing_info, dict) else {}
+
+    target = next((str(info[key]) for key in _TARGET_KEYS if isinstance(info.get(key), str)), 'close')
+    normalizer = next(
+        (info[key] for key in _TARGET_NORMALIZER_KEYS if info.get(key) is not None), None
+    )
+
+    # EncoderNormalizer / {'method': 'window'} → 윈도우 기준
+    window_based = (
+        'Encoder' in type(normalizer).__name__
+        or (isinstance(normalizer, dict) and normalizer.get('method') == 'window')
+    )
+
+    fixed = None
+    if normalizer is not None and not window_based:
+        fixed = extract_scalers({'scalers': {target: normalizer}}).get(target)
+        if fixed is None:
+            logger.warning(
+                f"⚠️ target normalizer({type(normalizer).__name__})에서 (center, scale)을 읽을 수 없음 "
+                f"→ 기본 target_scale 사용"
+            )
+
+    preprocessor = Preprocessor(
+        layout, target=target, fixed_target_scale=fixed, window_target_scale=window_based
+    )
+    logger.info(f"🧮 전처리 엔진: {preprocessor}")
+    return preprocessor
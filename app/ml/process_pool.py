@@ -0,0 +1,316 @@
+# 프로세스 풀 추론 백엔드
+import multiprocessing as mp
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import logging
+
+import numpy as np
+
+from app.config import settings
+from .session_options import get_session_profile
+
+logger = logging.getLogger(__name__)
+
+# 워밍업 시 모든 워커가 모일 때까지 기다리는 시간 (초)
+_WARMUP_TIMEOUT = 60
+
+
+# 워커가 품목별로 유지할 모델 버전 수 (현재 + 교체 직전, 교체 중 처리 중인 요청용)
+_WORKER_VERSIONS_PER_MODEL = 2
+
+# 공유 메모리 블록 최소 크기 (기본 윈도우 60일 x 50여 개 feature가 들어가는 크기)
+_MIN_BLOCK_SIZE = 64 * 1024
+
+# 워커가 붙어 있을 공유 메모리 블록 수 (부모가 교체한 블록은 밀려나며 닫힘)
+_WORKER_BLOCKS = 32
+
+
+class ModelRef(NamedTuple):
+    """워커가 모델을 찾는 키 (로컬 ONNX 경로 + 원본 버전 태그 + 품목 + 전처리 pkl 경로)"""
+    path: str
+    source_tag: str
+    commodity: str = ""
+    pkl_path: str = ""
+
+
+# (feature 이름, 오프셋, 길이) - 값은 float64
+_WindowLayout = List[Tuple[str, int, int]]
+
+
+def _window_nbytes(features: Dict[str, Any]) -> int:
+    return sum(len(values) for values in features.values() if values is not None) * 8
+
+
+def _pack_window(buf, features: Dict[str, Any]) -> _WindowLayout:
+    """과거 데이터 윈도우(feature별 시계열)를 공유 메모리 버퍼에 float64로 연속 배치"""
+    layout: _WindowLayout = []
+    offset = 0
+    for name, values in features.items():
+        if values is None:
+            continue
+        n = len(values)
+        np.ndarray(n, dtype=np.float64, buffer=buf, offset=offset)[...] = values
+        layout.append((name, offset, n))
+        offset += n * 8
+    return layout
+
+
+def _attach_window(buf, layout: _WindowLayout) -> Dict[str, np.ndarray]:
+    """공유 메모리 버퍼 → feature별 시계열 뷰 (복사 없음)"""
+    return {
+        name: np.ndarray(n, dtype=np.float64, buffer=buf, offset=offset)
+        for name, offset, n in layout
+    }
+
+
+class _BlockPool:
+    """
+    재사용 공유 메모리 블록 (요청마다 생성 / unlink하지 않음)
+
+    동시 요청 수만큼 블록이 생기고, 윈도우가 블록보다 크면 더 큰 블록으로 교체한다.
+    """
+
+    def __init__(self):
+        self._free: List[shared_memory.SharedMemory] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> shared_memory.SharedMemory:
+        with self._lock:
+            for i, block in enumerate(self._free):
+                if block.size >= size:
+                    return self._free.pop(i)
+            retired = self._free.pop() if self._free else None
+        if retired is not None:
+            _release_block(retired)
+        return shared_memory.SharedMemory(create=True, size=max(size, _MIN_BLOCK_SIZE))
+
+    def release(self, block: shared_memory.SharedMemory) -> None:
+        with self._lock:
+            self._free.append(block)
+
+    def close(self) -> None:
+        with self._lock:
+            blocks, self._free = self._free, []
+        for block in blocks:
+            _release_block(block)
+
+
+def _release_block(block: shared_memory.SharedMemory) -> None:
+    block.close()
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ===========================================
+# 워커 프로세스
+# ===========================================
+
+class _WorkerModel(NamedTuple):
+    session: Any
+    layout: Any        # FeatureLayout
+    preprocessor: Any  # Preprocessor
+
+
+# {품목(없으면 onnx 경로): OrderedDict{(경로, source_tag): _WorkerModel}}
+_worker_models: Dict[str, "OrderedDict[Tuple[str, str], _WorkerModel]"] = {}
+_worker_blocks: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+_worker_service = None
+_worker_barrier = None
+
+
+def _init_worker(barrier) -> None:
+    global _worker_barrier
+    _worker_barrier = barrier
+
+
+def _worker_model(ref: ModelRef) -> _WorkerModel:
+    """
+    워커별 모델 (세션 + 입력 레이아웃 + 전처리 엔진)
+
+    API 프로세스와 같은 파일(서빙 onnx + pkl)로 같은 방식으로 만든다.
+    품목당 최근 버전 2개 유지 → 교체 중 이전 버전 요청도 재로드 없이 처리.
+    """
+    versions = _worker_models.setdefault(ref.commodity or ref.path, OrderedDict())
+    version = (ref.path, ref.source_tag)
+    model = versions.get(version)
+    if model is not None:
+        return model
+
+    from .feature_layout import build_layout
+    from .preprocessing import build_preprocessor
+    from .session_options import create_session
+
+    session = create_session(ref.path, source_tag=ref.source_tag)
+    info = {}
+    if ref.pkl_path and os.path.getsize(ref.pkl_path) > 0:
+        with open(ref.pkl_path, "rb") as f:
+            info = pickle.load(f)
+    layout = build_layout(info, session)
+    model = _WorkerModel(session, layout, build_preprocessor(info, layout))
+
+    versions[version] = model
+    while len(versions) > _WORKER_VERSIONS_PER_MODEL:
+        versions.popitem(last=False)
+    logger.info(f"[pid={os.getpid()}] 워커 모델 로드: {os.path.basename(ref.path)}")
+    return model
+
+
+def _worker_block(name: str) -> shared_memory.SharedMemory:
+    """부모의 공유 메모리 블록에 붙기 (블록은 재사용되므로 붙은 상태 유지)"""
+    block = _worker_blocks.get(name)
+    if block is None:
+        # 블록 해제(unlink)는 부모 프로세스 담당 (spawn 워커는 부모의 resource tracker를 공유)
+        block = _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+        while len(_worker_blocks) > _WORKER_BLOCKS:
+            _, old = _worker_blocks.popitem(last=False)
+            old.close()
+    else:
+        _worker_blocks.move_to_end(name)
+    return block
+
+
+def _get_worker_service():
+    """워커의 텐서 빌더 / 결과 파서 (프로세스 내 세션 백엔드로 1개)"""
+    global _worker_service
+    if _worker_service is None:
+        from .prediction_service import ONNXPredictionService
+        _worker_service = ONNXPredictionService(inference_backend="thread")
+    return _worker_service
+
+
+def _worker_infer(
+    ref: ModelRef,
+    block_name: str,
+    window: _WindowLayout,
+    dates: List,
+    overrides_list: List[Optional[Dict[str, float]]],
+    base_date: Optional[date],
+) -> List[Dict[str, List[float]]]:
+    """공유 메모리 윈도우 → 입력 텐서 생성 → 추론 → 결과 파싱 (결과는 시나리오별 7일 x 3개 값)"""
+    service = _get_worker_service()
+    model = _worker_model(ref)
+    historical_data = {
+        'dates': dates,
+        'features': _attach_window(_worker_block(block_name).buf, window),
+    }
+    model_inputs = service._prepare_batch_inputs(
+        historical_data, overrides_list, base_date, model.layout, model.preprocessor
+    )
+    outputs = service._run_session(model.session, model_inputs)
+    return [service._parse_predictions(outputs, index=b) for b in range(len(overrides_list))]
+
+
+def _worker_warm_up(ref: ModelRef, *args) -> int:
+    """모델 로드 + 더미 추론 후 다른 워커들이 모일 때까지 대기 (워커마다 1건씩 실행되도록)"""
+    _worker_infer(ref, *args)
+    _worker_barrier.wait(timeout=_WARMUP_TIMEOUT)
+    return os.getpid()
+
+
+# ===========================================
+# 풀
+# ===========================================
+
+class ProcessInferencePool:
+    """
+    워커 프로세스 풀 추론 백엔드
+
+    각 워커가 models_cache의 ONNX / pkl 파일(그래프 최적화 캐시 포함)로 자기 세션과
+    입력 레이아웃을 갖는다. API 프로세스는 DB에서 읽은 과거 데이터 윈도우만
+    재사용 공유 메모리 블록에 써서 넘기고, 텐서 생성 / session.run / 결과 파싱은
+    워커에서 실행한다. API 프로세스의 GIL과 무관하게 코어 수만큼 병렬로 처리할 수 있다.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        # ORT 스레드가 떠 있는 프로세스를 fork하지 않도록 spawn 사용
+        context = mp.get_context("spawn")
+        self._barrier = context.Barrier(max_workers)
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._barrier,),
+        )
+        self._blocks = _BlockPool()
+        # 워밍업은 워커 전체가 barrier 하나에 모이므로 한 번에 하나씩 (품목 동시 갱신 시 섞이지 않게)
+        self._warm_up_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.completed = 0
+        logger.info(f"추론 프로세스 풀 초기화: workers={max_workers}")
+
+    def infer(
+        self,
+        ref: ModelRef,
+        historical_data: Dict[str, Any],
+        overrides_list: List[Optional[Dict[str, float]]],
+        base_date: Optional[date] = None,
+    ) -> List[Dict[str, List[float]]]:
+        """워커 프로세스에서 시나리오 배치 예측 (호출 스레드는 결과까지 대기)"""
+        outputs = self._submit(_worker_infer, ref, historical_data, overrides_list, base_date)
+        with self._lock:
+            self.completed += 1
+        return outputs
+
+    def warm_up(
+        self,
+        ref: ModelRef,
+        historical_data: Dict[str, Any],
+        overrides_list: List[Optional[Dict[str, float]]],
+    ) -> bool:
+        """모든 워커에 모델을 올리고 더미 추론 실행"""
+        with self._warm_up_lock:
+            try:
+                pids = set(self._submit(
+                    _worker_warm_up, ref, historical_data, overrides_list, None,
+                    copies=self.max_workers,
+                ))
+            except Exception as e:
+                logger.warning(f"⚠️ 워커 프로세스 워밍업 실패: {e}")
+                self._barrier.reset()
+                return False
+
+        logger.info(f"🔥 워커 프로세스 {len(pids)}개 워밍업 완료: {os.path.basename(ref.path)}")
+        return True
+
+    def _submit(self, fn, ref, historical_data, overrides_list, base_date, copies: Optional[int] = None):
+        """윈도우를 공유 메모리 블록에 쓰고 워커에서 fn 실행 (copies개 동시 제출 시 결과 목록)"""
+        features = historical_data['features']
+        block = self._blocks.acquire(_window_nbytes(features))
+        try:
+            window = _pack_window(block.buf, features)
+            args = (ref, block.name, window, list(historical_data.get('dates', [])), overrides_list, base_date)
+            if copies is None:
+                return self._pool.submit(fn, *args).result()
+            futures = [self._pool.submit(fn, *args) for _ in range(copies)]
+            return [future.result() for future in futures]
+        finally:
+            self._blocks.release(block)
+
+    def stats(self) -> dict:
+        return {"backend": "process", "max_workers": self.max_workers, "completed": self.completed}
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._blocks.close()
+
+
+def default_process_workers() -> int:
+    """CPU 코어 수 / 세션당 intra-op 스레드 수 (최소 1)"""
+    cpu_count = os.cpu_count() or 1
+    return max(1, cpu_count // max(1, get_session_profile().intra_op_threads))
+
+
+def create_process_pool(inference_backend: Optional[str] = None) -> Optional[ProcessInferencePool]:
+    """INFERENCE_BACKEND=process 일 때 풀 생성 (thread면 None)"""
+    if (inference_backend or settings.inference_backend) != "process":
+        return None
+    return ProcessInferencePool(settings.inference_process_workers or default_process_workers())
@@ -0,0 +1,208 @@
+# INT8 동적 양자화 + 정확도 검증
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import onnxruntime as ort
+
+from app.config import settings
+from .session_options import create_session
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QuantizationReport:
+    """FP32 대비 INT8 출력 오차 검증 결과"""
+
+    passed: bool
+    median_drift_pct: float       # 중앙값 최대 상대 오차 (%)
+    quantile_drift_pct: float     # 하한/상한 최대 상대 오차 (%)
+    samples: int
+    fp32_ms: float
+    int8_ms: float
+    windows_tag: str = ""
+    reason: str = ""
+
+
+def quantized_model_path(model_path, source_tag: str) -> Path:
+    """원본 버전 + ORT 버전 기준 INT8 모델 경로"""
+    key = "|".join([Path(model_path).name, source_tag or "", ort.__version__])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return Path(settings.int8_cache_dir) / f"{Path(model_path).stem}.{digest}.int8.onnx"
+
+
+def quantize_model(model_path, output_path: Path) -> Path:
+    """동적 양자화 (가중치 INT8, 활성값은 실행 시 양자화)"""
+    # onnx 패키지가 필요한 모듈이라 INT8 모드에서만 import
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    quantize_dynamic(str(model_path), str(tmp_path), weight_type=QuantType.QInt8)
+    os.replace(tmp_path, output_path)
+    logger.info(f"💾 INT8 양자화 모델 저장: {output_path}")
+    return output_path
+
+
+def load_validation_windows(path: Optional[str] = None) -> Optional[Dict[str, np.ndarray]]:
+    """
+    검증용 실제 입력 윈도우 로드 (scripts/export_validation_windows.py로 생성)
+
+    Returns:
+        {입력 이름: [N, ...] 배열} 또는 None (파일 없음)
+    """
+    path = Path(path or settings.int8_validation_windows_path)
+    if not path.is_file():
+        return None
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def compare_outputs(
+    fp32_session,
+    int8_session,
+    windows: Dict[str, np.ndarray],
+    max_median_drift_pct: Optional[float] = None,
+    max_quantile_drift_pct: Optional[float] = None,
+) -> QuantizationReport:
+    """
+    같은 입력 윈도우로 FP32 / INT8 출력을 비교
+
+    상대 오차 = |INT8 - FP32| / |FP32| (전 샘플 × 7일 중 최댓값)
+    중앙값(출력 [..., 0])과 하한/상한(출력 [..., 1:])을 따로 임계값과 비교한다.
+    """
+    from .prediction_service import ONNXPredictionService
+
+    max_median = settings.int8_max_median_drift_pct if max_median_drift_pct is None else max_median_drift_pct
+    max_quantile = settings.int8_max_quantile_drift_pct if max_quantile_drift_pct is None else max_quantile_drift_pct
+
+    start = time.perf_counter()
+    fp32 = ONNXPredictionService._run_session(fp32_session, windows)[0]
+    fp32_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    int8 = ONNXPredictionService._run_session(int8_session, windows)[0]
+    int8_ms = (time.perf_counter() - start) * 1000
+
+    drift = np.abs(int8 - fp32) / np.maximum(np.abs(fp32), 1e-6) * 100
+    median_drift = float(drift[..., 0].max())
+    quantile_drift = float(drift[..., 1:].max())
+
+    reasons = []
+    if median_drift > max_median:
+        reasons.append(f"중앙값 오차 {median_drift:.3f}% > {max_median}%")
+    if quantile_drift > max_quantile:
+        reasons.append(f"분위수 오차 {quantile_drift:.3f}% > {max_quantile}%")
+
+    return QuantizationReport(
+        passed=not reasons,
+        median_drift_pct=round(median_drift, 4),
+        quantile_drift_pct=round(quantile_drift, 4),
+        samples=int(fp32.shape[0]),
+        fp32_ms=round(fp32_ms, 3),
+        int8_ms=round(int8_ms, 3),
+        reason=", ".join(reasons),
+    )
+
+
+def prepare_int8_model(model_path, source_tag: str) -> Optional[Path]:
+    """
+    INT8 모델 생성 + 정확도 검증
+
+    검증 결과는 모델 옆 .json에 기록해 두고, 같은 원본/검증 샘플이면 재검증하지 않는다.
+
+    Returns:
+        검증을 통과한 INT8 모델 경로, 실패/검증 불가 시 None (FP32로 서빙)
+    """
+    int8_path = quantized_model_path(model_path, source_tag)
+    report_path = int8_path.with_suffix(".json")
+    windows_path = Path(settings.int8_validation_windows_path)
+    windows_tag = _file_tag(windows_path)
+
+    # 1) 같은 원본 + 같은 검증 샘플로 검증한 기록이 있으면 재사용
+    if report_path.is_file():
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = QuantizationReport(**json.load(f))
+        if report.windows_tag == windows_tag:
+            if not report.passed:
+                logger.warning(f"⚠️ INT8 모델 검증 실패 기록 → FP32로 서빙 ({report.reason})")
+                return None
+            if int8_path.is_file():
+                logger.info(f"⚡ 검증된 INT8 모델 사용: {int8_path.name}")
+                return int8_path
+
+    # 2) 검증 샘플이 없으면 INT8로 전환하지 않음
+    windows = load_validation_windows(windows_path)
+    if windows is None:
+        logger.warning(
+            f"⚠️ INT8 검증 샘플이 없습니다 ({windows_path}) → FP32로 서빙 "
+            f"(scripts/export_validation_windows.py로 생성)"
+        )
+        return None
+
+    # 3) 양자화 + FP32 대비 검증
+    quantize_model(model_path, int8_path)
+    report = compare_outputs(
+        create_session(model_path, source_tag=source_tag),
+        create_session(int8_path, source_tag=source_tag),
+        windows,
+    )
+    report.windows_tag = windows_tag
+
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(report), f, ensure_ascii=False, indent=2)
+
+    if not report.passed:
+        logger.warning(f"⚠️ INT8 모델 정확도 검증 실패 → FP32로 서빙 ({report.reason})")
+        int8_path.unlink(missing_ok=True)
+        return None
+
+    logger.info(
+        f"✅ INT8 모델 검증 통과: 중앙값 오차 {report.median_drift_pct}%, "
+        f"분위수 오차 {report.quantile_drift_pct}%, "
+        f"{report.samples}개 윈도우 FP32 {report.fp32_ms}ms → INT8 {report.int8_ms}ms"
+    )
+    return int8_path
+
+
+def prune_quantized_models(keep: Iterable[Path] = ()) -> List[str]:
+    """
+    keep에 없는 INT8 모델 / 검증 기록 삭제
+
+    keep: 유지할 INT8 모델 경로 (저장소 이력에 남은 버전 + 살아 있는 모델 묶음의 파일)
+    검증 기록(.json)은 같은 이름의 INT8 모델과 함께 유지 / 삭제한다 (검증 실패 기록 포함).
+
+    Returns:
+        삭제된 파일 이름 목록
+    """
+    cache_dir = Path(settings.int8_cache_dir)
+    if not cache_dir.is_dir():
+        return []
+
+    keep_stems = {Path(path).name[:-len(".onnx")] for path in keep if Path(path).name.endswith(".int8.onnx")}
+    removed = []
+    for path in [*cache_dir.glob("*.int8.onnx"), *cache_dir.glob("*.int8.json")]:
+        if path.name[:-len(path.suffix)] in keep_stems:
+            continue
+        path.unlink(missing_ok=True)
+        removed.append(path.name)
+
+    if removed:
+        logger.info(f"🧹 INT8 모델 캐시 정리: {len(removed)}개 삭제")
+    return removed
+
+
+def _file_tag(path: Path) -> str:
+    """파일 크기 + 수정시각 (없으면 빈 문자열)"""
+    if not path.is_file():
+        return ""
+    stat = path.stat()
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
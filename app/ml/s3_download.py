@@ -0,0 +1,447 @@
+# S3 모델 파일 다운로드 (병렬 범위 GET + 이어받기 + 무결성 검증)
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MiB = 1024 * 1024
+
+# 조각 응답 본문을 읽는 단위 (조각 전체를 메모리에 올리지 않음)
+_READ_CHUNK = MiB
+
+# 멀티파트 ETag("<md5>-<N>") 검증 시 시도할 업로드 조각 크기 (boto3/CLI 기본값 등)
+_MULTIPART_PART_SIZES = (8 * MiB, 5 * MiB, 16 * MiB, 32 * MiB, 64 * MiB, 100 * MiB)
+
+
+class IntegrityError(Exception):
+    """다운로드한 파일이 ETag / 게시된 체크섬과 일치하지 않음"""
+
+
+@dataclass
+class DownloadResult:
+    """
+    다운로드 결과
+
+    - etag: S3 ETag (따옴표 포함 원문)
+    - size: 객체 크기 (bytes)
+    - downloaded: 이번 호출에서 실제로 받은 bytes (이어받기 / 304면 그만큼 작음)
+    - not_modified: 조건부 GET 304 (로컬 파일 그대로 사용)
+    - verified: 검증 방식 ("sha256" / "etag" / "size" = 멀티파트 조각 크기 / 암호화 오브젝트 체크섬을 몰라 크기만 확인 / None = 검증 못 함)
+    """
+
+    etag: str
+    size: int
+    downloaded: int = 0
+    not_modified: bool = False
+    verified: Optional[str] = None
+
+
+def download_object(
+    s3,
+    bucket: str,
+    key: str,
+    local_path: Path,
+    cached_etag: Optional[str] = None,
+    part_size: int = 16 * MiB,
+    workers: int = 8,
+    verify_etag: bool = True,
+    checksum_suffix: Optional[str] = ".sha256",
+) -> DownloadResult:
+    """
+    S3 오브젝트를 병렬 범위 GET으로 받아 검증 후 local_path에 원자적으로 저장
+
+    1) 첫 조각을 GET(Range)으로 받으면서 크기 / ETag를 얻는다 (별도 HEAD 없음).
+       local_path가 있으면 그 파일의 ETag(마커 파일, 없으면 cached_etag)로
+       If-None-Match 요청해 304면 바로 반환 (재시작 후에도 다시 받지 않음).
+    2) 나머지 조각은 If-Match(ETag)로 동시에 받아 임시 파일의 제자리에 쓴다
+       (도중에 객체가 바뀌면 412로 실패 → 섞인 파일이 만들어지지 않음).
+    3) 완료된 조각은 진행 파일(.part.json)에 기록해 두어, 프로세스가 죽어도
+       같은 ETag라면 남은 조각만 이어받는다.
+    4) 게시된 SHA-256 체크섬(<key><checksum_suffix>) 또는 ETag(MD5 / 멀티파트 MD5)로
+       검증한 뒤 rename. 불일치면 임시 파일을 지우고 IntegrityError.
+       (멀티파트 ETag의 업로드 조각 크기를 알아낼 수 없으면 경고 후 크기만 확인,
+        SSE-KMS / SSE-C처럼 ETag가 MD5가 아니면 S3 ChecksumSHA256, 없으면 크기로 확인)
+
+    같은 local_path는 프로세스 간 파일 잠금으로 한 번에 하나만 받는다
+    (다른 워커 프로세스가 받는 중이면 끝날 때까지 기다린 뒤 304로 끝남).
+    """
+    local_path = Path(local_path)
+    with file_lock(local_path):
+        return _download_locked(
+            s3, bucket, key, local_path, cached_etag, part_size, workers, verify_etag, checksum_suffix
+        )
+
+
+def read_etag(local_path: Path) -> Optional[str]:
+    """로컬 파일이 어떤 S3 ETag 버전인지 (다운로드 완료 시 기록한 마커, 없으면 None)"""
+    local_path = Path(local_path)
+    marker = _marker_path(local_path)
+    if not local_path.exists() or not marker.exists():
+        return None
+    return marker.read_text().strip() or None
+
+
+def remove_local(local_path: Path) -> None:
+    """로컬 파일과 ETag 마커 삭제"""
+    local_path = Path(local_path)
+    local_path.unlink(missing_ok=True)
+    _marker_path(local_path).unlink(missing_ok=True)
+
+
+def _download_locked(
+    s3,
+    bucket: str,
+    key: str,
+    local_path: Path,
+    cached_etag: Optional[str],
+    part_size: int,
+    workers: int,
+    verify_etag: bool,
+    checksum_suffix: Optional[str],
+) -> DownloadResult:
+    first_range = (0, part_size - 1)
+
+    extra = {}
+    local_etag = read_etag(local_path) or (cached_etag if local_path.exists() else None)
+    if local_etag:
+        extra["IfNoneMatch"] = local_etag
+    try:
+        first = s3.get_object(Bucket=bucket, Key=key, Range=_range_header(*first_range), **extra)
+    except Exception as e:
+        code = error_code(e)
+        if code in ("304", "NotModified"):
+            logger.debug(f"캐시 유효 (304 Not Modified): {key}")
+            return DownloadResult(local_etag, local_path.stat().st_size, not_modified=True)
+        if code not in ("416", "InvalidRange"):
+            raise
+        # 빈 오브젝트는 Range 요청이 416 → 전체 GET
+        first = s3.get_object(Bucket=bucket, Key=key)
+
+    etag = first["ETag"]
+    size = _object_size(first)
+    tag = hashlib.blake2b(etag.encode(), digest_size=6).hexdigest()
+    part_path = local_path.with_name(f".{local_path.name}.{tag}.part")
+    state_path = part_path.with_name(part_path.name + ".json")
+    _remove_stale_parts(local_path, keep=part_path)
+
+    ranges = _part_ranges(size, part_size)
+    done = _load_progress(state_path, etag, size, part_size, part_path)
+    if not done:
+        # 새로 시작: 임시 파일을 최종 크기로 미리 만들어 조각별로 제자리에 씀
+        with open(part_path, "ab") as f:
+            f.truncate(size)
+    resumed = sum(ranges[i][1] - ranges[i][0] + 1 for i in done)
+    if resumed:
+        logger.info(f"↩️ 이어받기: {key} ({len(done)}/{len(ranges)} 조각, {resumed} bytes 완료)")
+
+    progress = _Progress(state_path, etag, size, part_size, done)
+    downloaded = 0
+    if 0 not in done and ranges:
+        downloaded += _write_part(part_path, ranges[0], first["Body"])
+        progress.mark(0)
+    else:
+        first["Body"].close()
+
+    pending = [i for i in range(1, len(ranges)) if i not in progress.done]
+    if pending:
+        def _fetch(index: int) -> int:
+            response = s3.get_object(
+                Bucket=bucket, Key=key, Range=_range_header(*ranges[index]), IfMatch=etag
+            )
+            written = _write_part(part_path, ranges[index], response["Body"])
+            progress.mark(index)
+            return written
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(pending))), thread_name_prefix="s3-part"
+        ) as pool:
+            downloaded += sum(pool.map(_fetch, pending))
+
+    verified = _verify(
+        s3, bucket, key, part_path, etag, size,
+        verify_etag=verify_etag, checksum_suffix=checksum_suffix,
+        md5_etag=not (
+            str(first.get("ServerSideEncryption", "")).startswith("aws:kms")
+            or first.get("SSECustomerAlgorithm")
+        ),
+    )
+    # 마커는 파일 교체 전에 지우고 교체 후에 기록 (중간에 죽어도 마커가 다른 버전을 가리키지 않음)
+    marker = _marker_path(local_path)
+    marker.unlink(missing_ok=True)
+    os.replace(part_path, local_path)
+    marker.write_text(etag)
+    state_path.unlink(missing_ok=True)
+    return DownloadResult(etag, size, downloaded=downloaded, verified=verified)
+
+
+def _marker_path(local_path: Path) -> Path:
+    return local_path.with_name(f".{local_path.name}.etag")
+
+
+@contextmanager
+def file_lock(local_path: Path) -> Iterator[None]:
+    """같은 파일을 받는 프로세스 간 배타 잠금 (fcntl 없으면 잠금 없음)"""
+    if fcntl is None:
+        yield
+        return
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(local_path.with_name(f".{local_path.name}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ===========================================
+# 조각 / 진행 상태
+# ===========================================
+
+def _range_header(start: int, end: int) -> str:
+    return f"bytes={start}-{end}"
+
+
+def _part_ranges(size: int, part_size: int) -> List[Tuple[int, int]]:
+    """[(start, end)] (end 포함, 빈 오브젝트면 [])"""
+    return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+
+def _object_size(response: dict) -> int:
+    """Content-Range("bytes 0-x/total")의 total, 없으면 ContentLength"""
+    content_range = response.get("ContentRange")
+    if content_range and "/" in content_range:
+        return int(content_range.rsplit("/", 1)[1])
+    return int(response["ContentLength"])
+
+
+def _write_part(part_path: Path, byte_range: Tuple[int, int], body) -> int:
+    """응답 본문을 임시 파일의 해당 위치에 기록 (받은 길이가 범위와 다르면 예외)"""
+    start, end = byte_range
+    expected = end - start + 1
+    written = 0
+    try:
+        with open(part_path, "r+b") as f:
+            f.seek(start)
+            while True:
+                chunk = body.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+    finally:
+        body.close()
+    if written != expected:
+        raise IOError(f"조각 길이 불일치: bytes {start}-{end} ({written}/{expected} bytes)")
+    return written
+
+
+class _Progress:
+    """완료 조각 목록을 진행 파일에 기록 (조각 스레드 간 공유)"""
+
+    def __init__(self, state_path: Path, etag: str, size: int, part_size: int, done: Set[int]):
+        self.state_path = state_path
+        self.header = {"etag": etag, "size": size, "part_size": part_size}
+        self.done = set(done)
+        self._lock = threading.Lock()
+
+    def mark(self, index: int) -> None:
+        with self._lock:
+            self.done.add(index)
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps({**self.header, "done": sorted(self.done)}))
+            os.replace(tmp, self.state_path)
+
+
+def _load_progress(state_path: Path, etag: str, size: int, part_size: int, part_path: Path) -> Set[int]:
+    """같은 ETag / 크기 / 조각 크기로 받던 진행 상태가 있으면 완료 조각 목록"""
+    if not part_path.exists() or not state_path.exists():
+        return set()
+    try:
+        state = json.loads(state_path.read_text())
+    except (OSError, ValueError):
+        return set()
+    if (state.get("etag"), state.get("size"), state.get("part_size")) != (etag, size, part_size):
+        return set()
+    if part_path.stat().st_size != size:
+        return set()
+    return {int(i) for i in state.get("done", [])}
+
+
+def _remove_stale_parts(local_path: Path, keep: Path) -> None:
+    """같은 파일의 다른 버전(ETag) 임시 파일 정리"""
+    for path in local_path.parent.glob(f".{local_path.name}.*.part*"):
+        if path.name.startswith(keep.name):
+            continue
+        path.unlink(missing_ok=True)
+
+
+# ===========================================
+# 무결성 검증
+# ===========================================
+
+def _verify(
+    s3,
+    bucket: str,
+    key: str,
+    part_path: Path,
+    etag: str,
+    size: int,
+    verify_etag: bool,
+    checksum_suffix: Optional[str],
+    md5_etag: bool = True,
+) -> Optional[str]:
+    """
+    게시된 SHA-256 → ETag 순으로 검증. 불일치면 임시 파일 삭제 후 IntegrityError.
+
+    md5_etag=False (SSE-KMS / SSE-C 오브젝트): ETag가 내용 MD5가 아니므로
+    S3가 저장한 ChecksumSHA256으로, 없으면 크기로 확인한다.
+    """
+    expected_sha256 = _published_sha256(s3, bucket, key, checksum_suffix)
+    if expected_sha256 is not None:
+        actual = _file_digest(part_path, hashlib.sha256)
+        _check(actual == expected_sha256, part_path, key, f"SHA-256 {actual} != {expected_sha256}")
+        return "sha256"
+
+    if not verify_etag:
+        return None
+    if not md5_etag:
+        return _verify_encrypted(s3, bucket, key, part_path, etag, size)
+    etag_value = etag.strip('"')
+    if "-" not in etag_value:
+        actual = _file_digest(part_path, hashlib.md5)
+        _check(actual == etag_value, part_path, key, f"MD5 {actual} != ETag {etag_value}")
+        return "etag"
+
+    md5, _, parts = etag_value.partition("-")
+    if _multipart_etag_matches(part_path, size, md5, int(parts)):
+        return "etag"
+
+    # 업로드 조각 크기를 후보로 알아내지 못함 (다른 도구 / 직접 지정한 조각 크기) → 크기만 확인
+    logger.warning(
+        f"⚠️ 멀티파트 ETag {etag_value}의 업로드 조각 크기를 알 수 없어 크기만 확인합니다: {key} "
+        f"(S3_CHECKSUM_SUFFIX로 SHA-256 체크섬을 게시하면 내용까지 검증)"
+    )
+    actual_size = part_path.stat().st_size
+    _check(actual_size == size, part_path, key, f"크기 {actual_size} != {size}")
+    return "size"
+
+
+def _verify_encrypted(s3, bucket: str, key: str, part_path: Path, etag: str, size: int) -> str:
+    """ETag가 MD5가 아닌 오브젝트: 단일 파트 ChecksumSHA256 → 크기 순으로 확인"""
+    expected = _object_checksum_sha256(s3, bucket, key, etag)
+    if expected is not None and "-" not in expected:
+        actual = base64.b64encode(bytes.fromhex(_file_digest(part_path, hashlib.sha256))).decode()
+        _check(actual == expected, part_path, key, f"ChecksumSHA256 {actual} != {expected}")
+        return "sha256"
+
+    # 체크섬 없이 업로드됨 / 멀티파트 합성 체크섬 (조각별 SHA-256의 해시라 파일 전체와 비교 불가)
+    logger.warning(
+        f"⚠️ 암호화된 오브젝트의 ETag는 MD5가 아니고 전체 SHA-256 체크섬도 없어 크기만 확인합니다: {key} "
+        f"(S3_CHECKSUM_SUFFIX로 SHA-256 체크섬을 게시하면 내용까지 검증)"
+    )
+    actual_size = part_path.stat().st_size
+    _check(actual_size == size, part_path, key, f"크기 {actual_size} != {size}")
+    return "size"
+
+
+def _object_checksum_sha256(s3, bucket: str, key: str, etag: str) -> Optional[str]:
+    """S3가 저장한 ChecksumSHA256 (base64, 받은 ETag 버전 기준, 없거나 조회 실패 시 None)"""
+    try:
+        response = s3.head_object(Bucket=bucket, Key=key, IfMatch=etag, ChecksumMode="ENABLED")
+    except Exception as e:
+        logger.debug(f"ChecksumSHA256 조회 실패 ({error_code(e)}): {key}")
+        return None
+    return response.get("ChecksumSHA256")
+
+
+def _check(ok: bool, part_path: Path, key: str, detail: str) -> None:
+    if ok:
+        return
+    part_path.unlink(missing_ok=True)
+    part_path.with_name(part_path.name + ".json").unlink(missing_ok=True)
+    raise IntegrityError(f"다운로드 무결성 검증 실패: {key} ({detail})")
+
+
+def _published_sha256(s3, bucket: str, key: str, suffix: Optional[str]) -> Optional[str]:
+    """<key><suffix> 오브젝트의 SHA-256 hex (sha256sum 출력 형식 허용, 없으면 None)"""
+    if not suffix:
+        return None
+    try:
+        response = s3.get_object(Bucket=bucket, Key=key + suffix)
+    except Exception as e:
+        # ListBucket 권한이 없으면 없는 키도 403으로 응답
+        if error_code(e) in ("404", "NoSuchKey", "403", "AccessDenied"):
+            return None
+        raise
+    text = response["Body"].read().decode().strip()
+    return text.split()[0].lower() if text else None
+
+
+def _file_digest(path: Path, algorithm) -> str:
+    digest = algorithm()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8 * MiB), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _multipart_etag_matches(path: Path, size: int, md5: str, parts: int) -> bool:
+    """
+    업로드 조각 크기 후보별 MD5(조각 MD5들의 연결)를 ETag와 비교
+
+    조각 수가 맞는 후보들을 파일 한 번 읽기로 함께 계산한다.
+    (후보는 모두 MiB 배수 → 최대공약수 단위로 읽으면 모든 후보의 조각 경계와 맞음)
+    """
+    candidates = list(_MULTIPART_PART_SIZES)
+    # 조각 수로 역산한 크기 (MiB 단위 올림)
+    candidates.append(math.ceil(size / parts / MiB) * MiB)
+    part_sizes = [
+        part_size for part_size in dict.fromkeys(candidates)
+        if part_size > 0 and math.ceil(size / part_size) == parts
+    ]
+    if not part_sizes:
+        return False
+
+    # 후보별 [조각 MD5 연결, 현재 조각 MD5, 현재 조각 길이]
+    states = {part_size: [hashlib.md5(), hashlib.md5(), 0] for part_size in part_sizes}
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(math.gcd(*part_sizes)), b""):
+            for part_size, state in states.items():
+                state[1].update(block)
+                state[2] += len(block)
+                if state[2] == part_size:
+                    state[0].update(state[1].digest())
+                    state[1], state[2] = hashlib.md5(), 0
+
+    for combined, part, length in states.values():
+        if length:
+            combined.update(part.digest())
+        if combined.hexdigest() == md5:
+            return True
+    return False
+
+
+def error_code(error: Exception) -> Optional[str]:
+    """botocore ClientError의 에러 코드 (다른 예외면 None)"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    code = response.get("Error", {}).get("Code")
+    if code is None:
+        code = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return str(code) if code is not None else None
@@ -0,0 +1,358 @@
+# ONNX Runtime 세션 옵션 프로필
+import hashlib
+import json
+import os
+import platform
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import onnxruntime as ort
+
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+_GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+@dataclass(frozen=True)
+class SessionProfile:
+    """ort.SessionOptions 구성값"""
+
+    intra_op_threads: int
+    inter_op_threads: int = 1
+    execution_mode: str = "sequential"          # sequential | parallel
+    graph_optimization_level: str = "all"       # disable | basic | extended | all
+    enable_mem_pattern: bool = True
+    enable_cpu_mem_arena: bool = True
+
+    def to_session_options(self) -> ort.SessionOptions:
+        """ort.SessionOptions 생성"""
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = _EXECUTION_MODES[self.execution_mode]
+        options.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level]
+        options.enable_mem_pattern = self.enable_mem_pattern
+        options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        return options
+
+
+# ===========================================
+# 프로필 결정
+# ===========================================
+
+def default_intra_op_threads() -> int:
+    """워커당 intra-op 스레드 수 = CPU 코어 수 / uvicorn 워커 수 (최소 1)"""
+    cpu_count = os.cpu_count() or 1
+    return max(1, cpu_count // max(1, settings.web_concurrency))
+
+
+def profile_from_settings() -> SessionProfile:
+    """ORT_* 설정값으로 프로필 구성 (ORT_INTRA_OP_THREADS=0 이면 워커 수 기준 자동)"""
+    return SessionProfile(
+        intra_op_threads=settings.ort_intra_op_threads or default_intra_op_threads(),
+        inter_op_threads=settings.ort_inter_op_threads,
+        execution_mode=settings.ort_execution_mode,
+        graph_optimization_level=settings.ort_graph_optimization_level,
+        enable_mem_pattern=settings.ort_enable_mem_pattern,
+        enable_cpu_mem_arena=settings.ort_enable_cpu_mem_arena,
+    )
+
+
+def load_tuned_profile(path: Optional[str] = None) -> Optional[SessionProfile]:
+    """auto-tune 결과 파일에서 프로필 로드 (없거나 형식이 다르면 None)"""
+    path = Path(path or settings.ort_tuned_profile_path)
+    if not path.is_file():
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        return SessionProfile(**record["profile"])
+    except Exception as e:
+        logger.warning(f"⚠️ 튜닝 프로필 로드 실패 ({path}): {e}")
+        return None
+
+
+# 튜닝 프로필 캐시 {파일 경로: 프로필 또는 None} (세션 생성마다 파일을 다시 읽지 않도록)
+_tuned_profiles: Dict[str, Optional[SessionProfile]] = {}
+
+
+def get_tuned_profile() -> Optional[SessionProfile]:
+    """튜닝 프로필 (경로별 처음 1번만 파일에서 로드)"""
+    path = settings.ort_tuned_profile_path
+    if path not in _tuned_profiles:
+        _tuned_profiles[path] = load_tuned_profile(path)
+    return _tuned_profiles[path]
+
+
+def reload_tuned_profile() -> Optional[SessionProfile]:
+    """튜닝 프로필 다시 로드 (auto_tune 결과 기록 후)"""
+    _tuned_profiles.clear()
+    return get_tuned_profile()
+
+
+def get_session_profile() -> SessionProfile:
+    """사용할 세션 프로필 (튜닝 결과 우선, 없으면 설정값)"""
+    if settings.ort_use_tuned_profile:
+        tuned = get_tuned_profile()
+        if tuned:
+            return tuned
+    return profile_from_settings()
+
+
+def create_session(
+    model_path: str,
+    profile: Optional[SessionProfile] = None,
+    source_tag: Optional[str] = None,
+) -> ort.InferenceSession:
+    """
+    프로필을 적용해 CPU InferenceSession 생성
+
+    ORT_OPTIMIZED_MODEL_CACHE가 켜져 있으면 그래프 최적화 결과를
+    models_cache/optimized/ 에 저장해 두고, 이후 세션 생성(다른 워커/재시작 포함)은
+    최적화를 건너뛰고 저장된 모델을 바로 로드한다.
+
+    Args:
+        model_path: 원본 ONNX 파일 경로
+        profile: 세션 프로필 (None이면 get_session_profile())
+        source_tag: 원본 버전 식별자 (S3 ETag 등, None이면 파일 크기/수정시각)
+    """
+    profile = profile or get_session_profile()
+    logger.info(f"ORT 세션 프로필: {profile}")
+
+    optimized_path = cached_optimized_path(model_path, source_tag, profile)
+    if optimized_path is None:
+        return _new_session(model_path, profile.to_session_options())
+
+    # 1) 최적화된 모델이 있으면 최적화 없이 로드
+    if optimized_path.is_file():
+        options = profile.to_session_options()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            session = _new_session(optimized_path, options)
+            logger.info(f"⚡ 최적화 모델 캐시 사용: {optimized_path.name}")
+            return session
+        except Exception as e:
+            logger.warning(f"⚠️ 최적화 모델 로드 실패, 재생성합니다 ({optimized_path.name}): {e}")
+            optimized_path.unlink(missing_ok=True)
+
+    # 2) 원본에서 세션 생성 + 최적화 결과 저장 (프로세스 / 스레드별 임시 파일 → 원자적 rename)
+    optimized_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = optimized_path.with_name(f"{optimized_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    options = profile.to_session_options()
+    options.optimized_model_filepath = str(tmp_path)
+    session = _new_session(model_path, options)
+
+    try:
+        os.replace(tmp_path, optimized_path)
+        logger.info(f"💾 최적화 모델 저장: {optimized_path}")
+    except OSError as e:
+        logger.warning(f"⚠️ 최적화 모델 저장 실패: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+    return session
+
+
+def cached_optimized_path(
+    model_path: str,
+    source_tag: Optional[str] = None,
+    profile: Optional[SessionProfile] = None,
+) -> Optional[Path]:
+    """create_session이 쓰는 최적화 모델 캐시 경로 (캐시를 쓰지 않는 설정이면 None)"""
+    profile = profile or get_session_profile()
+    if not settings.ort_optimized_model_cache or profile.graph_optimization_level == "disable":
+        return None
+    return optimized_model_path(model_path, profile, source_tag or _file_tag(model_path))
+
+
+def optimized_model_path(model_path: str, profile: SessionProfile, source_tag: str) -> Path:
+    """
+    원본 키 + 실행 환경 키 기준 캐시 경로
+
+    <원본 파일 stem>.<원본 키>.<실행 환경 키>.opt.onnx
+      원본 키: 원본 파일 이름 + 버전 태그 (정리 시 어느 모델 버전의 파일인지 구분)
+      실행 환경 키: ORT 버전 + CPU 아키텍처 + 최적화 수준
+    """
+    runtime_key = _digest("|".join([
+        ort.__version__,
+        platform.machine(),
+        profile.graph_optimization_level,
+    ]))
+    name = f"{Path(model_path).stem}.{optimized_source_key(model_path, source_tag)}.{runtime_key}.opt.onnx"
+    return Path(settings.ort_optimized_cache_dir) / name
+
+
+def optimized_source_key(model_path, source_tag: str) -> str:
+    """최적화 캐시 파일 이름의 원본 키 (원본 파일 이름 + 버전 태그)"""
+    return _digest(f"{Path(model_path).name}|{source_tag}")
+
+
+def prune_optimized_models(known_sources: Iterable[str], keep: Iterable[Path] = ()) -> List[str]:
+    """
+    원본 키를 모르는 최적화 모델 삭제
+
+    저장소 이력에 남은 모델 버전(known_sources)과 살아 있는 모델 묶음의 파일(keep)은
+    개수와 상관없이 유지한다. 이력에서 빠진 버전 / 이전 형식 파일만 삭제 대상.
+
+    Returns:
+        삭제된 파일 이름 목록
+    """
+    cache_dir = Path(settings.ort_optimized_cache_dir)
+    if not cache_dir.is_dir():
+        return []
+
+    known_sources = set(known_sources)
+    keep_names = {Path(path).name for path in keep}
+    removed = []
+    for path in cache_dir.glob("*.opt.onnx"):
+        parts = path.name[:-len(".opt.onnx")].rsplit(".", 2)
+        if path.name in keep_names or (len(parts) == 3 and parts[1] in known_sources):
+            continue
+        path.unlink(missing_ok=True)
+        removed.append(path.name)
+
+    if removed:
+        logger.info(f"🧹 최적화 모델 캐시 정리: {len(removed)}개 삭제")
+    return removed
+
+
+def _new_session(model_path, options: ort.SessionOptions) -> ort.InferenceSession:
+    return ort.InferenceSession(
+        str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+
+
+def _file_tag(model_path) -> str:
+    """파일 크기 + 수정시각 기반 버전 태그"""
+    stat = Path(model_path).stat()
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+# ===========================================
+# Auto-tune
+# ===========================================
+
+def candidate_profiles(base: Optional[SessionProfile] = None) -> List[SessionProfile]:
+    """
+    벤치마크 후보 프로필
+
+    워커당 코어 예산(코어 수 / 워커 수)을 넘지 않는 스레드 수만 후보로 사용한다.
+    """
+    base = base or profile_from_settings()
+    budget = default_intra_op_threads()
+    thread_counts = sorted({n for n in (1, 2, 4, 8, budget) if n <= budget})
+
+    candidates = []
+    for threads in thread_counts:
+        for graph_level in ("extended", "all"):
+            candidates.append(replace(
+                base,
+                intra_op_threads=threads,
+                inter_op_threads=1,
+                execution_mode="sequential",
+                graph_optimization_level=graph_level,
+            ))
+        if threads > 1:
+            candidates.append(replace(
+                base,
+                intra_op_threads=threads,
+                inter_op_threads=2,
+                execution_mode="parallel",
+                graph_optimization_level="all",
+            ))
+    return candidates
+
+
+def benchmark_profile(
+    model_path: str,
+    profile: SessionProfile,
+    make_inputs: Callable[[int], Dict[str, np.ndarray]],
+    batch_sizes=(1, 2),
+    runs: int = 50,
+    warmup: int = 5,
+) -> Dict[str, float]:
+    """
+    한 프로필의 추론 지연시간 측정 (ms)
+
+    후보 프로필 세션은 최적화 모델 캐시에 저장하지 않는다 (서빙 모델 캐시와 섞이지 않도록).
+    """
+    session = _new_session(model_path, profile.to_session_options())
+    latencies = []
+
+    for batch_size in batch_sizes:
+        model_inputs = make_inputs(batch_size)
+        for _ in range(warmup):
+            session.run(None, model_inputs)
+        for _ in range(runs):
+            start = time.perf_counter()
+            session.run(None, model_inputs)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies = np.asarray(latencies)
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "mean_ms": round(float(latencies.mean()), 3),
+    }
+
+
+def auto_tune(
+    model_path: str,
+    make_inputs: Callable[[int], Dict[str, np.ndarray]],
+    output_path: Optional[str] = None,
+    runs: int = 50,
+) -> dict:
+    """
+    후보 프로필을 벤치마크해 p95 지연시간이 가장 낮은 프로필을 파일로 기록
+
+    Returns:
+        기록된 결과 {"profile": {...}, "metrics": {...}, "results": [...], ...}
+    """
+    output_path = Path(output_path or settings.ort_tuned_profile_path)
+
+    results = []
+    for profile in candidate_profiles():
+        metrics = benchmark_profile(model_path, profile, make_inputs, runs=runs)
+        results.append({"profile": asdict(profile), "metrics": metrics})
+        logger.info(f"  {profile} → p50={metrics['p50_ms']}ms, p95={metrics['p95_ms']}ms")
+
+    best = min(results, key=lambda r: (r["metrics"]["p95_ms"], r["metrics"]["p50_ms"]))
+    record = {
+        "profile": best["profile"],
+        "metrics": best["metrics"],
+        "model": Path(model_path).name,
+        "ort_version": ort.__version__,
+        "cpu_count": os.cpu_count(),
+        "web_concurrency": settings.web_concurrency,
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"✅ 최적 세션 프로필 기록: {output_path} → {best['profile']}")
+    reload_tuned_profile()
+    return record
@@ -5,6 +5,7 @@ import logging
 
 from .. import crud, dataschemas
 from ..database import get_db
+from ..ml.prediction_service import get_prediction_service
 
 logger = logging.getLogger(__name__)
 
@@ -151,6 +152,7 @@ def create_market_metrics(
 ):
     """시장 지표 벌크 저장 (날짜당 46개 feature 등)"""
     count = crud.create_market_metrics_bulk(db, data.commodity, data.date, data.metrics)
+    get_prediction_service().invalidate_cache(data.commodity, data.date, data.date)
     logger.info(f"시장 지표 저장 완료: {data.commodity} / {data.date}, {count}건")
     return dataschemas.BatchResult(success=True, message=f"{count}건 저장 완료", count=count)
 
@@ -162,6 +164,7 @@ def create_market_metrics_bulk(
 ):
     """시장 지표 벌크 저장 (POST /market-metrics와 동일)"""
     count = crud.create_market_metrics_bulk(db, data.commodity, data.date, data.metrics)
+    get_prediction_service().invalidate_cache(data.commodity, data.date, data.date)
     logger.info(f"시장 지표 벌크 저장 완료: {data.commodity} / {data.date}, {count}건")
     return dataschemas.BatchResult(success=True, message=f"{count}건 저장 완료", count=count)
 
@@ -173,6 +176,7 @@ def upsert_market_metrics(
 ):
     """시장 지표 Upsert (commodity + date + metric_id 기준)"""
     count = crud.upsert_market_metrics(db, data.commodity, data.date, data.metrics)
+    get_prediction_service().invalidate_cache(data.commodity, data.date, data.date)
     logger.info(f"시장 지표 Upsert 완료: {data.commodity} / {data.date}, {count}건")
     return dataschemas.BatchResult(success=True, message=f"{count}건 Upsert 완료", count=count)
 
@@ -184,6 +188,7 @@ def delete_market_metrics(
 ):
     """시장 지표 삭제 (commodity + date 범위)"""
     count = crud.delete_market_metrics(db, data.commodity, data.start_date, data.end_date)
+    get_prediction_service().invalidate_cache(data.commodity, data.start_date, data.end_date)
     logger.info(f"시장 지표 삭제 완료: {data.commodity} {data.start_date}~{data.end_date}, {count}건")
     return dataschemas.BatchResult(success=True, message=f"{count}건 삭제 완료", count=count)
 
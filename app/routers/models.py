@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import Optional
+import logging
+
+from .. import dataschemas
+from ..ml.model_loader import get_model_loader
+from ..ml.prediction_service import get_prediction_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/models",
+    tags=["Model"]
+)
+
+
+# ===========================
+# 모델 버전 이력 / 롤백 (s3 모드)
+# ===========================
+
+@router.get("/{commodity}/versions", response_model=dataschemas.ModelVersionsResponse)
+def get_model_versions(commodity: str):
+    """로컬 저장소에 기록된 품목 모델 버전 (최신 설치 순)"""
+    loader = get_model_loader()
+    versions = [
+        dataschemas.ModelVersion(**{**entry, "installed_at": datetime.fromtimestamp(entry["installed_at"])})
+        for entry in loader.list_versions(commodity)
+    ]
+    return dataschemas.ModelVersionsResponse(
+        commodity=commodity,
+        current_version=loader.get_model_version(commodity),
+        versions=versions,
+    )
+
+
+@router.post("/{commodity}/rollback", response_model=dataschemas.ModelRollbackResponse)
+async def rollback_model(commodity: str, request: Optional[dataschemas.ModelRollbackRequest] = None):
+    """
+    로컬 저장소의 이전 버전으로 교체 (S3 다운로드 없음, 워밍업 후 원자적 교체)
+
+    version이 없으면 현재 바로 이전에 설치된 버전으로 되돌린다.
+    롤백으로 내린 모델은 더 새 모델이 올라올 때까지 자동 업데이트로 다시 올리지 않는다.
+    요청을 받은 워커는 바로 교체하고, 다른 워커(WEB_CONCURRENCY > 1)는 공유 저장소의
+    롤백 고정을 보고 다음 업데이트 확인(MODEL_UPDATE_CHECK_TIME / _INTERVAL_MINUTES)에서 같은 버전으로 교체한다.
+    """
+    loader = get_model_loader()
+    service = get_prediction_service()
+    version = request.version if request else None
+    previous_version = loader.get_model_version(commodity)
+
+    try:
+        model = await run_in_threadpool(loader.rollback, commodity, version, service.warm_model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (LookupError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    service.on_models_updated([commodity])
+    logger.info(f"⏪ 모델 롤백 완료: {commodity} {previous_version} → {model.version}")
+    return dataschemas.ModelRollbackResponse(
+        commodity=commodity,
+        previous_version=previous_version,
+        current_version=model.version,
+    )
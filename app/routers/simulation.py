@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Dict, List
+from typing import Dict, List, Optional
+from datetime import date, timedelta
 import logging
 
+from ..ml.model_loader import LoadedModel
 from ..ml.prediction_service import get_prediction_service
+from ..ml.executor import get_inference_executor, InferenceQueueFullError
 from .. import crud, dataschemas
 from ..database import get_db
 from app.config import settings
@@ -35,6 +39,40 @@ class SimulationValidator:
                 detail=f"조정 불가능한 feature: {invalid_features}. "
                        f"가능한 features: {SimulationValidator.VALID_FEATURES}"
             )
+    
+    @staticmethod
+    def quantize_overrides(feature_overrides: Dict[str, float]) -> Dict[str, float]:
+        """Override 값을 숫자로 변환 후 SIMULATION_OVERRIDE_PRECISION 자릿수로 반올림"""
+        quantized = {}
+        for feature_name, value in feature_overrides.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{feature_name} 값은 숫자여야 합니다: {value!r}"
+                )
+            quantized[feature_name] = round(float(value), settings.simulation_override_precision)
+        return quantized
+    
+    @staticmethod
+    def build_sweep_grid(start: float, stop: float, step: float) -> List[float]:
+        """스윕 격자 생성 (start 포함, stop은 step 간격에 걸리면 포함 / 넘지 않음)"""
+        if step <= 0:
+            raise HTTPException(status_code=400, detail=f"step은 양수여야 합니다: {step}")
+        if stop < start:
+            raise HTTPException(
+                status_code=400,
+                detail=f"stop({stop})은 start({start}) 이상이어야 합니다."
+            )
+        
+        num_points = int((stop - start) / step + 1e-9) + 1
+        if num_points > settings.simulation_sweep_max_points:
+            raise HTTPException(
+                status_code=400,
+                detail=f"격자 점이 너무 많습니다: {num_points}개 "
+                       f"(최대 {settings.simulation_sweep_max_points}개)"
+            )
+        
+        return [round(start + i * step, 10) for i in range(num_points)]
 
 
 class FeatureImpactCalculator:
@@ -43,7 +81,8 @@ class FeatureImpactCalculator:
     @staticmethod
     def calculate_impacts(
         feature_overrides: Dict[str, float],
-        historical_data: Dict[str, any]
+        historical_data: Dict[str, any],
+        contributions: Optional[Dict[str, float]] = None
     ) -> List[dataschemas.FeatureImpact]:
         """
         변경된 Feature들의 영향도 계산
@@ -51,11 +90,13 @@ class FeatureImpactCalculator:
         Args:
             feature_overrides: 사용자가 변경한 Feature들
             historical_data: 과거 데이터
+            contributions: Feature별 1일차 예측 기여도 (calculate_contributions 결과)
         
         Returns:
             Feature 영향도 리스트
         """
         impacts = []
+        contributions = contributions or {}
         
         for feature_name, new_value in feature_overrides.items():
             current_value = FeatureImpactCalculator._get_current_value(
@@ -69,12 +110,53 @@ class FeatureImpactCalculator:
                     current_value=current_value,
                     new_value=new_value,
                     value_change=new_value - current_value,
-                    contribution=0  # TODO: SHAP으로 정확한 기여도 계산
+                    contribution=round(contributions.get(feature_name, 0.0), 2)
                 )
             )
         
         return impacts
     
+    @staticmethod
+    def build_ablation_scenarios(
+        feature_overrides: Dict[str, float]
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        기여도 계산용 시나리오 목록 (한 배치로 추론)
+        
+        [원본, Feature 1개씩만 변경 ..., 전체 변경]
+        변경 Feature가 1개면 단독 변경 = 전체 변경이므로 [원본, 전체 변경]만 사용한다.
+        """
+        if len(feature_overrides) <= 1:
+            return [None, feature_overrides]
+        singles = [{name: value} for name, value in feature_overrides.items()]
+        return [None, *singles, feature_overrides]
+    
+    @staticmethod
+    def calculate_contributions(
+        feature_overrides: Dict[str, float],
+        forecasts: List[float]
+    ) -> Dict[str, float]:
+        """
+        유한 차분 기반 Feature별 기여도 (1일차 예측 기준)
+        
+        - 단독 효과: f(해당 Feature만 변경) - f(원본)
+        - 상호작용: (f(전체 변경) - f(원본)) - 단독 효과 합
+        - 기여도 = 단독 효과 + 상호작용 / Feature 수
+          (기여도 합 = 전체 변화량)
+        
+        Args:
+            feature_overrides: 사용자가 변경한 Feature들
+            forecasts: build_ablation_scenarios 순서의 1일차 예측값
+        """
+        baseline, full = forecasts[0], forecasts[-1]
+        names = list(feature_overrides)
+        if len(names) <= 1:
+            return {name: full - baseline for name in names}
+        
+        effects = {name: forecast - baseline for name, forecast in zip(names, forecasts[1:-1])}
+        interaction = (full - baseline) - sum(effects.values())
+        return {name: effect + interaction / len(names) for name, effect in effects.items()}
+    
     @staticmethod
     def _get_current_value(feature_name: str, historical_data: Dict[str, any]) -> float:
         """현재(최근) Feature 값 가져오기"""
@@ -84,16 +166,21 @@ class FeatureImpactCalculator:
         return 0.0
 
 
-@router.post("/simulate", response_model=dataschemas.SimulationResponse)
-def simulate_prediction(
+@router.post(
+    "/simulate",
+    response_model=dataschemas.SimulationResponse,
+    response_model_exclude_none=True
+)
+async def simulate_prediction(
     request: dataschemas.SimulationRequest,
     db: Session = Depends(get_db)
 ):
     """
     TFT ONNX 모델을 사용한 실시간 시뮬레이션
     
-    과거 60일의 시계열 데이터를 DB에서 로드하고,
+    과거 시계열 데이터(모델 encoder 길이)를 DB에서 로드하고,
     feature_overrides를 적용하여 재예측합니다.
+    DB 조회는 공용 스레드풀, 추론은 전용 추론 executor에서 실행됩니다.
     
     조정 가능한 Features (5개):
     - 10Y_Yield: 미국 10년물 국채 금리
@@ -101,29 +188,50 @@ def simulate_prediction(
     - pdsi: Palmer Drought Severity Index
     - spi30d: Standardized Precipitation Index (30일)
     - spi90d: Standardized Precipitation Index (90일)
+    
+    include_paths=true 이면 같은 추론 결과에서 원본/시뮬레이션의
+    7일 전체 경로(중앙값, 하한, 상한)를 함께 반환합니다.
     """
     logger.info(f"시뮬레이션 시작 - {request.commodity}, {request.base_date}")
     logger.info(f"Feature overrides: {request.feature_overrides}")
     
-    # 1. 기준 예측 조회
-    base_prediction = _get_base_prediction(db, request)
-    
-    # 2. Feature overrides 검증
+    # 1. Feature overrides 검증 + 정규화 (슬라이더 정밀도로 반올림)
     SimulationValidator.validate_feature_overrides(request.feature_overrides)
+    feature_overrides = SimulationValidator.quantize_overrides(request.feature_overrides)
     
-    # 3. 과거 데이터 로드
-    historical_data = _load_historical_data(db, request)
+    # 2. 결과 캐시 조회 (hit 시 DB / ONNX 접근 없이 반환, 다른 워커의 무효화 먼저 반영)
+    pred_service = get_prediction_service()
+    pred_service.sync_invalidations()
+    model_version = pred_service.model_loader.get_model_version(request.commodity)
+    if model_version is not None:
+        cached = pred_service.result_cache.get(
+            _simulation_cache_key(model_version, request, feature_overrides)
+        )
+        if cached is not None:
+            logger.info("시뮬레이션 캐시 hit")
+            return _select_paths(cached, request.include_paths)
+    
+    # 3. 기준 예측 조회 + 과거 데이터 로드 (추론할 모델 묶음의 입력 레이아웃 기준)
+    model, historical_data = await run_in_threadpool(_load_simulation_inputs, db, request)
     
-    # 4. 예측 실행
-    original_forecast, simulated_forecast = _run_predictions(
+    # 4. 예측 실행 (추론 executor, 기여도 계산용 시나리오 포함 한 배치)
+    original_result, simulated_result, contributions = await _run_in_inference_executor(
+        _run_predictions,
         request, 
-        historical_data
+        model,
+        historical_data,
+        feature_overrides
     )
     
+    # 첫 날 예측값 사용 (7일 중 1일차)
+    original_forecast = original_result['predictions'][0]
+    simulated_forecast = simulated_result['predictions'][0]
+    
     # 5. Feature 영향도 계산
     feature_impacts = FeatureImpactCalculator.calculate_impacts(
-        request.feature_overrides,
-        historical_data
+        feature_overrides,
+        historical_data,
+        contributions
     )
     
     # 6. 변화량 계산
@@ -131,13 +239,141 @@ def simulate_prediction(
     
     logger.info(f"예측 완료 - 원본: {original_forecast:.2f}, 시뮬레이션: {simulated_forecast:.2f}")
     
-    return dataschemas.SimulationResponse(
+    response = dataschemas.SimulationResponse(
         original_forecast=round(original_forecast, 2),
         simulated_forecast=round(simulated_forecast, 2),
         change=round(change, 2),
         change_percent=round(change_percent, 2),
-        feature_impacts=feature_impacts
+        feature_impacts=feature_impacts,
+        original_path=_build_forecast_path(request.base_date, original_result),
+        simulated_path=_build_forecast_path(request.base_date, simulated_result)
     )
+    
+    # 캐시에는 경로 포함 전체 응답 저장 (include_paths 여부와 무관하게 재사용)
+    # 키는 실제로 추론한 묶음의 버전 (조회 후 모델이 교체됐어도 결과와 버전이 어긋나지 않음)
+    pred_service.result_cache.put(_simulation_cache_key(model.version, request, feature_overrides), response)
+    
+    return _select_paths(response, request.include_paths)
+
+
+@router.get("/simulate/cache/stats")
+def get_simulation_cache_stats():
+    """예측 캐시 통계 (원본 예측 / 시뮬레이션 결과별 size, hits, misses, hit_rate)"""
+    return get_prediction_service().cache_stats()
+
+
+@router.get("/simulate/executor/stats")
+def get_inference_executor_stats():
+    """추론 executor 상태 (queue_depth, active, completed, rejected) + micro-batching / 프로세스 풀 통계"""
+    service = get_prediction_service()
+    return {
+        **get_inference_executor().stats(),
+        "micro_batcher": service.micro_batcher.stats() if service.micro_batcher else None,
+        "process_pool": service.process_pool.stats() if service.process_pool else None,
+    }
+
+
+@router.post("/simulate/sweep", response_model=dataschemas.SimulationSweepResponse)
+async def simulate_sweep(
+    request: dataschemas.SimulationSweepRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    한 Feature의 값 범위에 대한 민감도 곡선
+    
+    start ~ stop 구간을 step 간격으로 나눈 격자 점마다 1일차 예측을 계산합니다.
+    과거 데이터(모델 encoder 길이)는 한 번만 로드하고, 모든 격자 점을 배치 추론으로 실행합니다.
+    
+    예: {"feature": "USD_Index", "start": 95, "stop": 115, "step": 1} → 21개 점
+    """
+    logger.info(
+        f"스윕 시뮬레이션 시작 - {request.commodity}, {request.base_date}, "
+        f"{request.feature}: {request.start} ~ {request.stop} (step {request.step})"
+    )
+    
+    # 1. Feature / 격자 검증
+    SimulationValidator.validate_feature_overrides({request.feature: request.start})
+    grid = SimulationValidator.build_sweep_grid(request.start, request.stop, request.step)
+    
+    # 2. 기준 예측 조회 + 과거 데이터 로드 (1회)
+    model, historical_data = await run_in_threadpool(_load_simulation_inputs, db, request)
+    
+    # 3. 원본 + 격자 점 배치 예측 (추론 executor)
+    overrides_list = [None] + [{request.feature: value} for value in grid]
+    results = await _run_in_inference_executor(
+        _run_batch_predictions, request, model, historical_data, overrides_list
+    )
+    
+    original_forecast = results[0]['predictions'][0]
+    points = []
+    for value, result in zip(grid, results[1:]):
+        forecast = result['predictions'][0]
+        change, change_percent = _calculate_changes(original_forecast, forecast)
+        points.append(
+            dataschemas.SweepPoint(
+                value=value,
+                forecast=round(forecast, 2),
+                change=round(change, 2),
+                change_percent=round(change_percent, 2)
+            )
+        )
+    
+    logger.info(f"스윕 완료 - {len(points)}개 점")
+    
+    return dataschemas.SimulationSweepResponse(
+        feature=request.feature,
+        current_value=FeatureImpactCalculator._get_current_value(request.feature, historical_data),
+        original_forecast=round(original_forecast, 2),
+        points=points
+    )
+
+
+def _simulation_cache_key(
+    model_version: str,
+    request: dataschemas.SimulationRequest,
+    feature_overrides: Dict[str, float]
+) -> tuple:
+    """
+    (품목, 기준일, 모델 버전, 정규화된 override) 캐시 키
+
+    DB를 읽기 전에 조회할 수 있도록 입력 윈도우는 키에 넣지 않는다.
+    market_metrics가 바뀌면 invalidate_cache가 이 워커를 지우고 공유 기록으로
+    다른 워커에도 전달한다 (다음 조회 전 sync_invalidations, 최악의 경우에도 TTL로 만료).
+    """
+    return (
+        request.commodity,
+        request.base_date,
+        model_version,
+        tuple(sorted(feature_overrides.items())),
+    )
+
+
+def _load_simulation_inputs(db: Session, request) -> tuple[LoadedModel, Dict]:
+    """
+    기준 예측 존재 확인 + 서빙 모델 묶음 + 과거 데이터 로드 (sync 작업, 스레드풀에서 실행)
+
+    과거 데이터는 추론에 쓸 묶음의 입력 레이아웃으로 읽는다.
+    사이에 모델이 교체되어도 레이아웃과 세션이 어긋나지 않는다.
+    """
+    _get_base_prediction(db, request)
+    try:
+        model = get_prediction_service().model_loader.get_model(request.commodity)
+    except Exception as e:
+        logger.error(f"모델 로드 실패: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"모델 로드 실패: {str(e)}"
+        )
+    return model, _load_historical_data(db, request, model)
+
+
+async def _run_in_inference_executor(fn, *args):
+    """추론 executor에서 실행 (대기열 초과 시 503)"""
+    try:
+        return await get_inference_executor().run(fn, *args)
+    except InferenceQueueFullError as e:
+        logger.warning(f"추론 요청 거부: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 def _get_base_prediction(db: Session, request: dataschemas.SimulationRequest):
@@ -155,17 +391,23 @@ def _get_base_prediction(db: Session, request: dataschemas.SimulationRequest):
     return base_prediction
 
 
-def _load_historical_data(db: Session, request: dataschemas.SimulationRequest) -> Dict:
-    """과거 60일의 시계열 데이터 로드"""
+def _load_historical_data(
+    db: Session,
+    request: dataschemas.SimulationRequest,
+    model: LoadedModel
+) -> Dict:
+    """모델 encoder 길이만큼의 과거 시계열 데이터 로드 (모델 묶음의 관측 feature)"""
+    layout = model.layout
     try:
         historical_data = crud.get_historical_features(
-            db, request.commodity, request.base_date, days=60
+            db, request.commodity, request.base_date,
+            feature_names=layout.observed_features, days=layout.encoder_length
         )
         
         if not historical_data['dates']:
             raise HTTPException(
                 status_code=404,
-                detail=f"{request.commodity}의 과거 60일 시계열 데이터가 없습니다. "
+                detail=f"{request.commodity}의 과거 {layout.encoder_length}일 시계열 데이터가 없습니다. "
                        f"market_metrics 테이블에 데이터를 먼저 저장하세요."
             )
         
@@ -182,32 +424,60 @@ def _load_historical_data(db: Session, request: dataschemas.SimulationRequest) -
 
 def _run_predictions(
     request: dataschemas.SimulationRequest,
-    historical_data: Dict
-) -> tuple[float, float]:
-    """원본 및 시뮬레이션 예측 실행"""
+    model: LoadedModel,
+    historical_data: Dict,
+    feature_overrides: Dict[str, float]
+) -> tuple[Dict, Dict, Dict[str, float]]:
+    """원본 / 시뮬레이션 예측 결과(7일 전체) + Feature별 기여도"""
+    # 원본 + Feature별 단독 변경 + 전체 변경을 한 배치로 실행
+    scenarios = FeatureImpactCalculator.build_ablation_scenarios(feature_overrides)
+    results = _run_batch_predictions(request, model, historical_data, scenarios)
+    
+    # 기여도는 첫 날 예측값 기준 (7일 중 1일차)
+    forecasts = [result['predictions'][0] for result in results]
+    contributions = FeatureImpactCalculator.calculate_contributions(feature_overrides, forecasts)
+    
+    return results[0], results[-1], contributions
+
+
+def _build_forecast_path(base_date: date, result: Dict[str, List[float]]) -> dataschemas.ForecastPath:
+    """예측 결과 → 7일 경로 (기준일 다음 날부터)"""
+    return dataschemas.ForecastPath(
+        dates=[base_date + timedelta(days=i + 1) for i in range(len(result['predictions']))],
+        predictions=[round(v, 2) for v in result['predictions']],
+        lower_bounds=[round(v, 2) for v in result['lower_bounds']],
+        upper_bounds=[round(v, 2) for v in result['upper_bounds']]
+    )
+
+
+def _select_paths(
+    response: dataschemas.SimulationResponse,
+    include_paths: bool
+) -> dataschemas.SimulationResponse:
+    """include_paths=False면 7일 경로를 제외한 응답"""
+    if include_paths:
+        return response
+    return response.model_copy(update={'original_path': None, 'simulated_path': None})
+
+
+def _run_batch_predictions(
+    request,
+    model: LoadedModel,
+    historical_data: Dict,
+    overrides_list: List[Optional[Dict[str, float]]]
+) -> List[Dict[str, List[float]]]:
+    """시나리오 목록을 과거 데이터를 읽은 모델 묶음으로 배치 추론"""
     pred_service = get_prediction_service()
     
     try:
-        # 원본 예측 (override 없이)
-        original_result = pred_service.predict_tft(
-            request.commodity, 
-            historical_data,
-            feature_overrides=None
-        )
-        
-        # 시뮬레이션 예측 (override 적용)
-        simulated_result = pred_service.predict_tft(
+        return pred_service.predict_tft_batch(
             request.commodity,
             historical_data,
-            feature_overrides=request.feature_overrides
+            overrides_list,
+            base_date=request.base_date,
+            model=model
         )
         
-        # 첫 날 예측값 사용 (7일 중 1일차)
-        original_forecast = original_result['predictions'][0]
-        simulated_forecast = simulated_result['predictions'][0]
-        
-        return original_forecast, simulated_forecast
-        
     except Exception as e:
         logger.error(f"예측 실행 실패: {e}")
         import traceback
@@ -1,9 +1,14 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from app import datatable
 from app.database import engine
-from app.routers import predictions, newsdb, market_metrics, simulation, batch
+from app.routers import predictions, newsdb, market_metrics, simulation, batch, models
 from app.ml.model_loader import start_model_update_scheduler
+from app.ml.prediction_service import get_prediction_service
+from app.ml.executor import get_inference_executor, shutdown_inference_executor
+from app.ml.metrics import CONTENT_TYPE, render_metrics
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -26,11 +31,23 @@ async def lifespan(app: FastAPI):
     
     # --- Startup ---
     logger.info("🚀 서버 시작 중...")
+    
+    # 예측 서비스 생성 + 품목별 세션 로드/워밍업 (완료 전에는 요청을 받지 않음)
+    service = get_prediction_service()
+    if await asyncio.to_thread(service.warm_up):
+        logger.info(f"✅ 예측 서비스 준비 완료: {service.warm_commodities}")
+    else:
+        logger.warning(f"⚠️ 일부 품목 워밍업 실패 (준비된 품목: {service.warm_commodities})")
+    
+    get_inference_executor()
     _scheduler = start_model_update_scheduler()
     
     yield
     
     # --- Shutdown ---
+    shutdown_inference_executor()
+    if service.process_pool:
+        service.process_pool.shutdown()
     if _scheduler:
         _scheduler.shutdown(wait=False)
         logger.info("📅 모델 업데이트 스케줄러 종료")
@@ -56,7 +73,26 @@ app.include_router(newsdb.router)
 app.include_router(market_metrics.router)
 app.include_router(simulation.router)
 app.include_router(batch.router)
+app.include_router(models.router)
 
 @app.get("/")
 def read_root():
     return {"message": "Server is running with new structure! 🚀"}
+
+
+@app.get("/ready")
+def read_ready():
+    """예측 서비스 준비 상태 (모든 품목 세션 워밍업 완료 시 200)"""
+    service = get_prediction_service()
+    if not service.is_ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"예측 서비스 워밍업 중 (준비된 품목: {service.warm_commodities})"
+        )
+    return {"status": "ready", "commodities": service.warm_commodities}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Prometheus 지표 (단계별 추론 지연시간, 모델 로드/S3 다운로드, 캐시 hit rate, executor 대기열)"""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
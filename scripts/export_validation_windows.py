@@ -0,0 +1,90 @@
+"""
+INT8 양자화 검증용 입력 윈도우 추출
+
+market_metrics의 최근 거래일들을 기준일로 삼아 실제 추론과 같은 방식으로
+모델 입력 텐서를 만들고, INT8_VALIDATION_WINDOWS_PATH(.npz)에 저장합니다.
+MODEL_PRECISION=int8 서버는 이 윈도우로 FP32 / INT8 출력을 비교한 뒤
+오차가 임계값 이하일 때만 INT8 모델로 서빙합니다.
+
+사용법:
+    python scripts/export_validation_windows.py --commodity corn --samples 64
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import crud
+from app.config import settings
+from app.database import SessionLocal
+from app.ml.prediction_service import get_prediction_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 검증용 입력 윈도우 추출")
+    parser.add_argument("--commodity", default="corn", help="윈도우를 추출할 품목")
+    parser.add_argument("--samples", type=int, default=64, help="추출할 윈도우(기준일) 수")
+    parser.add_argument("--end-date", default=None, help="마지막 기준일 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument("--output", default=None, help="결과 파일 (기본: INT8_VALIDATION_WINDOWS_PATH)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    end_date = date.fromisoformat(args.end_date) if args.end_date else date.today()
+    output = Path(args.output or settings.int8_validation_windows_path)
+    service = get_prediction_service()
+    # 입력 레이아웃 / 전처리 엔진은 같은 모델 묶음에서
+    model = service.model_loader.get_model(args.commodity)
+    layout, preprocessor = model.layout, model.preprocessor
+
+    db = SessionLocal()
+    try:
+        # 기준일 후보: 최근 거래일 (각 기준일마다 과거 encoder 길이만큼 필요하므로 넉넉히 조회)
+        recent = crud.get_historical_features(
+            db, args.commodity, end_date, days=args.samples * 2 + layout.encoder_length + 30,
+            feature_names=layout.observed_features,
+        )
+        base_dates = recent['dates'][-args.samples:]
+
+        windows = []
+        for base_date in base_dates:
+            historical_data = crud.get_historical_features(
+                db, args.commodity, base_date,
+                days=layout.encoder_length, feature_names=layout.observed_features,
+            )
+            if not historical_data['dates']:
+                continue
+            windows.append(
+                service._prepare_batch_inputs(
+                    historical_data, [None], base_date, layout, preprocessor
+                )
+            )
+    finally:
+        db.close()
+
+    if not windows:
+        print(f"❌ {args.commodity}의 market_metrics 데이터가 없습니다 (기준일 ≤ {end_date})")
+        sys.exit(1)
+
+    stacked = {
+        name: np.concatenate([w[name] for w in windows], axis=0)
+        for name in windows[0]
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(output, **stacked)
+
+    print(f"\n✅ 검증 윈도우 {len(windows)}개 저장: {output}")
+    print(f"   기준일: {base_dates[0]} ~ {base_dates[-1]}")
+    for name, array in stacked.items():
+        print(f"   {name}: {list(array.shape)} {array.dtype}")
+
+
+if __name__ == "__main__":
+    main()
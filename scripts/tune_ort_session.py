@@ -0,0 +1,68 @@
+"""
+ONNX Runtime 세션 프로필 auto-tune
+
+현재 설정(MODEL_LOAD_MODE 등)으로 TFT 모델을 로드한 뒤,
+워커당 코어 예산(CPU 코어 수 / WEB_CONCURRENCY) 안의 후보 프로필을 벤치마크하고
+p95 지연시간이 가장 낮은 프로필을 ORT_TUNED_PROFILE_PATH에 기록합니다.
+실행 중인 서버는 튜닝 프로필을 프로세스당 1번만 읽으므로, 재시작 후 기록된 프로필을 사용합니다.
+
+사용법:
+    WEB_CONCURRENCY=4 python scripts/tune_ort_session.py --commodity corn --runs 100
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.model_loader import get_model_loader
+from app.ml.prediction_service import get_prediction_service
+from app.ml.session_options import auto_tune
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORT 세션 프로필 auto-tune")
+    parser.add_argument("--commodity", default="corn", help="벤치마크할 품목 모델")
+    parser.add_argument("--runs", type=int, default=50, help="프로필/배치 크기별 측정 횟수")
+    parser.add_argument("--output", default=None, help="결과 파일 (기본: ORT_TUNED_PROFILE_PATH)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    loader = get_model_loader()
+    loader.load_session(args.commodity)
+    model_path = loader.get_model_path(args.commodity)
+
+    service = get_prediction_service()
+    dummy_data = {'dates': [], 'features': {}}
+
+    layout = loader.get_feature_layout(args.commodity)
+    preprocessor = loader.get_preprocessor(args.commodity)
+
+    def make_inputs(batch_size):
+        return service._prepare_batch_inputs(
+            dummy_data, [None] * batch_size, layout=layout, preprocessor=preprocessor
+        )
+
+    print(f"\n{'='*70}")
+    print(f"ORT 세션 프로필 auto-tune: {model_path}")
+    print(f"{'='*70}\n")
+
+    record = auto_tune(str(model_path), make_inputs, output_path=args.output, runs=args.runs)
+
+    print(f"\n{'─'*70}")
+    for result in sorted(record["results"], key=lambda r: r["metrics"]["p95_ms"]):
+        profile, metrics = result["profile"], result["metrics"]
+        print(
+            f"  intra={profile['intra_op_threads']:<2} inter={profile['inter_op_threads']:<2} "
+            f"{profile['execution_mode']:<10} opt={profile['graph_optimization_level']:<8} "
+            f"p50={metrics['p50_ms']:7.3f}ms  p95={metrics['p95_ms']:7.3f}ms"
+        )
+    print(f"\n✅ 최적 프로필: {record['profile']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+시뮬레이션 Feature 기여도 계산 테스트 (모델 파일 불필요)
+
+- 기여도 계산용 시나리오 구성 (원본 / 단독 변경 / 전체 변경)
+- 선형 모델에서는 단독 효과 = 기여도
+- 상호작용이 있어도 기여도 합 = 전체 변화량
+
+실행:
+    python tests/test_feature_contributions.py
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.routers.simulation import FeatureImpactCalculator
+
+
+BASE = {"10Y_Yield": 4.0, "USD_Index": 100.0, "pdsi": 0.0}
+
+
+def _forecast(overrides, interaction=0.0):
+    """가짜 1일차 예측: 선형 항 + (선택) 금리 × 달러 상호작용"""
+    values = {**BASE, **(overrides or {})}
+    linear = 450.0 + 2.0 * values["10Y_Yield"] - 0.5 * values["USD_Index"] + 3.0 * values["pdsi"]
+    return linear + interaction * (values["10Y_Yield"] - 4.0) * (values["USD_Index"] - 100.0)
+
+
+def test_ablation_scenarios():
+    overrides = {"10Y_Yield": 4.5, "USD_Index": 105.0}
+    scenarios = FeatureImpactCalculator.build_ablation_scenarios(overrides)
+    assert scenarios == [None, {"10Y_Yield": 4.5}, {"USD_Index": 105.0}, overrides]
+
+    single = {"pdsi": -2.0}
+    assert FeatureImpactCalculator.build_ablation_scenarios(single) == [None, single]
+    print("✅ 기여도 시나리오 구성")
+
+
+def test_contributions_sum_to_change():
+    overrides = {"10Y_Yield": 4.5, "USD_Index": 105.0, "pdsi": -1.0}
+    scenarios = FeatureImpactCalculator.build_ablation_scenarios(overrides)
+
+    # 선형 모델: 기여도 = 단독 효과
+    forecasts = [_forecast(s) for s in scenarios]
+    contributions = FeatureImpactCalculator.calculate_contributions(overrides, forecasts)
+    assert abs(contributions["10Y_Yield"] - 1.0) < 1e-9
+    assert abs(contributions["USD_Index"] - (-2.5)) < 1e-9
+    assert abs(contributions["pdsi"] - (-3.0)) < 1e-9
+
+    # 상호작용 포함: 합계 = 전체 변화량
+    forecasts = [_forecast(s, interaction=0.8) for s in scenarios]
+    contributions = FeatureImpactCalculator.calculate_contributions(overrides, forecasts)
+    total_change = forecasts[-1] - forecasts[0]
+    assert abs(sum(contributions.values()) - total_change) < 1e-9
+
+    # 단일 Feature: 기여도 = 전체 변화량
+    single = {"pdsi": -2.0}
+    forecasts = [_forecast(s) for s in FeatureImpactCalculator.build_ablation_scenarios(single)]
+    assert FeatureImpactCalculator.calculate_contributions(single, forecasts) == {"pdsi": -6.0}
+    print(f"✅ 기여도 합 = 전체 변화량 ({total_change:.3f})")
+
+
+if __name__ == "__main__":
+    test_ablation_scenarios()
+    test_contributions_sum_to_change()
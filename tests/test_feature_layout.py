@@ -0,0 +1,108 @@
+"""
+입력 레이아웃(FeatureLayout) 테스트 (모델 파일 불필요)
+
+- 메타데이터 없음 → 기본 52개 레이아웃
+- pkl feature 순서 / 스케일러 / encoder·decoder 길이 반영
+- 모델 입력 차원과 개수가 다른 feature 목록은 무시
+- 다른 레이아웃으로 텐서 빌드
+
+실행:
+    python tests/test_feature_layout.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.feature_layout import DEFAULT_FEATURE_ORDER, DEFAULT_LAYOUT, build_layout
+from app.ml.prediction_service import ONNXPredictionService
+
+
+class _FakeSession:
+    """get_inputs / get_modelmeta만 흉내내는 세션"""
+
+    def __init__(self, num_features, encoder_length=60, decoder_length=7, metadata=None):
+        self._inputs = [
+            SimpleNamespace(name='encoder_cont', shape=['batch', encoder_length, num_features]),
+            SimpleNamespace(name='decoder_cont', shape=['batch', decoder_length, num_features]),
+        ]
+        self._metadata = metadata or {}
+
+    def get_inputs(self):
+        return self._inputs
+
+    def get_modelmeta(self):
+        return SimpleNamespace(custom_metadata_map=self._metadata)
+
+
+def test_default_layout():
+    layout = build_layout({}, _FakeSession(52))
+    assert layout.feature_order == DEFAULT_FEATURE_ORDER
+    assert layout.source == "default"
+    assert len(layout.observed_features) == 46
+    assert layout.observed_features[:2] == ('close', 'open')
+    assert layout.column_index['day_of_year'] == DEFAULT_FEATURE_ORDER.index('day_of_year')
+    print("✅ 메타데이터 없음 → 기본 레이아웃")
+
+
+def test_layout_from_pkl():
+    order = ['close', 'USD_Index', 'time_idx', 'day_of_year', 'encoder_length', 'close_center']
+    info = {
+        'feature_order': order,
+        'feature_names': ['USD_Index'],   # 스케일러 컬럼 이름 (feature 순서로 쓰지 않음)
+        'scaler': SimpleNamespace(mean_=np.array([100.0]), scale_=np.array([5.0])),
+        'scalers': {'close': SimpleNamespace(center_=450.0, scale_=12.5)},
+        'max_encoder_length': 30,
+        'max_prediction_length': 5,
+    }
+    layout = build_layout(info, _FakeSession(len(order), encoder_length='enc', decoder_length='dec'))
+    assert layout.source == "pkl"
+    assert layout.feature_order == tuple(order)
+    assert layout.observed_features == ('close', 'USD_Index')
+    assert (layout.encoder_length, layout.decoder_length) == (30, 5)
+    assert layout.scalers == {'close': (450.0, 12.5), 'USD_Index': (100.0, 5.0)}
+
+    # 모델 입력 차원과 개수가 다르면 무시하고 ONNX 메타데이터 → 기본 순서
+    mismatched = build_layout({'feature_order': order}, _FakeSession(52))
+    assert mismatched.feature_order == DEFAULT_FEATURE_ORDER
+    from_onnx = build_layout(
+        {'feature_order': order},
+        _FakeSession(len(order), metadata={'feature_order': ','.join(reversed(order))}),
+    )
+    assert from_onnx.source == "onnx" and from_onnx.feature_order == tuple(reversed(order))
+    print("✅ pkl / ONNX 메타데이터 레이아웃")
+
+
+def test_tensor_build_with_custom_layout():
+    order = ['close', 'USD_Index', 'time_idx', 'day_of_year', 'encoder_length', 'close_center']
+    layout = build_layout({'feature_order': order, 'max_encoder_length': 10, 'max_prediction_length': 3})
+    service = ONNXPredictionService()
+    historical_data = {
+        'dates': [],
+        'features': {'close': list(np.arange(10, dtype=float) + 400), 'USD_Index': [100.0] * 10},
+    }
+
+    inputs = service._prepare_batch_inputs(historical_data, [None, {'USD_Index': 110.0}], layout=layout)
+    assert inputs['encoder_cont'].shape == (2, 10, 6)
+    assert inputs['decoder_cont'].shape == (2, 3, 6)
+    assert inputs['encoder_lengths'].tolist() == [10, 10]
+    assert inputs['encoder_cont'][0, :, 0].tolist() == historical_data['features']['close']
+    assert inputs['encoder_cont'][1, :, 1].tolist() == [110.0] * 10
+    assert inputs['encoder_cont'][0, :, 4].tolist() == [10.0] * 10
+    assert inputs['decoder_cont'][0, :, 2].tolist() == [10.0, 11.0, 12.0]
+
+    # 기본 레이아웃 입력은 그대로
+    default_inputs = service._prepare_batch_inputs(historical_data, [None])
+    assert default_inputs['encoder_cont'].shape == (1, 60, DEFAULT_LAYOUT.num_features)
+    print("✅ 사용자 레이아웃 텐서 빌드")
+
+
+if __name__ == "__main__":
+    test_default_layout()
+    test_layout_from_pkl()
+    test_tensor_build_with_custom_layout()
@@ -0,0 +1,180 @@
+"""
+추론 캐시 테스트 (모델 파일 불필요)
+
+- LRUCache: 용량 초과 시 제거, TTL 만료, hit/miss 카운트, 부분 무효화
+- 원본 예측 캐시: 같은 기준일/모델/윈도우면 session.run 생략
+- 워커 간 무효화: 다른 워커의 market_metrics 쓰기 범위가 공유 기록으로 전달되어 결과 캐시에서 제거
+
+실행:
+    python tests/test_inference_cache.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from datetime import date
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import dataschemas
+from app.config import settings
+from app.ml.cache import LRUCache
+from app.ml.model_loader import LoadedModel
+from app.ml.prediction_service import ONNXPredictionService
+from app.routers.simulation import _simulation_cache_key
+from test_tensor_builder import create_mock_historical_data
+
+
+class FakeInput:
+    def __init__(self, name):
+        self.name = name
+        self.shape = ['batch', 60, 52]
+
+
+class FakeSession:
+    """encoder_cont 평균을 예측값으로 돌려주는 가짜 세션 (호출 횟수/배치 크기 기록)"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def get_inputs(self):
+        return [FakeInput('encoder_cont')]
+
+    def run(self, output_names, inputs):
+        encoder_cont = inputs['encoder_cont']
+        self.batch_sizes.append(encoder_cont.shape[0])
+        mean = encoder_cont.mean(axis=(1, 2))
+        return [np.repeat(mean[:, None, None], 7, axis=1).repeat(3, axis=2)]
+
+
+class FakeLoader:
+    def __init__(self):
+        self.session = FakeSession()
+        self.source_tag = "etag-1"
+
+    def get_model(self, commodity="corn"):
+        return LoadedModel(
+            commodity=commodity,
+            session=self.session,
+            model_path=Path("models_cache/corn/60d_20260206.onnx"),
+            source_tag=self.source_tag,
+            onnx_key="models/60d_20260206.onnx",
+        )
+
+    def get_feature_layout(self, commodity="corn"):
+        return self.get_model(commodity).layout
+
+
+def make_service():
+    service = ONNXPredictionService()
+    service.model_loader = FakeLoader()
+    return service
+
+
+def test_lru_cache_eviction_and_stats():
+    """용량 초과 시 LRU 제거 + hit/miss 카운트"""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # a 최근 사용
+    cache.put("c", 3)                   # b 제거
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert cache.invalidate(lambda key: key == "a") == 1
+    assert len(cache) == 1
+    print("✅ LRUCache 동작 확인")
+
+
+def test_lru_cache_ttl():
+    """ttl이 지난 항목은 miss 처리"""
+    cache = LRUCache(maxsize=4, ttl=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    print("✅ LRUCache TTL 확인")
+
+
+def test_baseline_memoized_per_window():
+    """같은 기준일/윈도우의 원본 예측은 두 번째 요청부터 추론하지 않음"""
+    service = make_service()
+    session = service.model_loader.session
+    historical_data = create_mock_historical_data(60)
+    base_date = date(2026, 2, 6)
+
+    first = service.predict_tft_batch("corn", historical_data, [None, {"USD_Index": 105.0}], base_date)
+    second = service.predict_tft_batch("corn", historical_data, [None, {"USD_Index": 110.0}], base_date)
+
+    assert session.batch_sizes == [2, 1]
+    assert first[0] == second[0]
+    assert service.baseline_cache.stats()["hits"] == 1
+
+    # 모델 버전이 바뀌면 다시 계산
+    service.model_loader.source_tag = "etag-2"
+    service.predict_tft_batch("corn", historical_data, [None], base_date)
+    assert session.batch_sizes == [2, 1, 1]
+    print("✅ 원본 예측 캐시 동작 확인")
+
+
+def test_invalidate_by_market_window():
+    """market_metrics 쓰기 날짜가 입력 윈도우에 포함된 기준일만 무효화"""
+    service = make_service()
+    historical_data = create_mock_historical_data(60)
+    for base_date in (date(2026, 1, 1), date(2026, 3, 1), date(2026, 6, 1)):
+        service.predict_tft_batch("corn", historical_data, [None], base_date)
+
+    removed = service.invalidate_cache("corn", date(2026, 2, 10), date(2026, 2, 10))
+    assert removed == 1  # 2026-03-01 윈도우만 2026-02-10 포함
+    assert len(service.baseline_cache) == 2
+    assert service.invalidate_cache("soybean") == 0
+    print("✅ 날짜 범위 무효화 확인")
+
+
+def test_invalidation_shared_across_workers():
+    """한 워커의 market_metrics 무효화가 공유 기록으로 다른 워커의 결과 캐시까지 지움"""
+    saved = (settings.web_concurrency, settings.cache_invalidation_log)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            settings.web_concurrency = 2
+            settings.cache_invalidation_log = str(Path(tmp) / "invalidations.log")
+            writer, reader = make_service(), make_service()
+            model_version = reader.model_loader.get_model("corn").version
+            request = dataschemas.SimulationRequest(
+                commodity="corn", base_date=date(2026, 3, 1), feature_overrides={"USD_Index": 105.0}
+            )
+            key = _simulation_cache_key(model_version, request, {"USD_Index": 105.0})
+            other = _simulation_cache_key(model_version, request.model_copy(update={"base_date": date(2026, 6, 1)}), {})
+            reader.result_cache.put(key, "response")
+            reader.result_cache.put(other, "response")
+
+            # 새 기록 없음 → 그대로
+            assert reader.sync_invalidations() == 0 and len(reader.result_cache) == 2
+
+            # 다른 워커가 2026-03-01 윈도우 안의 값을 upsert → 그 기준일만 제거
+            writer.invalidate_cache("corn", date(2026, 2, 10), date(2026, 2, 10))
+            assert reader.sync_invalidations() == 1
+            assert reader.result_cache.get(key) is None and reader.result_cache.get(other) == "response"
+            assert reader.sync_invalidations() == 0
+
+            # 품목 전체 무효화
+            writer.invalidate_cache("corn")
+            assert reader.sync_invalidations() == 1 and len(reader.result_cache) == 0
+        finally:
+            settings.web_concurrency, settings.cache_invalidation_log = saved
+    print("✅ 워커 간 캐시 무효화 공유")
+
+
+if __name__ == "__main__":
+    test_lru_cache_eviction_and_stats()
+    test_lru_cache_ttl()
+    test_baseline_memoized_per_window()
+    test_invalidate_by_market_window()
+    test_invalidation_shared_across_workers()
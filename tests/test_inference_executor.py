@@ -0,0 +1,56 @@
+"""
+추론 executor 테스트 (모델 파일 불필요)
+
+- 대기열 상한 초과 시 InferenceQueueFullError
+- queue_depth / completed 카운트
+
+실행:
+    python tests/test_inference_executor.py
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.executor import InferenceExecutor, InferenceQueueFullError
+
+
+def test_executor_bounded_queue():
+    """worker 1개 + 대기 1건까지만 허용, 나머지는 거부"""
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        while executor.stats()["active"] == 0:
+            await asyncio.sleep(0.001)
+
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.01)
+        assert executor.queue_depth == 1
+
+        try:
+            await executor.run(lambda: "rejected")
+            raise AssertionError("대기열 초과 요청이 거부되지 않았습니다")
+        except InferenceQueueFullError:
+            pass
+
+        release.set()
+        assert await queued == "queued"
+        await running
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
+    executor.shutdown()
+    print("✅ 추론 executor 대기열 상한 확인")
+
+
+if __name__ == "__main__":
+    test_executor_bounded_queue()
@@ -0,0 +1,62 @@
+"""
+추론 지표(Prometheus 텍스트 포맷) 테스트 (모델 파일 불필요)
+
+- Histogram 누적 버킷 / _sum / _count
+- Counter / Gauge 라벨 출력
+- 스크레이프 시점 collector
+
+실행:
+    python tests/test_metrics.py
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("stage_seconds", "단계별 시간", ["stage"], buckets=(0.01, 0.1)))
+    for value in (0.005, 0.05, 0.5):
+        histogram.observe(value, stage="parse")
+
+    text = registry.render()
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="parse",le="0.01"} 1' in text
+    assert 'stage_seconds_bucket{stage="parse",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="parse"} 3' in text
+    assert 'stage_seconds_sum{stage="parse"} 0.555' in text
+
+    with histogram.time(stage="tensor_build"):
+        pass
+    assert 'stage_seconds_count{stage="tensor_build"} 1' in registry.render()
+    print("✅ Histogram 출력 확인")
+
+
+def test_counter_gauge_and_collector():
+    registry = MetricsRegistry()
+    downloaded = registry.register(Counter("download_bytes_total", "다운로드 바이트", ["file"]))
+    downloaded.inc(100, file="onnx")
+    downloaded.inc(50, file="onnx")
+
+    def collect():
+        ratio = Gauge("cache_hit_ratio", "hit 비율", ["cache"])
+        ratio.set(0.75, cache="baseline")
+        return [ratio]
+
+    registry.register_collector(collect)
+    text = registry.render()
+    assert 'download_bytes_total{file="onnx"} 150.0' in text
+    assert "# TYPE cache_hit_ratio gauge" in text
+    assert 'cache_hit_ratio{cache="baseline"} 0.75' in text
+    print("✅ Counter / Gauge / collector 출력 확인")
+
+
+if __name__ == "__main__":
+    test_histogram_exposition()
+    test_counter_gauge_and_collector()
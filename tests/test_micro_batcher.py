@@ -0,0 +1,150 @@
+"""
+동시 요청 micro-batching 테스트 (모델 파일 불필요)
+
+- 수집 시간 안에 들어온 요청들이 한 번의 실행으로 합쳐지는지
+- 각 호출자가 자기 행 범위의 출력만 받는지
+- 배치 크기 분포 / 세션별 분리 / 예외 전파
+- 입력 모양이 달라 합치기에 실패해도 묶음의 모든 요청에 예외 전달, 워커 스레드는 계속 동작
+- session_run 단계 시간은 대기열 대기 없이 실제 실행만 (묶음당 1번)
+
+실행:
+    python tests/test_micro_batcher.py
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.metrics import INFERENCE_STAGE_SECONDS
+from app.ml.micro_batcher import MicroBatcher
+
+
+class RecordingRunner:
+    """입력을 그대로 되돌려주고 실행된 배치 크기를 기록"""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, session, model_inputs):
+        with self._lock:
+            self.batch_sizes.append(model_inputs['encoder_cont'].shape[0])
+        if self.fail:
+            raise RuntimeError("session.run 실패")
+        return [model_inputs['encoder_cont'] * 2]
+
+
+def make_inputs(value: float, rows: int = 1):
+    return {'encoder_cont': np.full((rows, 3), value, dtype=np.float32)}
+
+
+def test_concurrent_requests_coalesced():
+    """동시 요청 8건 → 한 번의 실행, 각자 자기 결과 수신"""
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_ms=50, max_batch_size=64)
+    session = object()
+    barrier = threading.Barrier(8)
+
+    def call(i):
+        barrier.wait()
+        return batcher.run(session, make_inputs(i, rows=(i % 2) + 1))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(call, range(8)))
+
+    for i, (output,) in enumerate(results):
+        assert output.shape == ((i % 2) + 1, 3)
+        assert np.all(output == i * 2), f"요청 {i}가 다른 요청의 결과를 받았습니다"
+
+    assert sum(runner.batch_sizes) == 12
+    assert len(runner.batch_sizes) < 8, f"요청이 합쳐지지 않았습니다: {runner.batch_sizes}"
+
+    stats = batcher.stats()
+    assert stats["requests"] == 8
+    assert sum(size * count for size, count in stats["batch_size_histogram"].items()) == 12
+    print(f"✅ 동시 요청 병합: {runner.batch_sizes}, 대기 {stats['queue_wait_ms']}")
+
+
+def test_sessions_not_mixed_and_errors_propagate():
+    """다른 세션 요청은 따로 실행되고, 실행 예외는 해당 호출자에게 전달"""
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_ms=50, max_batch_size=64)
+    futures = [
+        batcher.submit(session, make_inputs(i))
+        for i, session in enumerate([object(), object()])
+    ]
+    for i, future in enumerate(futures):
+        assert np.all(future.result()[0] == i * 2)
+    assert runner.batch_sizes == [1, 1]
+
+    failing = MicroBatcher(RecordingRunner(fail=True), window_ms=1, max_batch_size=4)
+    try:
+        failing.run(object(), make_inputs(1))
+        raise AssertionError("실행 예외가 전달되지 않았습니다")
+    except RuntimeError:
+        pass
+    print("✅ 세션별 분리 / 예외 전파 확인")
+
+
+def test_mismatched_inputs_fail_group_not_worker():
+    """같은 세션의 요청끼리 feature 수가 달라 concatenate가 실패해도 대기 중인 요청이 멈추지 않음"""
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_ms=50, max_batch_size=64)
+    session = object()
+    futures = [
+        batcher.submit(session, make_inputs(1.0)),
+        batcher.submit(session, {'encoder_cont': np.ones((1, 5), dtype=np.float32)}),
+    ]
+    for future in futures:
+        try:
+            future.result(timeout=5)
+            raise AssertionError("입력 합치기 예외가 전달되지 않았습니다")
+        except ValueError:
+            pass
+    assert runner.batch_sizes == []
+
+    # 워커 스레드는 살아 있어 다음 요청을 처리
+    assert np.all(batcher.run(session, make_inputs(3.0))[0] == 6.0)
+    assert batcher._worker.is_alive()
+    print("✅ 입력 합치기 실패 → 묶음 전체에 예외, 워커 유지")
+
+
+def _session_run_series():
+    """session_run 단계 (합계 초, 개수)"""
+    series = INFERENCE_STAGE_SECONDS._series.get(("session_run",))
+    return (series[1], series[2]) if series else (0.0, 0)
+
+
+def test_session_run_excludes_queue_wait():
+    """수집 시간 200ms 동안 기다린 요청도 session_run에는 실행 시간(20ms)만 기록"""
+    def slow_runner(session, model_inputs):
+        time.sleep(0.02)
+        return [model_inputs['encoder_cont']]
+
+    batcher = MicroBatcher(slow_runner, window_ms=200, max_batch_size=64)
+    session = object()
+    total_before, count_before = _session_run_series()
+    futures = [batcher.submit(session, make_inputs(i)) for i in range(3)]
+    for future in futures:
+        future.result(timeout=5)
+
+    total, count = _session_run_series()
+    assert count - count_before == 1
+    assert 0.02 <= total - total_before < 0.15, total - total_before
+    assert batcher.stats()["queue_wait_ms"]["max"] >= 100
+    print(f"✅ session_run = 실행 시간만 ({(total - total_before) * 1000:.0f}ms, 대기 제외)")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_coalesced()
+    test_sessions_not_mixed_and_errors_propagate()
+    test_mismatched_inputs_fail_group_not_worker()
+    test_session_run_excludes_queue_wait()
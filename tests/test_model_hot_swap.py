@@ -0,0 +1,215 @@
+"""
+모델 무중단 교체 테스트 (모델 파일 불필요, onnx 패키지로 작은 그래프 생성 + 가짜 S3)
+
+- 새 모델 준비(prepare) 중에는 기존 모델로 서빙, 로드/다운로드 재유발 없음
+- 교체 후에도 이전 묶음을 잡고 있던 요청은 이전 세션으로 끝까지 실행
+- prepare 실패 시 교체하지 않음
+- 연달아 두 번 교체해도 요청이 잡고 있는 첫 버전 파일 / 세션 유지
+- 프로세스 백엔드: 워커가 두 버전만 유지해도 첫 버전 요청은 파일에서 다시 로드해 처리
+
+실행:
+    python tests/test_model_hot_swap.py
+"""
+
+import gc
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings
+from app.ml import model_store
+from app.ml.model_loader import ONNXModelLoader
+from app.ml.model_store import ModelStore
+from app.ml.prediction_service import ONNXPredictionService
+from app.ml.process_pool import ProcessInferencePool
+from test_model_registry import _write_model, _write_tft_model
+from test_process_pool import worker_cache_env
+from test_s3_download import FakeS3
+from test_tensor_builder import create_mock_historical_data
+
+
+def test_double_buffered_swap():
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if not _write_model(root / "bucket" / "models", "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        try:
+            settings.model_load_mode = "s3"
+            settings.model_s3_prefix = "models"
+            settings.model_registry = {}
+            settings.ort_optimized_model_cache = False
+            settings.model_precision = "fp32"
+
+            s3 = FakeS3(root / "bucket")
+
+            def downloaded_keys():
+                # 조건부 GET 없이 받은 첫 조각 요청 = 실제 다운로드
+                return [key for key, byte_range, if_none_match in s3.requests
+                        if byte_range and byte_range.startswith("bytes=0-") and if_none_match is None]
+
+            loader = ONNXModelLoader()
+            loader._s3_client = s3
+            loader.store = ModelStore(root / "store")
+
+            old = loader.get_model("corn")
+            assert loader.check_and_update("corn") is False
+
+            _write_model(root / "bucket" / "models", "60d_20260102.onnx")
+
+            def prepare(model):
+                # 준비 중 들어온 요청은 기존 모델 그대로 (새 다운로드 없음)
+                assert loader.get_model("corn") is old
+                assert model.session is not old.session
+                assert downloaded_keys() == ["models/60d_20260101.onnx", "models/60d_20260102.onnx"]
+
+            assert loader.check_and_update("corn", prepare=prepare) is True
+            new = loader.get_model("corn")
+            assert new.onnx_key == "models/60d_20260102.onnx"
+            assert loader.get_model_version("corn") == new.version != old.version
+
+            # 교체 전에 잡은 묶음은 계속 실행 가능 (파일도 drain용으로 유지)
+            x = np.array([[-1.0, 0.0, 2.0]], dtype=np.float32)
+            assert old.session.run(None, {"x": x})[0].tolist() == [[0.0, 0.0, 2.0]]
+            assert old.model_path.exists()
+
+            # prepare 실패 → 교체 안 함
+            _write_model(root / "bucket" / "models", "60d_20260103.onnx")
+
+            def failing_prepare(model):
+                raise RuntimeError("warm-up failed")
+
+            try:
+                loader.check_and_update("corn", prepare=failing_prepare)
+                raise AssertionError("prepare 실패가 전파되어야 함")
+            except RuntimeError:
+                pass
+            assert loader.get_model("corn") is new
+        finally:
+            (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision) = saved
+    print("✅ 새 모델 준비 후 원자적 교체 / 이전 묶음 유지")
+
+
+def _swap_settings(test) -> None:
+    """s3 모드 + 저장소 이력 1개 + 유예 없음 (교체마다 이전 버전이 정리 대상)"""
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision,
+             model_store._UNREFERENCED_GRACE_SECONDS)
+    try:
+        settings.model_load_mode = "s3"
+        settings.model_s3_prefix = "models"
+        settings.model_registry = {}
+        settings.ort_optimized_model_cache = False
+        settings.model_precision = "fp32"
+        model_store._UNREFERENCED_GRACE_SECONDS = 0
+        test()
+    finally:
+        (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+         settings.ort_optimized_model_cache, settings.model_precision,
+         model_store._UNREFERENCED_GRACE_SECONDS) = saved
+
+
+def _loader(root: Path) -> ONNXModelLoader:
+    loader = ONNXModelLoader()
+    loader._s3_client = FakeS3(root / "bucket")
+    loader.store = ModelStore(root / "store", max_versions=1)
+    return loader
+
+
+def test_back_to_back_swaps():
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            models = root / "bucket" / "models"
+            if not _write_tft_model(models, "60d_20260101.onnx", bias=1.0):
+                print("⏭️ onnx 패키지 없음 - 건너뜀")
+                return
+            loader = _loader(root)
+            service = ONNXPredictionService(inference_backend="thread")
+            data = create_mock_historical_data(60, seed=3)
+
+            first = loader.get_model("corn")
+            expected = service._infer(first, data, [None])
+
+            # 첫 버전을 잡은 요청이 끝나기 전에 두 번 교체
+            for day, bias in ((2, 2.0), (3, 3.0)):
+                _write_tft_model(models, f"60d_2026010{day}.onnx", bias=bias)
+                assert loader.check_and_update("corn") is True
+            assert loader.get_model("corn").onnx_key == "models/60d_20260103.onnx"
+            assert first.model_path.exists()
+            actual = service._infer(first, data, [None])
+            assert np.allclose(actual[0]["predictions"], expected[0]["predictions"])
+
+            # 요청이 끝나면 다음 교체 때 정리
+            first_path = first.model_path
+            del first
+            gc.collect()
+            _write_tft_model(models, "60d_20260104.onnx", bias=4.0)
+            assert loader.check_and_update("corn") is True
+            assert not first_path.exists()
+    _swap_settings(run)
+    print("✅ 연달아 두 번 교체 / 잡고 있는 첫 버전 유지")
+
+
+def test_swaps_with_process_backend():
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            models = root / "bucket" / "models"
+            if not _write_tft_model(models, "60d_20260101.onnx", bias=1.0):
+                print("⏭️ onnx 패키지 없음 - 건너뜀")
+                return
+            loader = _loader(root)
+            service = ONNXPredictionService(inference_backend="thread")
+            with worker_cache_env(root / "cache"):
+                _check_process_swaps(loader, service, models)
+    _swap_settings(run)
+    print("✅ 프로세스 백엔드 연속 교체 / 이전 버전 요청 처리")
+
+
+def _check_process_swaps(loader: ONNXModelLoader, service: ONNXPredictionService, models: Path) -> None:
+    pool = ProcessInferencePool(max_workers=1)
+    data = create_mock_historical_data(60, seed=4)
+    dummy = {'dates': [], 'features': {}}
+
+    def prepare(model):
+        # 교체 전 워커에 새 버전 워밍업 (실패 시 교체 안 함)
+        if not pool.warm_up(service._model_ref(model), dummy, [None, None]):
+            raise RuntimeError("worker warm-up failed")
+
+    try:
+        first = loader.get_model("corn")
+        prepare(first)
+        expected = service._infer(first, data, [None, {"close": 400.0}])
+
+        for day, bias in ((2, 2.0), (3, 3.0)):
+            _write_tft_model(models, f"60d_2026010{day}.onnx", bias=bias)
+            assert loader.check_and_update("corn", prepare=prepare) is True
+
+        # 워커는 2, 3번째 버전만 유지 → 첫 버전은 파일에서 다시 로드해 같은 결과
+        actual = pool.infer(service._model_ref(first), data, [None, {"close": 400.0}])
+        for a, e in zip(actual, expected):
+            assert np.allclose(a["predictions"], e["predictions"], rtol=1e-5)
+
+        # 새 버전 결과는 첫 버전과 다름 (교체가 워커에도 반영)
+        current = loader.get_model("corn")
+        latest = pool.infer(service._model_ref(current), data, [None])
+        assert not np.allclose(latest[0]["predictions"], expected[0]["predictions"])
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_double_buffered_swap()
+    test_back_to_back_swaps()
+    test_swaps_with_process_backend()
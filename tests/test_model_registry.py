@@ -0,0 +1,130 @@
+"""
+품목별 모델 레지스트리 / 동시 로드 테스트 (모델 파일 불필요, onnx 패키지로 작은 그래프 생성)
+
+- MODEL_REGISTRY 품목별 로컬 폴더 / 미등록 품목은 LOCAL_MODEL_PATH
+- load_all: 품목 동시 로드, 실패 품목은 예외로 반환
+
+실행:
+    python tests/test_model_registry.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.ml.model_loader import ONNXModelLoader
+
+
+def _write_model(folder: Path, name: str) -> bool:
+    """y = Relu(x) 모델 저장 (onnx 패키지가 없으면 False)"""
+    try:
+        import onnx
+        from onnx import TensorProto, helper
+    except ImportError:
+        return False
+
+    graph = helper.make_graph(
+        [helper.make_node('Relu', ['x'], ['y'])],
+        'registry_test',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, ['batch', 3])],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, ['batch', 3])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 17)])
+    model.ir_version = 8
+    folder.mkdir(parents=True, exist_ok=True)
+    onnx.save(model, str(folder / name))
+    return True
+
+
+def _write_tft_model(folder: Path, name: str, bias: float = 0.0) -> bool:
+    """
+    TFT 입력 7종 → output [B, 7, 3] 모델 저장 (onnx 패키지가 없으면 False)
+
+    output = (decoder_cont 앞 3개 컬럼 + encoder_cont 평균 + bias) * target_scale center
+    """
+    try:
+        import onnx
+        from onnx import TensorProto, helper
+    except ImportError:
+        return False
+
+    def const(name, values, dtype=TensorProto.INT64):
+        return helper.make_tensor(name, dtype, [len(values)], values)
+
+    nodes = [
+        helper.make_node('Slice', ['decoder_cont', 'zeros3', 'ends3', 'axis2'], ['dec3']),
+        helper.make_node('ReduceMean', ['encoder_cont'], ['enc_mean'], axes=[1, 2], keepdims=1),
+        helper.make_node('Add', ['dec3', 'enc_mean'], ['summed']),
+        helper.make_node('Add', ['summed', 'bias'], ['shifted']),
+        helper.make_node('Slice', ['target_scale', 'zero1', 'one1', 'axis1'], ['center']),
+        helper.make_node('Unsqueeze', ['center', 'axis2'], ['center3']),
+        helper.make_node('Mul', ['shifted', 'center3'], ['output']),
+    ]
+    inputs = [
+        helper.make_tensor_value_info('encoder_cat', TensorProto.INT64, ['batch', 60, 1]),
+        helper.make_tensor_value_info('encoder_cont', TensorProto.FLOAT, ['batch', 60, 52]),
+        helper.make_tensor_value_info('encoder_lengths', TensorProto.INT64, ['batch']),
+        helper.make_tensor_value_info('decoder_cat', TensorProto.INT64, ['batch', 7, 1]),
+        helper.make_tensor_value_info('decoder_cont', TensorProto.FLOAT, ['batch', 7, 52]),
+        helper.make_tensor_value_info('decoder_lengths', TensorProto.INT64, ['batch']),
+        helper.make_tensor_value_info('target_scale', TensorProto.FLOAT, ['batch', 2]),
+    ]
+    initializers = [
+        const('zeros3', [0]), const('ends3', [3]), const('axis2', [2]),
+        const('zero1', [0]), const('one1', [1]), const('axis1', [1]),
+        helper.make_tensor('bias', TensorProto.FLOAT, [1], [bias]),
+    ]
+    graph = helper.make_graph(
+        nodes, 'tft_test', inputs,
+        [helper.make_tensor_value_info('output', TensorProto.FLOAT, ['batch', 7, 3])],
+        initializer=initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 17)])
+    model.ir_version = 8
+    folder.mkdir(parents=True, exist_ok=True)
+    onnx.save(model, str(folder / name))
+    return True
+
+
+def test_registry_and_concurrent_load():
+    saved = (settings.model_load_mode, settings.local_model_path, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if not _write_model(root / "default", "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+        _write_model(root / "soybean", "60d_20260201.onnx")
+
+        try:
+            settings.model_load_mode = "local"
+            settings.local_model_path = str(root / "default")
+            settings.model_registry = {
+                "soybean": str(root / "soybean"),
+                "wheat": str(root / "wheat"),   # 폴더 없음 → 로드 실패
+            }
+            settings.ort_optimized_model_cache = False
+            settings.model_precision = "fp32"
+
+            loader = ONNXModelLoader()
+            assert loader.get_model_location("corn") == str(root / "default")
+            assert loader.get_model_location("soybean") == str(root / "soybean")
+
+            results = loader.load_all(["corn", "soybean", "wheat"])
+            assert results["corn"] is None and results["soybean"] is None
+            assert isinstance(results["wheat"], FileNotFoundError)
+            assert loader.get_model_path("corn").name == "60d_20260101.onnx"
+            assert loader.get_model_path("soybean").name == "60d_20260201.onnx"
+            assert sorted(loader.sessions) == ["corn", "soybean"]
+        finally:
+            (settings.model_load_mode, settings.local_model_path, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision) = saved
+    print("✅ 품목별 모델 위치 / 동시 로드")
+
+
+if __name__ == "__main__":
+    test_registry_and_concurrent_load()
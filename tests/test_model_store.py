@@ -0,0 +1,347 @@
+"""
+로컬 모델 저장소 / 롤백 테스트 (모델 파일 불필요, 가짜 S3 + onnx 패키지로 작은 그래프 생성)
+
+- 같은 내용의 S3 오브젝트는 품목이 달라도 저장소에 1개 (ETag 기반)
+- 품목별 버전 이력은 최근 max_versions개, 같은 버전은 중복 기록하지 않음
+- 크기 한도 초과 시 오래 안 쓴 버전부터 삭제 (서빙 중인 파일은 유지)
+- 요청이 잡고 있는 이전 버전 묶음의 파일은 교체가 연달아 일어나도 유지 (해제 후 정리)
+- 롤백은 네트워크 없이 저장소 파일로 교체, 롤백된 버전은 자동 업데이트로 다시 올리지 않음
+- 롤백 고정은 저장소에 기록 → 같은 저장소를 쓰는 다른 워커 / 재시작한 워커도 같은 버전으로 맞춤
+- 롤백과 업데이트 확인이 겹쳐도 결과를 공유하지 않고 차례로 실행 (롤백은 항상 모델 묶음 반환)
+
+실행:
+    python tests/test_model_store.py
+"""
+
+import gc
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings
+from app.ml import model_store
+from app.ml.model_loader import ONNXModelLoader
+from app.ml.model_store import ModelStore
+from test_model_registry import _write_model
+from test_s3_download import FakeS3
+
+
+def _version(s3: FakeS3, store: ModelStore, key: str) -> dict:
+    path, result = store.fetch(s3, "bucket", key)
+    return {"onnx_key": key, "onnx_etag": result.etag, "pkl_key": None, "pkl_etag": None}
+
+
+def test_dedupe_and_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "bucket"
+        for commodity in ("corn", "soybean"):
+            (root / commodity).mkdir(parents=True)
+            (root / commodity / "60d_20260101.onnx").write_bytes(b"same" * 500)
+        s3 = FakeS3(root)
+        store = ModelStore(Path(tmp) / "store", max_versions=3)
+
+        corn_path, corn = store.fetch(s3, "bucket", "corn/60d_20260101.onnx")
+        soybean_path, soybean = store.fetch(s3, "bucket", "soybean/60d_20260101.onnx")
+        assert corn_path == soybean_path and corn.etag == soybean.etag
+        assert [p.name for p in (Path(tmp) / "store" / "objects").iterdir()] == [corn_path.name]
+
+        # 같은 key 재요청 → 조건부 GET 304
+        assert store.fetch(s3, "bucket", "corn/60d_20260101.onnx")[1].not_modified
+
+        for day in range(1, 6):
+            key = f"corn/60d_2026010{day}.onnx"
+            (root / key).write_bytes(bytes([day]) * 1000)
+            store.record("corn", _version(s3, store, key))
+        store.record("corn", _version(s3, store, "corn/60d_20260104.onnx"))   # 이미 있는 버전
+        history = store.history("corn")
+        assert [e["onnx_key"] for e in history] == [f"corn/60d_2026010{d}.onnx" for d in (3, 4, 5)]
+        assert all(e["cached"] for e in history)
+    print("✅ 품목 간 중복 제거 / 버전 이력")
+
+
+def test_evict_under_budget():
+    saved_grace = model_store._UNREFERENCED_GRACE_SECONDS
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "bucket"
+        (root / "corn").mkdir(parents=True)
+        s3 = FakeS3(root)
+        store = ModelStore(Path(tmp) / "store", max_versions=5, max_bytes=2500)
+
+        paths = []
+        for day in (1, 2, 3):
+            key = f"corn/60d_2026010{day}.onnx"
+            (root / key).write_bytes(bytes([day]) * 1000)
+            store.record("corn", _version(s3, store, key))
+            paths.append(store.object_path(store.history("corn")[-1]["onnx_etag"], ".onnx"))
+
+        # 가장 오래된 버전은 서빙 중 → 유지, 다음으로 오래 안 쓴 버전 삭제
+        store.touch([paths[2]])
+        removed = store.evict(protected=[paths[0]])
+        assert removed == [paths[1].name]
+        assert paths[0].exists() and not paths[1].exists() and paths[2].exists()
+        assert [e["onnx_key"] for e in store.history("corn")] == ["corn/60d_20260101.onnx", "corn/60d_20260103.onnx"]
+
+        # 이력에 없는 객체는 유예 시간이 지나면 삭제
+        (root / "corn" / "extra.onnx").write_bytes(b"x" * 10)
+        extra, _ = store.fetch(s3, "bucket", "corn/extra.onnx")
+        assert store.evict(protected=paths) == []
+        try:
+            model_store._UNREFERENCED_GRACE_SECONDS = 0
+            assert store.evict(protected=paths) == [extra.name]
+        finally:
+            model_store._UNREFERENCED_GRACE_SECONDS = saved_grace
+    print("✅ 크기 한도 LRU 정리 / 서빙 파일 유지")
+
+
+def _write_distinct_model(folder: Path, name: str) -> bool:
+    """내용(doc_string)이 다른 Relu 모델 저장 (ETag가 버전마다 다르도록)"""
+    if not _write_model(folder, name):
+        return False
+    import onnx
+
+    model = onnx.load(str(folder / name))
+    model.doc_string = name
+    onnx.save(model, str(folder / name))
+    return True
+
+
+def test_rollback_without_network():
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        models = root / "bucket" / "models"
+        if not _write_distinct_model(models, "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        try:
+            settings.model_load_mode = "s3"
+            settings.model_s3_prefix = "models"
+            settings.model_registry = {}
+            settings.ort_optimized_model_cache = False
+            settings.model_precision = "fp32"
+
+            s3 = FakeS3(root / "bucket")
+            loader = ONNXModelLoader()
+            loader._s3_client = s3
+            loader.store = ModelStore(root / "store")
+
+            first = loader.get_model("corn")
+            _write_distinct_model(models, "60d_20260102.onnx")
+            assert loader.check_and_update("corn") is True
+            second = loader.get_model("corn")
+            assert [v["current"] for v in loader.list_versions("corn")] == [True, False]
+
+            # 네트워크 없이 이전 버전으로
+            s3.requests.clear()
+            rolled = loader.rollback("corn")
+            assert s3.requests == []
+            assert loader.get_model("corn") is rolled
+            assert rolled.onnx_key == first.onnx_key and rolled.version == first.version
+            assert [v["current"] for v in loader.list_versions("corn")] == [False, True]
+
+            # 롤백된 버전은 다시 올리지 않고, 더 새 모델이 오면 갱신
+            assert loader.check_and_update("corn") is False
+            _write_distinct_model(models, "60d_20260103.onnx")
+            assert loader.check_and_update("corn") is True
+            assert loader.get_model("corn").onnx_key == "models/60d_20260103.onnx"
+
+            # 버전 지정 롤백 / 없는 버전
+            assert loader.rollback("corn", second.onnx_key).version == second.version
+            try:
+                loader.rollback("corn", "models/60d_19990101.onnx")
+                raise AssertionError("없는 버전은 LookupError")
+            except LookupError:
+                pass
+
+            loader.mode = "local"
+            try:
+                loader.rollback("corn")
+                raise AssertionError("local 모드는 ValueError")
+            except ValueError:
+                pass
+        finally:
+            (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision) = saved
+    print("✅ 네트워크 없는 롤백 / 롤백 버전 고정")
+
+
+def test_rollback_pin_shared_across_workers():
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        models = root / "bucket" / "models"
+        if not _write_distinct_model(models, "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        def worker():
+            loader = ONNXModelLoader()
+            loader._s3_client = FakeS3(root / "bucket")
+            loader.store = ModelStore(root / "store")
+            return loader
+
+        try:
+            settings.model_load_mode = "s3"
+            settings.model_s3_prefix = "models"
+            settings.model_registry = {}
+            settings.ort_optimized_model_cache = False
+            settings.model_precision = "fp32"
+
+            # 같은 저장소를 쓰는 워커 2개
+            a, b = worker(), worker()
+            first = a.get_model("corn")
+            b.get_model("corn")
+            _write_distinct_model(models, "60d_20260102.onnx")
+            assert a.check_and_update("corn") is True
+            assert b.check_and_update("corn") is True
+
+            # 워커 A에서 롤백 → B는 다음 업데이트 확인에서 같은 버전으로 교체
+            assert a.rollback("corn", first.onnx_key).version == first.version
+            assert b.check_and_update("corn") is True
+            assert b.get_model("corn").version == first.version
+            assert b.check_and_update("corn") is False
+
+            # 크기 한도를 넘어도 고정 버전은 정리되지 않고, 재시작한 워커도 고정 버전으로 시작
+            a.store.max_bytes = 1
+            a.store.evict()
+            assert a.store.object_path(first.source_tag, ".onnx").exists()
+            assert worker().get_model("corn").version == first.version
+
+            # 더 새 모델이 올라오면 고정 해제 → 모든 워커가 새 모델로
+            _write_distinct_model(models, "60d_20260103.onnx")
+            assert a.check_and_update("corn") is True
+            assert a.store.pinned("corn") is None
+            assert b.check_and_update("corn") is True
+            assert b.get_model("corn").onnx_key == "models/60d_20260103.onnx"
+        finally:
+            (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision) = saved
+    print("✅ 롤백 고정 워커 간 공유 / 재시작 후 유지")
+
+
+def test_rollback_concurrent_with_update():
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        models = root / "bucket" / "models"
+        if not _write_distinct_model(models, "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        try:
+            settings.model_load_mode = "s3"
+            settings.model_s3_prefix = "models"
+            settings.model_registry = {}
+            settings.ort_optimized_model_cache = False
+            settings.model_precision = "fp32"
+
+            loader = ONNXModelLoader()
+            loader._s3_client = FakeS3(root / "bucket")
+            loader.store = ModelStore(root / "store")
+            first = loader.get_model("corn")
+            _write_distinct_model(models, "60d_20260102.onnx")
+            assert loader.check_and_update("corn") is True
+            second = loader.get_model("corn")
+            _write_distinct_model(models, "60d_20260103.onnx")
+
+            # 업데이트가 워밍업 중일 때 롤백 요청 → 업데이트 교체 후 롤백 실행
+            warming, release = threading.Event(), threading.Event()
+
+            def slow_prepare(model):
+                warming.set()
+                assert release.wait(10)
+
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                update = pool.submit(loader.check_and_update, "corn", slow_prepare)
+                assert warming.wait(10)
+                rollback = pool.submit(loader.rollback, "corn", first.onnx_key)
+                release.set()
+                assert update.result() is True
+                rolled = rollback.result()
+            assert rolled.version == first.version
+            assert loader.get_model("corn") is rolled
+            # 롤백으로 내린 최신 버전은 다시 올리지 않음
+            assert loader.check_and_update("corn") is False
+
+            # 서로 다른 버전으로의 동시 롤백은 각자 결과
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                results = list(pool.map(
+                    lambda key: loader.rollback("corn", key), [second.onnx_key, first.onnx_key]
+                ))
+            assert [m.version for m in results] == [second.version, first.version]
+        finally:
+            (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision) = saved
+    print("✅ 롤백 + 업데이트 확인 동시 실행")
+
+
+def test_live_bundles_keep_files():
+    saved = (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.ort_optimized_cache_dir,
+             settings.model_precision, model_store._UNREFERENCED_GRACE_SECONDS)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        models = root / "bucket" / "models"
+        if not _write_distinct_model(models, "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        try:
+            settings.model_load_mode = "s3"
+            settings.model_s3_prefix = "models"
+            settings.model_registry = {}
+            settings.ort_optimized_model_cache = True
+            settings.ort_optimized_cache_dir = str(root / "optimized")
+            settings.model_precision = "fp32"
+            model_store._UNREFERENCED_GRACE_SECONDS = 0
+
+            loader = ONNXModelLoader()
+            loader._s3_client = FakeS3(root / "bucket")
+            loader.store = ModelStore(root / "store", max_versions=1)
+
+            # 최적화 캐시 파일도 묶음 파일에 포함
+            held = loader.get_model("corn")
+            optimized = [p for p in held.files if p.parent == root / "optimized"]
+            assert len(optimized) == 1 and optimized[0].exists()
+
+            # 연달아 두 번 교체 (이력은 1개만 유지) → 요청이 잡고 있는 첫 버전 파일은 유지
+            for day in (2, 3):
+                _write_distinct_model(models, f"60d_2026010{day}.onnx")
+                assert loader.check_and_update("corn") is True
+            assert held.model_path.exists()
+            assert held.session.run(None, {"x": np.ones((1, 3), dtype=np.float32)}) is not None
+
+            # 요청이 끝나 묶음이 해제되면 다음 정리에서 삭제
+            first_path = held.model_path
+            del held
+            gc.collect()
+            _write_distinct_model(models, "60d_20260104.onnx")
+            assert loader.check_and_update("corn") is True
+            assert not first_path.exists()
+            assert loader.get_model("corn").model_path.exists()
+        finally:
+            (settings.model_load_mode, settings.model_s3_prefix, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.ort_optimized_cache_dir,
+             settings.model_precision, model_store._UNREFERENCED_GRACE_SECONDS) = saved
+    print("✅ 살아 있는 이전 버전 묶음 파일 유지 / 해제 후 정리")
+
+
+if __name__ == "__main__":
+    test_dedupe_and_history()
+    test_evict_under_budget()
+    test_rollback_without_network()
+    test_rollback_pin_shared_across_workers()
+    test_rollback_concurrent_with_update()
+    test_live_bundles_keep_files()
@@ -0,0 +1,135 @@
+"""
+S3 최신 모델 감지 테스트 (모델 파일 / S3 불필요, 가짜 S3 클라이언트)
+
+- list_after: 처음 1번만 전체 나열, 이후에는 마지막 키 이후만 좁게 나열 (StartAfter)
+- manifest: 포인터 파일 조건부 GET (변경 없으면 304, 나열 없음)
+- 포인터 파일이 없거나 형식이 틀리면 나열로 대신 확인, 주기적으로 전체 나열
+
+실행:
+    python tests/test_model_update_detection.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings
+from app.ml.model_loader import ONNXModelLoader
+from test_s3_download import FakeS3
+
+
+def _bucket(tmp: str, days=range(1, 6)) -> FakeS3:
+    root = Path(tmp) / "bucket"
+    (root / "models").mkdir(parents=True)
+    for day in days:
+        _upload(root, day)
+    return FakeS3(root)
+
+
+def _upload(root: Path, day: int) -> None:
+    (root / "models" / f"60d_202601{day:02d}.onnx").write_bytes(b"onnx")
+    (root / "models" / f"60d_preprocessing_202601{day:02d}.pkl").write_bytes(b"pkl")
+
+
+def _loader(s3: FakeS3) -> ONNXModelLoader:
+    loader = ONNXModelLoader()
+    loader.mode = "s3"
+    loader._s3_client = s3
+    return loader
+
+
+def _with_settings(detection: str, test) -> None:
+    saved = (settings.model_s3_prefix, settings.model_registry,
+             settings.model_update_detection, settings.model_update_full_scan_hours)
+    try:
+        settings.model_s3_prefix = "models"
+        settings.model_registry = {}
+        settings.model_update_detection = detection
+        settings.model_update_full_scan_hours = 24
+        test()
+    finally:
+        (settings.model_s3_prefix, settings.model_registry,
+         settings.model_update_detection, settings.model_update_full_scan_hours) = saved
+
+
+def test_list_after_latest_key():
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            s3 = _bucket(tmp)
+            loader = _loader(s3)
+
+            # 처음: 전체 나열
+            assert loader._find_latest_s3_keys(s3, "b", "corn") == (
+                "models/60d_20260105.onnx", "models/60d_preprocessing_20260105.pkl"
+            )
+            assert s3.listings == [("models/", None)]
+
+            # 변경 없음: ONNX 형식만, 마지막 키 이후만 나열 (결과 0건)
+            s3.listings.clear()
+            assert loader._find_latest_s3_keys(s3, "b", "corn")[0] == "models/60d_20260105.onnx"
+            assert s3.listings == [("models/60d_2", "models/60d_20260105.onnx")]
+
+            # 새 모델: PKL도 마지막 키 이후만
+            _upload(s3.root, 6)
+            s3.listings.clear()
+            assert loader._find_latest_s3_keys(s3, "b", "corn") == (
+                "models/60d_20260106.onnx", "models/60d_preprocessing_20260106.pkl"
+            )
+            assert s3.listings == [
+                ("models/60d_2", "models/60d_20260105.onnx"),
+                ("models/60d_preprocessing_2", "models/60d_preprocessing_20260105.pkl"),
+            ]
+
+            # 전체 나열 주기가 지나면 다시 전체 나열
+            loader._last_full_scan["corn"] -= 25 * 3600
+            s3.listings.clear()
+            loader._find_latest_s3_keys(s3, "b", "corn")
+            assert s3.listings == [("models/", None)]
+    _with_settings("list_after", run)
+    print("✅ 마지막 키 이후만 나열 (StartAfter)")
+
+
+def test_manifest_conditional_get():
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            s3 = _bucket(tmp)
+            manifest = s3.root / "models" / "latest.json"
+            manifest.write_text(json.dumps(
+                {"onnx": "60d_20260104.onnx", "pkl": "60d_preprocessing_20260104.pkl"}
+            ))
+            loader = _loader(s3)
+
+            expected = ("models/60d_20260104.onnx", "models/60d_preprocessing_20260104.pkl")
+            assert loader._find_latest_s3_keys(s3, "b", "corn") == expected
+            assert s3.listings == []
+
+            # 변경 없음 → 304, 나열 없음
+            s3.requests.clear()
+            assert loader._find_latest_s3_keys(s3, "b", "corn") == expected
+            etag = loader._manifests["corn"][0]
+            assert s3.requests == [("models/latest.json", None, etag)] and s3.listings == []
+
+            # 포인터 갱신 (전체 키도 허용)
+            manifest.write_text(json.dumps({"onnx": "models/60d_20260105.onnx"}))
+            assert loader._find_latest_s3_keys(s3, "b", "corn") == ("models/60d_20260105.onnx", None)
+
+            # 형식 오류 / 포인터 없음 → 기억한 키 이후 나열로 확인
+            manifest.write_text("not json")
+            assert loader._find_latest_s3_keys(s3, "b", "corn")[0] == "models/60d_20260105.onnx"
+            manifest.unlink()
+            _upload(s3.root, 6)
+            s3.listings.clear()
+            assert loader._find_latest_s3_keys(s3, "b", "corn")[0] == "models/60d_20260106.onnx"
+            assert s3.listings[0] == ("models/60d_2", "models/60d_20260105.onnx")
+    _with_settings("manifest", run)
+    print("✅ 포인터 파일 조건부 GET / 없으면 나열로 확인")
+
+
+if __name__ == "__main__":
+    test_list_after_latest_key()
+    test_manifest_conditional_get()
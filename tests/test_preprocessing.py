@@ -0,0 +1,134 @@
+"""
+전처리 엔진 테스트 (모델 파일 불필요)
+
+- pkl 스케일러 → [B, T, F] broadcast 정규화 (스케일러 없는 컬럼 / 디코더 패딩 유지)
+- target_scale: 고정 normalizer / 실제 윈도우 평균·표준편차 ({'method': 'window'} / EncoderNormalizer)
+- {target}_center / {target}_scale static feature
+- target normalizer가 없는 pkl은 기존 출력 그대로 (target_scale (450, 10), close_center / close_scale 유지)
+
+실행:
+    python tests/test_preprocessing.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.feature_layout import build_layout
+from app.ml.prediction_service import ONNXPredictionService
+from app.ml.preprocessing import build_preprocessor
+
+ORDER = ['close', 'USD_Index', 'pdsi', 'time_idx', 'encoder_length', 'close_center', 'close_scale']
+
+
+def _historical_data(n=10):
+    return {
+        'dates': [],
+        'features': {
+            'close': list(400.0 + np.arange(n, dtype=float)),
+            'USD_Index': [100.0] * n,
+            'pdsi': [-1.0] * n,
+        },
+    }
+
+
+def _info(**extra):
+    info = {
+        'feature_order': ORDER,
+        'max_encoder_length': 10,
+        'max_prediction_length': 3,
+        'scalers': {
+            'USD_Index': SimpleNamespace(mean_=np.array([95.0]), scale_=np.array([2.5])),
+            'encoder_length': (5.0, 5.0),
+        },
+    }
+    info.update(extra)
+    return info
+
+
+def test_window_target_scale_and_scaling():
+    info = _info(target_normalizer={'method': 'window'})
+    layout = build_layout(info)
+    preprocessor = build_preprocessor(info, layout)
+    assert preprocessor.fixed_target_scale is None and preprocessor.window_target_scale
+    assert preprocessor.scaled_features == ['USD_Index', 'encoder_length']
+
+    service = ONNXPredictionService()
+    data = _historical_data()
+    inputs = service._prepare_batch_inputs(
+        data, [None, {'USD_Index': 105.0}], layout=layout, preprocessor=preprocessor
+    )
+    encoder, decoder = inputs['encoder_cont'], inputs['decoder_cont']
+
+    close = np.asarray(data['features']['close'])
+    expected_target = np.float32([close.mean(), close.std()])
+    np.testing.assert_allclose(inputs['target_scale'], [expected_target] * 2, rtol=1e-6)
+
+    np.testing.assert_allclose(encoder[0, :, 1], (100.0 - 95.0) / 2.5)   # USD_Index 정규화
+    np.testing.assert_allclose(encoder[1, :, 1], (105.0 - 95.0) / 2.5)   # override도 같은 스케일
+    np.testing.assert_array_equal(encoder[0, :, 0], close.astype(np.float32))  # 스케일러 없음 → raw
+    np.testing.assert_allclose(encoder[0, :, 4], 1.0)                     # (10 - 5) / 5
+    np.testing.assert_allclose(encoder[0, :, 5], expected_target[0], rtol=1e-6)
+    np.testing.assert_allclose(decoder[0, :, 6], expected_target[1], rtol=1e-6)
+    assert decoder[0, :, 1].tolist() == [0.0] * 3                         # 디코더 관측 feature는 0 유지
+    print("✅ 윈도우 기준 target_scale + broadcast 정규화")
+
+
+def test_fixed_target_normalizer():
+    info = _info(target_normalizer=SimpleNamespace(center_=420.0, scale_=15.0))
+    layout = build_layout(info)
+    preprocessor = build_preprocessor(info, layout)
+    assert preprocessor.fixed_target_scale == (420.0, 15.0)
+    np.testing.assert_array_equal(
+        preprocessor.target_scale(_historical_data()['features']), [[420.0, 15.0]]
+    )
+
+    window_info = _info(target_normalizer={'method': 'window'})
+    assert build_preprocessor(window_info, build_layout(window_info)).fixed_target_scale is None
+    print("✅ 고정 target normalizer")
+
+
+def test_no_target_normalizer_keeps_baseline():
+    """target normalizer가 없으면 전처리 엔진이 없을 때(기존)와 같은 target_scale / static feature"""
+    service = ONNXPredictionService()
+    data = _historical_data()
+    scenarios = [None, {'USD_Index': 105.0}, {'close': 380.0}]
+
+    # 스케일러도 없는 pkl → 모든 입력이 기존 출력과 동일
+    info = _info(scalers={})
+    layout = build_layout(info)
+    preprocessor = build_preprocessor(info, layout)
+    assert preprocessor.fixed_target_scale is None and not preprocessor.window_target_scale
+    baseline = service._prepare_batch_inputs(data, scenarios, layout=layout)
+    inputs = service._prepare_batch_inputs(data, scenarios, layout=layout, preprocessor=preprocessor)
+    assert set(inputs) == set(baseline)
+    for name in baseline:
+        np.testing.assert_array_equal(inputs[name], baseline[name], err_msg=name)
+    np.testing.assert_array_equal(inputs['target_scale'], [[450.0, 10.0]] * 3)
+
+    # 스케일러만 있는 pkl → 스케일러 컬럼 외에는 기존 값 (close_center / close_scale 덮어쓰지 않음)
+    info = _info()
+    layout = build_layout(info)
+    inputs = service._prepare_batch_inputs(
+        data, scenarios, layout=layout, preprocessor=build_preprocessor(info, layout)
+    )
+    np.testing.assert_array_equal(inputs['target_scale'], baseline['target_scale'])
+    for column in (0, 5, 6):   # close, close_center, close_scale
+        np.testing.assert_array_equal(
+            inputs['encoder_cont'][:, :, column], baseline['encoder_cont'][:, :, column]
+        )
+        np.testing.assert_array_equal(
+            inputs['decoder_cont'][:, :, column], baseline['decoder_cont'][:, :, column]
+        )
+    print("✅ target normalizer 없는 pkl = 기존 출력")
+
+
+if __name__ == "__main__":
+    test_window_target_scale_and_scaling()
+    test_fixed_target_normalizer()
+    test_no_target_normalizer_keeps_baseline()
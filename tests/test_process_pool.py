@@ -0,0 +1,156 @@
+"""
+프로세스 풀 추론 백엔드 테스트 (모델 파일 불필요, onnx 패키지로 작은 TFT 형태 그래프 생성)
+
+- 과거 데이터 윈도우 → 공유 메모리 블록 → feature 뷰 왕복 시 값 보존
+- 공유 메모리 블록은 요청마다 만들지 않고 재사용 (더 큰 윈도우면 교체 후 unlink)
+- 워커에서 만든 텐서 / 추론 / 파싱 결과 == API 프로세스 내 결과
+- 여러 품목 동시 워밍업 시 모든 워커에 각 모델이 올라감
+- spawn 워커의 캐시 파일(최적화 / INT8)은 테스트 임시 폴더에만 생성 (저장소의 ./models_cache 사용 안 함)
+
+실행:
+    python tests/test_process_pool.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.ml.feature_layout import build_layout
+from app.ml.model_loader import LoadedModel
+from app.ml.prediction_service import ONNXPredictionService
+from app.ml.preprocessing import build_preprocessor
+from app.ml.process_pool import ProcessInferencePool, _BlockPool, _attach_window, _pack_window, _window_nbytes
+from test_model_registry import _write_tft_model
+from test_tensor_builder import create_mock_historical_data
+
+
+def test_window_roundtrip_and_block_reuse():
+    """feature별 길이가 달라도 그대로 복원되고, 블록은 재사용되는지"""
+    features = {"close": [450.0, 451.5, 452.0], "pdsi": [0.5, -1.0], "missing": None}
+    pool = _BlockPool()
+
+    block = pool.acquire(_window_nbytes(features))
+    layout = _pack_window(block.buf, features)
+    attached = shared_memory.SharedMemory(name=block.name)
+    restored = _attach_window(attached.buf, layout)
+    assert list(restored) == ["close", "pdsi"]
+    assert restored["close"].tolist() == features["close"] and restored["pdsi"].tolist() == features["pdsi"]
+    del restored
+    attached.close()
+
+    # 반납한 블록 재사용
+    pool.release(block)
+    again = pool.acquire(16)
+    assert again.name == block.name
+
+    # 더 큰 윈도우 → 새 블록, 작은 블록은 unlink
+    pool.release(again)
+    bigger = pool.acquire(again.size + 1)
+    assert bigger.name != block.name
+    try:
+        shared_memory.SharedMemory(name=block.name)
+        raise AssertionError("교체된 블록이 남아 있습니다")
+    except FileNotFoundError:
+        pass
+    pool.release(bigger)
+    pool.close()
+    print("✅ 윈도우 공유 메모리 왕복 / 블록 재사용")
+
+
+@contextmanager
+def worker_cache_env(root: Path):
+    """
+    spawn 워커가 쓰는 캐시 폴더를 임시 폴더로 (워커는 환경 변수로 설정을 새로 읽음)
+
+    프로세스 내 settings만 바꾸면 워커는 기본값 ./models_cache에 파일을 남긴다.
+    """
+    overrides = {
+        "ORT_OPTIMIZED_MODEL_CACHE": "true",
+        "ORT_OPTIMIZED_CACHE_DIR": str(root / "optimized"),
+        "INT8_CACHE_DIR": str(root / "quantized"),
+        "MODEL_STORE_DIR": str(root / "store"),
+    }
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _model(path: Path, commodity: str) -> LoadedModel:
+    session = ort.InferenceSession(str(path), providers=['CPUExecutionProvider'])
+    layout = build_layout({}, session)
+    return LoadedModel(
+        commodity=commodity, session=session, model_path=path, source_tag="1",
+        onnx_key=str(path), layout=layout, preprocessor=build_preprocessor({}, layout),
+    )
+
+
+def test_worker_inference_matches_in_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if not _write_tft_model(root, "corn.onnx", bias=1.0):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+        _write_tft_model(root, "soybean.onnx", bias=2.0)
+        models = {c: _model(root / f"{c}.onnx", c) for c in ("corn", "soybean")}
+
+        service = ONNXPredictionService(inference_backend="thread")
+        with worker_cache_env(root / "cache"):
+            _check_worker_inference(service, models)
+        # 워커의 최적화 모델 캐시는 임시 폴더에
+        assert len(list((root / "cache" / "optimized").glob("*.opt.onnx"))) == 2
+    print("✅ 워커 텐서 생성 / 추론 == 프로세스 내 결과, 동시 워밍업")
+
+
+def _check_worker_inference(service: ONNXPredictionService, models) -> None:
+    pool = ProcessInferencePool(max_workers=2)
+    try:
+        # 품목 동시 워밍업 → 워밍업끼리 섞이지 않고 모두 성공
+        dummy = {'dates': [], 'features': {}}
+        results = {}
+        threads = [
+            threading.Thread(target=lambda c=c: results.__setitem__(
+                c, pool.warm_up(service._model_ref(models[c]), dummy, [None, None])
+            ))
+            for c in models
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {"corn": True, "soybean": True}
+
+        data = create_mock_historical_data(60, seed=1)
+        scenarios = [None, {"close": 400.0}, {"USD_Index": 110.0}]
+        for commodity, model in models.items():
+            expected = service._infer(model, data, scenarios)
+            actual = pool.infer(service._model_ref(model), data, scenarios)
+            assert len(actual) == len(expected)
+            for a, e in zip(actual, expected):
+                for key in ("predictions", "lower_bounds", "upper_bounds"):
+                    assert np.allclose(a[key], e[key], rtol=1e-5), (commodity, key)
+        assert pool.stats()["completed"] == 2
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_window_roundtrip_and_block_reuse()
+    test_worker_inference_matches_in_process()
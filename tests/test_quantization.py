@@ -0,0 +1,111 @@
+"""
+INT8 양자화 정확도 검증 테스트 (모델 파일 불필요)
+
+- FP32 / INT8 출력 상대 오차 계산 (중앙값 / 분위수 분리)
+- 임계값 초과 시 INT8 거부
+- INT8 캐시 정리: 유지 대상 모델과 그 검증 기록만 남김
+
+실행:
+    python tests/test_quantization.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.ml.quantization import compare_outputs, prune_quantized_models, quantized_model_path
+
+
+class _FakeSession:
+    """입력과 무관하게 고정 출력 [B, 7, 3]을 돌려주는 세션"""
+
+    def __init__(self, output: np.ndarray):
+        self.output = output
+
+    def get_inputs(self):
+        return [SimpleNamespace(name='encoder_cont', shape=['batch', 60, 52])]
+
+    def run(self, output_names, model_inputs):
+        return [self.output]
+
+
+def _windows(samples: int = 4):
+    return {'encoder_cont': np.zeros((samples, 60, 52), dtype=np.float32)}
+
+
+def _fp32_output(samples: int = 4) -> np.ndarray:
+    median = np.full((samples, 7, 1), 100.0, dtype=np.float32)
+    return np.concatenate([median, median - 5, median + 5], axis=2)
+
+
+def test_drift_within_threshold():
+    fp32 = _fp32_output()
+    int8 = fp32.copy()
+    int8[..., 0] *= 1.002    # 중앙값 0.2%
+    int8[..., 2] *= 1.005    # 상한 0.5%
+
+    report = compare_outputs(
+        _FakeSession(fp32), _FakeSession(int8), _windows(),
+        max_median_drift_pct=0.5, max_quantile_drift_pct=1.0,
+    )
+    assert report.passed, report.reason
+    assert abs(report.median_drift_pct - 0.2) < 1e-3
+    assert abs(report.quantile_drift_pct - 0.5) < 1e-3
+    assert report.samples == 4
+    print("✅ 임계값 이하 오차 → INT8 허용")
+
+
+def test_drift_above_threshold_is_refused():
+    fp32 = _fp32_output()
+    int8 = fp32.copy()
+    int8[1, 3, 1] *= 0.97    # 한 윈도우의 하한만 3% 벗어남
+
+    report = compare_outputs(
+        _FakeSession(fp32), _FakeSession(int8), _windows(),
+        max_median_drift_pct=0.5, max_quantile_drift_pct=1.0,
+    )
+    assert not report.passed
+    assert report.median_drift_pct == 0.0
+    assert abs(report.quantile_drift_pct - 3.0) < 1e-3
+    assert "분위수" in report.reason and "중앙값" not in report.reason
+    print("✅ 분위수 오차 초과 → INT8 거부")
+
+
+def test_prune_keeps_known_versions():
+    saved = settings.int8_cache_dir
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            settings.int8_cache_dir = tmp
+            known = quantized_model_path("objects/etag-1.onnx", "etag-1")
+            live = quantized_model_path("objects/etag-2.onnx", "etag-2")
+            stale = quantized_model_path("objects/gone.onnx", "gone")
+            # 검증 실패 기록만 남은 버전 (INT8 모델은 이미 삭제됨)
+            failed_report = quantized_model_path("objects/etag-3.onnx", "etag-3").with_suffix(".json")
+            for path in (known, live, stale):
+                path.write_bytes(b"x")
+                path.with_suffix(".json").write_text("{}")
+            failed_report.write_text("{}")
+            other = Path(tmp) / "validation_windows.npz"
+            other.write_bytes(b"x")
+
+            removed = prune_quantized_models(keep=[known, live, Path("objects/etag-2.onnx")])
+            assert sorted(removed) == sorted([stale.name, stale.with_suffix(".json").name, failed_report.name])
+            for path in (known, live):
+                assert path.exists() and path.with_suffix(".json").exists()
+            assert other.exists()
+        finally:
+            settings.int8_cache_dir = saved
+    print("✅ INT8 캐시 정리 (유지 대상 + 검증 기록)")
+
+
+if __name__ == "__main__":
+    test_drift_within_threshold()
+    test_drift_above_threshold_is_refused()
+    test_prune_keeps_known_versions()
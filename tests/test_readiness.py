@@ -0,0 +1,104 @@
+"""
+/ready 준비 상태 테스트 (모델 파일 / DB 불필요, onnx 패키지로 작은 TFT 형태 그래프 생성)
+
+- 워밍업 전에는 503, 모든 품목 워밍업 후 200 (준비된 품목 목록 포함)
+- 모델 로드 실패 / 더미 추론 실패 시 준비되지 않은 상태 유지 (503)
+
+실행:
+    python tests/test_readiness.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import datatable
+from app.config import settings
+from app.ml import prediction_service
+from app.ml.model_loader import ONNXModelLoader
+from app.ml.prediction_service import ONNXPredictionService
+from test_model_registry import _write_model, _write_tft_model
+
+
+def _import_main():
+    """main 모듈 import (테이블 생성은 건너뜀 - 테스트 DB에는 market 테이블이 필요 없음)"""
+    create_all = datatable.Base.metadata.create_all
+    datatable.Base.metadata.create_all = lambda **kwargs: None
+    try:
+        import main
+    finally:
+        datatable.Base.metadata.create_all = create_all
+    return main
+
+
+def _check_ready(folders, expected_status, expected_warm) -> None:
+    """품목별 모델 폴더로 서비스를 만들어 워밍업 전후 /ready 확인"""
+    saved = (settings.model_load_mode, settings.model_commodities, settings.model_registry,
+             settings.ort_optimized_model_cache, settings.model_precision, settings.micro_batch_enabled,
+             prediction_service._prediction_service)
+    try:
+        settings.model_load_mode = "local"
+        settings.model_commodities = list(folders)
+        settings.model_registry = {commodity: str(folder) for commodity, folder in folders.items()}
+        settings.ort_optimized_model_cache = False
+        settings.model_precision = "fp32"
+        settings.micro_batch_enabled = False
+
+        service = ONNXPredictionService(inference_backend="thread")
+        service.model_loader = ONNXModelLoader()
+        prediction_service._prediction_service = service
+        # lifespan 없이 (워밍업을 직접 호출)
+        client = TestClient(_import_main().app)
+
+        response = client.get("/ready")
+        assert response.status_code == 503, response.json()
+
+        assert service.warm_up() is (expected_status == 200)
+        response = client.get("/ready")
+        assert response.status_code == expected_status, response.json()
+        assert service.warm_commodities == expected_warm
+        if expected_status == 200:
+            assert response.json() == {"status": "ready", "commodities": expected_warm}
+    finally:
+        (settings.model_load_mode, settings.model_commodities, settings.model_registry,
+         settings.ort_optimized_model_cache, settings.model_precision, settings.micro_batch_enabled,
+         prediction_service._prediction_service) = saved
+
+
+def test_ready_after_warm_up():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if not _write_tft_model(root / "corn", "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+        _write_tft_model(root / "soybean", "60d_20260101.onnx", bias=1.0)
+        _check_ready({"corn": root / "corn", "soybean": root / "soybean"}, 200, ["corn", "soybean"])
+    print("✅ 워밍업 전 503 → 후 200")
+
+
+def test_failed_warm_up_stays_not_ready():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if not _write_tft_model(root / "corn", "60d_20260101.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        # 모델 파일 없음 → 로드 실패
+        (root / "missing").mkdir()
+        _check_ready({"corn": root / "corn", "soybean": root / "missing"}, 503, ["corn"])
+
+        # 로드는 되지만 TFT 입력을 받지 않는 모델 → 더미 추론 실패
+        _write_model(root / "broken", "60d_20260101.onnx")
+        _check_ready({"corn": root / "corn", "wheat": root / "broken"}, 503, ["corn"])
+    print("✅ 워밍업 실패 시 503 유지")
+
+
+if __name__ == "__main__":
+    test_ready_after_warm_up()
+    test_failed_warm_up_stays_not_ready()
@@ -0,0 +1,286 @@
+"""
+S3 모델 파일 다운로드 테스트 (모델 파일 / S3 불필요, 로컬 폴더를 버킷처럼 쓰는 가짜 클라이언트)
+
+- 병렬 범위 GET으로 받은 파일이 원본과 같고 HEAD 없이 ETag(MD5) 검증
+- 조건부 GET: 같은 ETag면 304 (재시작 후에도 마커로 판단)
+- 중단된 다운로드는 남은 조각만 이어받기
+- 게시된 SHA-256 / 멀티파트 ETag 검증, 불일치 시 IntegrityError (최종 경로에 파일 없음)
+- 멀티파트 업로드 조각 크기를 알 수 없으면 크기만 확인 (실패 대신 경고)
+- SSE-KMS 오브젝트는 ETag 대신 S3 ChecksumSHA256, 체크섬이 없으면 크기로 확인
+- 멀티파트 조각 크기 후보는 파일 한 번 읽기로 함께 계산
+
+실행:
+    python tests/test_s3_download.py
+"""
+
+import base64
+import hashlib
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml import s3_download
+from app.ml.s3_download import IntegrityError, MiB, _multipart_etag_matches, download_object, read_etag
+
+
+class FakeClientError(Exception):
+    """botocore ClientError처럼 response['Error']['Code']를 갖는 예외"""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class _Body:
+    def __init__(self, data, fail=False):
+        self.data, self.pos, self.fail = data, 0, fail
+
+    def read(self, size=-1):
+        if self.fail and self.pos >= len(self.data) // 2:
+            raise ConnectionError("connection reset")
+        end = len(self.data) if size < 0 else self.pos + size
+        if self.fail:
+            end = min(end, len(self.data) // 2)
+        chunk = self.data[self.pos:end]
+        self.pos += len(chunk)
+        return chunk
+
+    def close(self):
+        pass
+
+
+class FakeS3:
+    """
+    로컬 폴더를 버킷처럼 보여주는 S3 클라이언트
+
+    - get_object: Range / IfNoneMatch(304) / IfMatch(412) 지원, ETag = MD5
+    - paginate: Prefix / StartAfter 지원, 나열 요청은 listings에 기록
+    - fail_ranges: 이 시작 오프셋 조각은 본문 절반에서 연결 끊김
+    - etags: {key: 강제 ETag} (멀티파트 ETag 흉내)
+    - encryption: {key: ServerSideEncryption} / checksums: {key: ChecksumSHA256 (head_object)}
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.requests = []
+        self.listings = []
+        self.fail_ranges = set()
+        self.etags = {}
+        self.encryption = {}
+        self.checksums = {}
+
+    def get_paginator(self, name):
+        return self
+
+    def paginate(self, Bucket, Prefix, StartAfter=""):
+        self.listings.append((Prefix, StartAfter or None))
+        keys = sorted(str(p.relative_to(self.root)) for p in self.root.rglob("*") if p.is_file())
+        return [{"Contents": [{"Key": key} for key in keys if key.startswith(Prefix) and key > StartAfter]}]
+
+    def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None, IfMatch=None):
+        path = self.root / Key
+        if not path.exists():
+            raise FakeClientError("NoSuchKey")
+        data = path.read_bytes()
+        etag = self.etags.get(Key) or f'"{hashlib.md5(data).hexdigest()}"'
+        self.requests.append((Key, Range, IfNoneMatch))
+        if IfNoneMatch == etag:
+            raise FakeClientError("304")
+        if IfMatch is not None and IfMatch != etag:
+            raise FakeClientError("PreconditionFailed")
+
+        response = {"ETag": etag, "ContentLength": len(data)}
+        if Key in self.encryption:
+            response["ServerSideEncryption"] = self.encryption[Key]
+        start = 0
+        if Range:
+            start, end = (int(x) for x in Range[len("bytes="):].split("-"))
+            if start >= len(data):
+                raise FakeClientError("InvalidRange")
+            end = min(end, len(data) - 1)
+            response["ContentRange"] = f"bytes {start}-{end}/{len(data)}"
+            data = data[start:end + 1]
+            response["ContentLength"] = len(data)
+        response["Body"] = _Body(data, fail=start in self.fail_ranges)
+        return response
+
+    def head_object(self, Bucket, Key, IfMatch=None, ChecksumMode=None):
+        response = self.get_object(Bucket, Key, IfMatch=IfMatch)
+        response.pop("Body")
+        if ChecksumMode == "ENABLED" and Key in self.checksums:
+            response["ChecksumSHA256"] = self.checksums[Key]
+        return response
+
+
+def _bucket(tmp: str, size: int = 10_000) -> FakeS3:
+    root = Path(tmp) / "bucket"
+    (root / "models").mkdir(parents=True)
+    (root / "models" / "60d_20260101.onnx").write_bytes(bytes(i % 251 for i in range(size)))
+    return FakeS3(root)
+
+
+def test_ranged_download_and_conditional_get():
+    with tempfile.TemporaryDirectory() as tmp:
+        s3 = _bucket(tmp)
+        target = Path(tmp) / "cache" / "60d_20260101.onnx"
+        target.parent.mkdir()
+        source = s3.root / "models" / "60d_20260101.onnx"
+
+        result = download_object(s3, "b", "models/60d_20260101.onnx", target, part_size=1000, workers=4)
+        assert target.read_bytes() == source.read_bytes()
+        assert (result.size, result.downloaded, result.verified) == (10_000, 10_000, "etag")
+        ranged = [r for r in s3.requests if not r[0].endswith(".sha256")]
+        assert len(ranged) == 10 and all(r[1] for r in ranged)
+        assert read_etag(target) == result.etag
+        assert sorted(p.name for p in target.parent.iterdir() if not p.name.endswith(".lock")) == [
+            ".60d_20260101.onnx.etag", "60d_20260101.onnx"
+        ]
+
+        # 같은 ETag → 304 (메모리 캐시 없이 마커로 판단)
+        s3.requests.clear()
+        again = download_object(s3, "b", "models/60d_20260101.onnx", target, part_size=1000)
+        assert again.not_modified and again.etag == result.etag
+        assert s3.requests == [("models/60d_20260101.onnx", "bytes=0-999", result.etag)]
+    print("✅ 병렬 범위 GET / 조건부 GET")
+
+
+def test_resume_after_interruption():
+    with tempfile.TemporaryDirectory() as tmp:
+        s3 = _bucket(tmp)
+        target = Path(tmp) / "60d_20260101.onnx"
+        s3.fail_ranges = {5000}
+        try:
+            download_object(s3, "b", "models/60d_20260101.onnx", target, part_size=1000, workers=1)
+            raise AssertionError("조각 실패가 전파되어야 함")
+        except ConnectionError:
+            pass
+        assert not target.exists()
+        state = json.loads(next(Path(tmp).glob(".60d_20260101.onnx.*.part.json")).read_text())
+        assert 0 in state["done"] and 5 not in state["done"]
+
+        s3.fail_ranges = set()
+        result = download_object(s3, "b", "models/60d_20260101.onnx", target, part_size=1000, workers=1)
+        assert target.read_bytes() == (s3.root / "models" / "60d_20260101.onnx").read_bytes()
+        assert result.downloaded == 10_000 - 1000 * len(state["done"])   # 완료 조각은 다시 받지 않음
+        assert not any(p.name.endswith((".part", ".json")) for p in Path(tmp).iterdir())
+    print("✅ 중단 후 남은 조각만 이어받기")
+
+
+def test_integrity_checks():
+    with tempfile.TemporaryDirectory() as tmp:
+        s3 = _bucket(tmp, size=3 * MiB)
+        key = "models/60d_20260101.onnx"
+        data = (s3.root / key).read_bytes()
+        target = Path(tmp) / "60d_20260101.onnx"
+
+        # 게시된 SHA-256 불일치 → IntegrityError, 최종 파일 없음
+        (s3.root / (key + ".sha256")).write_text("0" * 64 + "  60d_20260101.onnx\n")
+        try:
+            download_object(s3, "b", key, target, part_size=MiB)
+            raise AssertionError("체크섬 불일치가 전파되어야 함")
+        except IntegrityError:
+            pass
+        assert not target.exists()
+
+        (s3.root / (key + ".sha256")).write_text(hashlib.sha256(data).hexdigest())
+        assert download_object(s3, "b", key, target, part_size=MiB).verified == "sha256"
+
+        # 멀티파트 ETag (1MiB 조각 3개로 업로드된 것처럼)
+        (s3.root / (key + ".sha256")).unlink()
+        target.unlink()
+        combined = hashlib.md5(b"".join(
+            hashlib.md5(data[i:i + MiB]).digest() for i in range(0, len(data), MiB)
+        ))
+        s3.etags[key] = f'"{combined.hexdigest()}-3"'
+        assert download_object(s3, "b", key, target, part_size=MiB).verified == "etag"
+
+        # 일치하는 조각 크기 후보 없음 → 실패 대신 크기만 확인
+        s3.etags[key] = f'"{"0" * 32}-3"'
+        target.unlink()
+        result = download_object(s3, "b", key, target, part_size=MiB)
+        assert result.verified == "size" and target.read_bytes() == data
+
+        # 단일 파트 ETag(MD5) 불일치 → IntegrityError
+        s3.etags[key] = f'"{"0" * 32}"'
+        target.unlink()
+        try:
+            download_object(s3, "b", key, target, part_size=MiB)
+            raise AssertionError("ETag 불일치가 전파되어야 함")
+        except IntegrityError:
+            pass
+        assert not target.exists()
+    print("✅ SHA-256 / 멀티파트 ETag 검증")
+
+
+def test_sse_kms_etag():
+    with tempfile.TemporaryDirectory() as tmp:
+        s3 = _bucket(tmp)
+        key = "models/60d_20260101.onnx"
+        data = (s3.root / key).read_bytes()
+        target = Path(tmp) / "60d_20260101.onnx"
+
+        # SSE-KMS: ETag가 MD5가 아님 → ETag 불일치로 실패하지 않고 ChecksumSHA256으로 검증
+        s3.encryption[key] = "aws:kms"
+        s3.etags[key] = f'"{"f" * 32}"'
+        s3.checksums[key] = base64.b64encode(hashlib.sha256(data).digest()).decode()
+        result = download_object(s3, "b", key, target, part_size=1000)
+        assert result.verified == "sha256" and target.read_bytes() == data
+
+        # ChecksumSHA256 불일치 → IntegrityError, 최종 파일 없음
+        target.unlink()
+        s3.checksums[key] = base64.b64encode(b"\0" * 32).decode()
+        try:
+            download_object(s3, "b", key, target, part_size=1000)
+            raise AssertionError("체크섬 불일치가 전파되어야 함")
+        except IntegrityError:
+            pass
+        assert not target.exists()
+
+        # 체크섬 없이 업로드된 오브젝트 → 크기만 확인
+        del s3.checksums[key]
+        result = download_object(s3, "b", key, target, part_size=1000)
+        assert result.verified == "size" and target.read_bytes() == data
+    print("✅ SSE-KMS 오브젝트 ChecksumSHA256 / 크기 검증")
+
+
+def _multipart_md5(data: bytes, part_size: int) -> str:
+    return hashlib.md5(b"".join(
+        hashlib.md5(data[i:i + part_size]).digest() for i in range(0, len(data), part_size)
+    )).hexdigest()
+
+
+def test_multipart_candidates_single_pass():
+    """9MiB / 2조각: 8MiB와 5MiB 후보가 모두 가능 → 파일은 한 번만 읽음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.onnx"
+        data = bytes(range(256)) * (9 * MiB // 256)
+        path.write_bytes(data)
+
+        opened = []
+
+        def counting_open(*args, **kwargs):
+            opened.append(args[0])
+            return open(*args, **kwargs)
+
+        s3_download.open = counting_open
+        try:
+            for part_size in (8 * MiB, 5 * MiB):
+                opened.clear()
+                assert _multipart_etag_matches(path, len(data), _multipart_md5(data, part_size), 2)
+                assert opened == [path]
+            assert not _multipart_etag_matches(path, len(data), "0" * 32, 2)
+        finally:
+            del s3_download.open
+    print("✅ 멀티파트 조각 크기 후보 한 번에 계산")
+
+
+if __name__ == "__main__":
+    test_ranged_download_and_conditional_get()
+    test_resume_after_interruption()
+    test_integrity_checks()
+    test_sse_kms_etag()
+    test_multipart_candidates_single_pass()
@@ -0,0 +1,258 @@
+"""
+ORT 세션 옵션 / 최적화 모델 캐시 테스트 (모델 파일 불필요, onnx 패키지로 작은 그래프 생성)
+
+- 캐시 키: 원본 파일 이름 / 버전 태그 / ORT 버전 / 최적화 수준이 바뀌면 다른 경로
+- 두 번째 세션 생성부터는 저장된 최적화 모델을 그대로 로드 (원본 재최적화 없음)
+- 여러 스레드가 같은 모델을 동시에 최적화해도 임시 파일이 겹치지 않음
+- 정리는 원본 키 기준: 알려진 버전 / 살아 있는 파일은 개수와 상관없이 유지
+- 스레드 기본값: CPU 코어 수 / 워커 수 (최소 1), ORT_INTRA_OP_THREADS 지정 시 그 값
+- 튜닝 프로필은 처음 1번만 파일에서 읽고, auto_tune 기록 후 다시 로드
+
+실행:
+    python tests/test_session_options.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings
+from app.ml import session_options
+from app.ml.session_options import (
+    SessionProfile,
+    auto_tune,
+    create_session,
+    default_intra_op_threads,
+    get_session_profile,
+    optimized_model_path,
+    optimized_source_key,
+    profile_from_settings,
+    prune_optimized_models,
+    reload_tuned_profile,
+)
+from test_model_registry import _write_model
+
+
+def _with_cache_dir(tmp: str, test) -> None:
+    saved = (settings.ort_optimized_model_cache, settings.ort_optimized_cache_dir, settings.ort_use_tuned_profile)
+    try:
+        settings.ort_optimized_model_cache = True
+        settings.ort_optimized_cache_dir = str(Path(tmp) / "optimized")
+        settings.ort_use_tuned_profile = False
+        test()
+    finally:
+        (settings.ort_optimized_model_cache, settings.ort_optimized_cache_dir,
+         settings.ort_use_tuned_profile) = saved
+
+
+def test_optimized_cache_key():
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            profile = replace(profile_from_settings(), graph_optimization_level="all")
+            base = optimized_model_path("/m/60d_20260101.onnx", profile, "etag-1")
+            assert base == optimized_model_path("/other/60d_20260101.onnx", profile, "etag-1")
+            assert base.parent == Path(tmp) / "optimized" and base.name.endswith(".opt.onnx")
+
+            changed = [
+                optimized_model_path("/m/60d_20260102.onnx", profile, "etag-1"),
+                optimized_model_path("/m/60d_20260101.onnx", profile, "etag-2"),
+                optimized_model_path("/m/60d_20260101.onnx", replace(profile, graph_optimization_level="extended"), "etag-1"),
+            ]
+            saved_version = ort.__version__
+            try:
+                ort.__version__ = "0.0.0"
+                changed.append(optimized_model_path("/m/60d_20260101.onnx", profile, "etag-1"))
+            finally:
+                ort.__version__ = saved_version
+            assert len({base, *changed}) == 5
+
+            # 실행 환경이 달라도 원본 키는 같음 (정리 기준)
+            assert base.name.split(".")[1] == changed[2].name.split(".")[1] == optimized_source_key(
+                "60d_20260101.onnx", "etag-1"
+            )
+        _with_cache_dir(tmp, run)
+    print("✅ 최적화 캐시 키 (이름 / 버전 태그 / ORT 버전 / 최적화 수준)")
+
+
+def test_optimized_cache_reuse():
+    with tempfile.TemporaryDirectory() as tmp:
+        if not _write_model(Path(tmp), "relu.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        def run():
+            model_path = str(Path(tmp) / "relu.onnx")
+            loaded = []
+            original = session_options._new_session
+
+            def recording(path, options):
+                loaded.append((Path(path).name, options.optimized_model_filepath != ""))
+                return original(path, options)
+
+            session_options._new_session = recording
+            try:
+                first = create_session(model_path, source_tag="etag-1")
+                second = create_session(model_path, source_tag="etag-1")
+            finally:
+                session_options._new_session = original
+
+            cached = list((Path(tmp) / "optimized").glob("*.opt.onnx"))
+            assert len(cached) == 1
+            # 1번째: 원본에서 최적화 + 저장, 2번째: 캐시 파일을 그대로 로드
+            assert loaded == [("relu.onnx", True), (cached[0].name, False)]
+
+            x = np.array([[-1.0, 0.5, 2.0]], dtype=np.float32)
+            assert second.run(None, {"x": x})[0].tolist() == first.run(None, {"x": x})[0].tolist()
+        _with_cache_dir(tmp, run)
+    print("✅ 최적화 모델 캐시 재사용")
+
+
+def test_concurrent_optimization():
+    with tempfile.TemporaryDirectory() as tmp:
+        if not _write_model(Path(tmp), "relu.onnx"):
+            print("⏭️ onnx 패키지 없음 - 건너뜀")
+            return
+
+        def run():
+            # 같은 원본을 품목 여러 개가 동시에 로드 (load_all) → 모두 원본에서 최적화
+            barrier = threading.Barrier(4)
+            original = session_options._new_session
+
+            def together(path, options):
+                if options.optimized_model_filepath:
+                    barrier.wait(10)
+                return original(path, options)
+
+            warnings = []
+            handler = logging.Handler(logging.WARNING)
+            handler.emit = warnings.append
+            session_options._new_session = together
+            session_options.logger.addHandler(handler)
+            try:
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    sessions = list(pool.map(
+                        lambda _: create_session(str(Path(tmp) / "relu.onnx"), source_tag="etag-1"), range(4)
+                    ))
+            finally:
+                session_options._new_session = original
+                session_options.logger.removeHandler(handler)
+
+            # 임시 파일을 공유하면 먼저 rename한 스레드 외에는 저장 실패 경고
+            assert warnings == [], [r.getMessage() for r in warnings]
+
+            cache_dir = Path(tmp) / "optimized"
+            assert len(list(cache_dir.glob("*.opt.onnx"))) == 1
+            assert list(cache_dir.glob("*.tmp")) == []
+            x = np.array([[-1.0, 0.5, 2.0]], dtype=np.float32)
+            assert all(s.run(None, {"x": x})[0].tolist() == [[0.0, 0.5, 2.0]] for s in sessions)
+        _with_cache_dir(tmp, run)
+    print("✅ 같은 모델 동시 최적화 (스레드별 임시 파일)")
+
+
+def test_prune_by_source_key():
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            profile = profile_from_settings()
+            cache_dir = Path(tmp) / "optimized"
+            cache_dir.mkdir()
+
+            # 서빙 중 1개 + 이력 버전 10개 + 이력에서 빠진 버전 / 이전 형식 파일
+            live = optimized_model_path("a.onnx", profile, "live")
+            known = [optimized_model_path(f"m{i}.onnx", profile, f"etag-{i}") for i in range(10)]
+            stale = optimized_model_path("old.onnx", profile, "gone")
+            legacy = cache_dir / "relu.0123456789abcdef.opt.onnx"
+            for path in (live, *known, stale, legacy):
+                path.write_bytes(b"x")
+
+            sources = [optimized_source_key(f"m{i}.onnx", f"etag-{i}") for i in range(10)]
+            removed = prune_optimized_models(sources, keep=[live])
+            assert sorted(removed) == sorted([stale.name, legacy.name])
+            assert live.exists() and all(path.exists() for path in known)
+        _with_cache_dir(tmp, run)
+    print("✅ 원본 키 기준 최적화 캐시 정리")
+
+
+def test_thread_defaults():
+    saved = (settings.web_concurrency, settings.ort_intra_op_threads, settings.ort_use_tuned_profile)
+    cpu_count = os.cpu_count() or 1
+    try:
+        settings.ort_use_tuned_profile = False
+        settings.ort_intra_op_threads = 0
+        settings.web_concurrency = 1
+        assert default_intra_op_threads() == cpu_count
+        settings.web_concurrency = cpu_count * 2
+        assert default_intra_op_threads() == 1
+        assert get_session_profile().intra_op_threads == 1
+
+        settings.ort_intra_op_threads = 3
+        assert profile_from_settings().intra_op_threads == 3
+        assert get_session_profile() == profile_from_settings()
+    finally:
+        settings.web_concurrency, settings.ort_intra_op_threads, settings.ort_use_tuned_profile = saved
+    print("✅ 스레드 기본값 (코어 수 / 워커 수)")
+
+
+def test_tuned_profile_cached_until_reload():
+    saved = (settings.ort_use_tuned_profile, settings.ort_tuned_profile_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ort_profile.json"
+        path.write_text(json.dumps({"profile": {"intra_op_threads": 3, "execution_mode": "parallel"}}))
+        calls = []
+        original = session_options.load_tuned_profile
+
+        def counting(p=None):
+            calls.append(p)
+            return original(p)
+
+        try:
+            settings.ort_use_tuned_profile = True
+            settings.ort_tuned_profile_path = str(path)
+            session_options.load_tuned_profile = counting
+            reload_tuned_profile()
+            calls.clear()
+
+            # 여러 번 호출해도 파일은 다시 읽지 않음
+            for _ in range(5):
+                assert get_session_profile() == SessionProfile(intra_op_threads=3, execution_mode="parallel")
+            assert calls == []
+
+            # 파일이 바뀌어도 reload 전까지는 기존 프로필
+            path.write_text(json.dumps({"profile": {"intra_op_threads": 5}}))
+            assert get_session_profile().intra_op_threads == 3
+            assert reload_tuned_profile().intra_op_threads == 5 and len(calls) == 1
+
+            # auto_tune 기록 후 자동으로 다시 로드
+            if _write_model(Path(tmp), "relu.onnx"):
+                record = auto_tune(
+                    str(Path(tmp) / "relu.onnx"),
+                    lambda batch_size: {"x": np.ones((batch_size, 3), dtype=np.float32)},
+                    runs=1,
+                )
+                assert get_session_profile() == SessionProfile(**record["profile"])
+        finally:
+            session_options.load_tuned_profile = original
+            settings.ort_use_tuned_profile, settings.ort_tuned_profile_path = saved
+            reload_tuned_profile()
+    print("✅ 튜닝 프로필 1회 로드 / auto_tune 후 다시 로드")
+
+
+if __name__ == "__main__":
+    test_optimized_cache_key()
+    test_optimized_cache_reuse()
+    test_concurrent_optimization()
+    test_prune_by_source_key()
+    test_thread_defaults()
+    test_tuned_profile_cached_until_reload()
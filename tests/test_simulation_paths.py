@@ -0,0 +1,138 @@
+"""
+시뮬레이션 응답 7일 경로 선택 테스트 (모델 파일 / DB 불필요, 라우터만 올린 TestClient)
+
+- 기본 요청(include_paths 없음)은 경로 필드 없이 기존 응답 형태 그대로 직렬화
+- include_paths=true면 같은 추론 결과에서 원본 / 시뮬레이션 7일 경로 포함
+- 캐시에는 경로 포함 전체 응답 저장 → 경로 없는 요청 다음 경로 요청도 DB 조회 / 추론 없이 hit
+- _select_paths는 캐시된 응답을 바꾸지 않음
+
+실행:
+    python tests/test_simulation_paths.py
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import get_db
+from app.ml.cache import LRUCache
+from app.routers import simulation
+from test_tensor_builder import create_mock_historical_data
+
+# 경로 추가 전 응답 필드
+_BASE_FIELDS = {"original_forecast", "simulated_forecast", "change", "change_percent", "feature_impacts"}
+
+
+class _FakeService:
+    """1일차부터 하루 1씩 오르는 7일 예측 (USD_Index 1 = 예측 -0.5)"""
+
+    def __init__(self, model_version):
+        self.calls = 0
+        self.result_cache = LRUCache(16, name="simulation")
+        self.model_loader = SimpleNamespace(get_model_version=lambda commodity: model_version)
+
+    def sync_invalidations(self):
+        return 0
+
+    def predict_tft_batch(self, commodity, historical_data, overrides_list, base_date=None, model=None):
+        self.calls += 1
+        results = []
+        for overrides in overrides_list:
+            shift = -0.5 * ((overrides or {}).get("USD_Index", 100.0) - 100.0)
+            predictions = [450.0 + shift + day for day in range(7)]
+            results.append({
+                'predictions': predictions,
+                'lower_bounds': [v - 10.0 for v in predictions],
+                'upper_bounds': [v + 10.0 for v in predictions],
+            })
+        return results
+
+
+def _client(service: _FakeService) -> TestClient:
+    app = FastAPI()
+    app.include_router(simulation.router)
+    app.dependency_overrides[get_db] = lambda: None
+    return TestClient(app)
+
+
+def _with_fakes(test) -> None:
+    historical_data = create_mock_historical_data(60)
+    model = SimpleNamespace(version="models/60d_20260206.onnx@etag-1")
+    service = _FakeService(model.version)
+    service.loads = 0
+
+    def load_inputs(db, request):
+        service.loads += 1
+        return model, historical_data
+    saved = (simulation.get_prediction_service, simulation._load_simulation_inputs,
+             simulation._run_in_inference_executor)
+
+    async def run_inline(fn, *args):
+        return fn(*args)
+
+    try:
+        simulation.get_prediction_service = lambda: service
+        simulation._load_simulation_inputs = load_inputs
+        simulation._run_in_inference_executor = run_inline
+        test(service, _client(service))
+    finally:
+        (simulation.get_prediction_service, simulation._load_simulation_inputs,
+         simulation._run_in_inference_executor) = saved
+
+
+def test_default_response_keeps_shape():
+    def run(service, client):
+        body = {"commodity": "corn", "base_date": "2026-02-06", "feature_overrides": {"USD_Index": 110.0}}
+        response = client.post("/api/simulate", json=body)
+        assert response.status_code == 200
+        data = response.json()
+        # 경로 필드는 null이 아니라 아예 없음 (response_model_exclude_none)
+        assert set(data) == _BASE_FIELDS
+        assert (data["original_forecast"], data["simulated_forecast"], data["change"]) == (450.0, 445.0, -5.0)
+        assert set(data["feature_impacts"][0]) == {
+            "feature", "current_value", "new_value", "value_change", "contribution"
+        }
+
+        # include_paths=false 명시도 같은 형태 (캐시 hit, DB 조회 / 추론 없음)
+        response = client.post("/api/simulate", json={**body, "include_paths": False})
+        assert set(response.json()) == _BASE_FIELDS
+        assert service.calls == 1 and service.loads == 1
+    _with_fakes(run)
+    print("✅ 기본 요청 응답 형태 유지 (경로 필드 없음)")
+
+
+def test_include_paths():
+    def run(service, client):
+        body = {"commodity": "corn", "base_date": "2026-02-06", "feature_overrides": {"USD_Index": 110.0}}
+        assert set(client.post("/api/simulate", json=body).json()) == _BASE_FIELDS
+
+        # 경로 요청: 캐시된 전체 응답에서 경로 포함 (추론 없음)
+        data = client.post("/api/simulate", json={**body, "include_paths": True}).json()
+        assert service.calls == 1
+        assert set(data) == _BASE_FIELDS | {"original_path", "simulated_path"}
+        original, simulated = data["original_path"], data["simulated_path"]
+        assert original["dates"][0] == "2026-02-07" and original["dates"][-1] == "2026-02-13"
+        assert original["predictions"] == [450.0 + day for day in range(7)]
+        assert simulated["predictions"] == [445.0 + day for day in range(7)]
+        assert simulated["lower_bounds"][0] == 435.0 and simulated["upper_bounds"][0] == 455.0
+        assert data["simulated_forecast"] == simulated["predictions"][0]
+
+        # 경로를 뺀 응답이 캐시된 항목을 바꾸지 않음
+        assert set(client.post("/api/simulate", json=body).json()) == _BASE_FIELDS
+        again = client.post("/api/simulate", json={**body, "include_paths": True}).json()
+        assert again["original_path"] == original and service.calls == 1
+    _with_fakes(run)
+    print("✅ include_paths=true 7일 경로 포함 / 캐시 공유")
+
+
+if __name__ == "__main__":
+    test_default_response_keeps_shape()
+    test_include_paths()
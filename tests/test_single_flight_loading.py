@@ -0,0 +1,111 @@
+"""
+single-flight 모델 로드 테스트 (모델 파일 불필요)
+
+- 미로드 품목에 동시 요청이 몰려도 로드는 1번, 모두 같은 모델 묶음을 받음
+- 로드 실패는 대기 중인 요청 모두에 전달, 다음 요청은 다시 시도
+- S3 다운로드는 임시 파일 → rename (실패 시 최종 경로에 파일이 생기지 않음)
+
+실행:
+    python tests/test_single_flight_loading.py
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.ml.model_loader import LoadedModel, ONNXModelLoader
+from app.ml.model_store import ModelStore
+from test_s3_download import FakeS3
+
+
+class SlowLoader(ONNXModelLoader):
+    """_load_local이 느리고 호출 횟수를 세는 로더 (fail=True면 예외)"""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.mode = "local"
+        self.fail = fail
+        self.calls = 0
+
+    def _load_local(self, commodity):
+        self.calls += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise FileNotFoundError("no model")
+        model = LoadedModel(
+            commodity=commodity, session=object(), model_path=Path("m.onnx"),
+            source_tag="1", onnx_key="m.onnx",
+        )
+        self._publish(model)
+        return model
+
+
+def _call_concurrently(fn, n=8):
+    barrier = threading.Barrier(n)
+
+    def _call():
+        barrier.wait()
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(lambda _: _call(), range(n)))
+
+
+def test_concurrent_cold_load_runs_once():
+    loader = SlowLoader()
+    results = _call_concurrently(lambda: loader.get_model("corn"))
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+    assert loader._inflight == {}
+    print("✅ 동시 요청 → 로드 1번")
+
+
+def test_load_failure_is_shared_then_retried():
+    loader = SlowLoader(fail=True)
+    results = _call_concurrently(lambda: loader.get_model("corn"))
+    assert loader.calls == 1
+    assert all(isinstance(result, FileNotFoundError) for result in results)
+
+    loader.fail = False
+    assert loader.get_model("corn").onnx_key == "m.onnx"
+    assert loader.calls == 2
+    print("✅ 로드 실패 공유 / 이후 재시도")
+
+
+def test_download_is_atomic():
+    loader = ONNXModelLoader()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "bucket"
+        (root / "m").mkdir(parents=True)
+        (root / "m" / "60d_20260101.onnx").write_bytes(b"data" * 1000)
+        s3 = FakeS3(root)
+        loader.store = ModelStore(Path(tmp) / "store")
+
+        s3.fail_ranges = {0}
+        try:
+            loader._fetch(s3, "bucket", "m/60d_20260101.onnx")
+            raise AssertionError("다운로드 실패가 전파되어야 함")
+        except ConnectionError:
+            pass
+        assert not any((Path(tmp) / "store").rglob("*.onnx"))
+
+        s3.fail_ranges = set()
+        path, etag = loader._fetch(s3, "bucket", "m/60d_20260101.onnx")
+        assert etag and path.read_bytes() == b"data" * 1000
+        assert loader._fetch(s3, "bucket", "m/missing.onnx") == (None, None)
+    print("✅ 임시 파일 → rename 다운로드")
+
+if __name__ == "__main__":
+    test_concurrent_cold_load_runs_once()
+    test_load_failure_is_shared_then_retried()
+    test_download_is_atomic()
@@ -0,0 +1,119 @@
+"""
+민감도 스윕 격자 / 배치 실행 테스트 (모델 파일 / DB 불필요)
+
+- step이 구간을 나누어떨어지게 하지 않으면 stop을 넘지 않는 마지막 점까지
+- 부동소수 누적 오차가 있어도 stop이 마지막 점으로 포함
+- stop < start / step <= 0 / 격자 점 상한 초과는 400
+- 원본 + 모든 격자 점을 예측 1번(한 배치)으로 실행
+
+실행:
+    python tests/test_sweep_grid.py
+"""
+
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+from fastapi import HTTPException
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import dataschemas
+from app.config import settings
+from app.routers import simulation
+from app.routers.simulation import SimulationValidator
+from test_tensor_builder import create_mock_historical_data
+
+
+def _expect_400(start, stop, step):
+    try:
+        SimulationValidator.build_sweep_grid(start, stop, step)
+        raise AssertionError(f"400이어야 함: {start}, {stop}, {step}")
+    except HTTPException as e:
+        assert e.status_code == 400
+
+
+def test_grid_bounds():
+    # 나누어떨어짐 → 양 끝 포함
+    assert SimulationValidator.build_sweep_grid(95, 115, 1) == [float(v) for v in range(95, 116)]
+
+    # 나누어떨어지지 않음 → stop을 넘지 않는 마지막 점까지
+    assert SimulationValidator.build_sweep_grid(0.0, 1.0, 0.3) == [0.0, 0.3, 0.6, 0.9]
+
+    # 부동소수 누적: 0.3 / 0.1 = 2.9999999999999996 → stop 포함, 값은 반올림 (0.30000000000000004 아님)
+    assert SimulationValidator.build_sweep_grid(0.0, 0.3, 0.1) == [0.0, 0.1, 0.2, 0.3]
+    grid = SimulationValidator.build_sweep_grid(95, 105, 0.1)
+    assert len(grid) == 101 and grid[-1] == 105.0 and grid[3] == 95.3
+    grid = SimulationValidator.build_sweep_grid(-0.3, 0.3, 0.1)
+    assert grid == [-0.3, -0.2, -0.1, 0.0, 0.1, 0.2, 0.3]
+
+    # start == stop → 1개 점
+    assert SimulationValidator.build_sweep_grid(4.5, 4.5, 0.25) == [4.5]
+    print("✅ 스윕 격자 경계 / 부동소수 누적")
+
+
+def test_grid_rejects_invalid_ranges():
+    _expect_400(115, 95, 1)      # stop < start
+    _expect_400(95, 115, 0)      # step <= 0
+    _expect_400(95, 115, -1)
+    _expect_400(0, settings.simulation_sweep_max_points, 1)   # 상한 + 1개
+    assert len(SimulationValidator.build_sweep_grid(0, settings.simulation_sweep_max_points - 1, 1)) == \
+        settings.simulation_sweep_max_points
+    print("✅ 잘못된 스윕 범위 400")
+
+
+class _FakeService:
+    """예측 호출 기록 (1일차 예측 = 450 + USD_Index - 100)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_tft_batch(self, commodity, historical_data, overrides_list, base_date=None, model=None):
+        self.calls.append(list(overrides_list))
+        return [
+            {
+                'predictions': [450.0 + (overrides or {}).get("USD_Index", 100.0) - 100.0] * 7,
+                'lower_bounds': [440.0] * 7,
+                'upper_bounds': [460.0] * 7,
+            }
+            for overrides in overrides_list
+        ]
+
+
+def test_sweep_runs_one_batch():
+    service = _FakeService()
+    historical_data = create_mock_historical_data(60)
+    saved = (simulation.get_prediction_service, simulation._load_simulation_inputs,
+             simulation._run_in_inference_executor)
+
+    async def run_inline(fn, *args):
+        return fn(*args)
+
+    try:
+        simulation.get_prediction_service = lambda: service
+        simulation._load_simulation_inputs = lambda db, request: ("model", historical_data)
+        simulation._run_in_inference_executor = run_inline
+
+        request = dataschemas.SimulationSweepRequest(
+            commodity="corn", base_date=date(2026, 2, 6), feature="USD_Index", start=95, stop=105, step=2.5
+        )
+        response = asyncio.run(simulation.simulate_sweep(request, db=None))
+    finally:
+        (simulation.get_prediction_service, simulation._load_simulation_inputs,
+         simulation._run_in_inference_executor) = saved
+
+    # 원본 + 격자 5개 → 예측 1번
+    assert service.calls == [[None] + [{"USD_Index": v} for v in (95.0, 97.5, 100.0, 102.5, 105.0)]]
+    assert [p.value for p in response.points] == [95.0, 97.5, 100.0, 102.5, 105.0]
+    assert response.original_forecast == 450.0
+    assert [p.change for p in response.points] == [-5.0, -2.5, 0.0, 2.5, 5.0]
+    print("✅ 스윕 = 예측 1번 (한 배치)")
+
+
+if __name__ == "__main__":
+    test_grid_bounds()
+    test_grid_rejects_invalid_ranges()
+    test_sweep_runs_one_batch()
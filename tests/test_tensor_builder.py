@@ -0,0 +1,213 @@
+"""
+TFT 입력 텐서 빌더 검증 + 마이크로 벤치마크
+
+기존 셀 단위(시점 × feature) 빌더를 참조 구현으로 두고,
+NumPy 벡터화 빌더의 출력이 비트 단위로 동일한지 확인합니다.
+(day_of_year는 실제 날짜 기준으로 바뀌어 별도 테스트로 확인)
+모델 파일 없이 실행됩니다.
+
+실행:
+    python tests/test_tensor_builder.py
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ml.prediction_service import ONNXPredictionService, TFTFeatureConfig
+
+
+# ===========================================
+# 참조 구현 (기존 셀 단위 빌더)
+# ===========================================
+
+class LegacyTensorBuilder:
+    """기존 _get_feature_vector_at_index → _get_feature_value 경로"""
+
+    def __init__(self):
+        self.feature_config = TFTFeatureConfig()
+
+    def build(self, historical_data, feature_overrides=None):
+        features = historical_data['features'].copy()
+        if feature_overrides:
+            for key, value in feature_overrides.items():
+                if key in features:
+                    features[key] = [value] * len(features[key])
+
+        enc_len = self.feature_config.ENCODER_LENGTH
+        encoder = [self._vector(features, i, True) for i in range(enc_len)]
+        decoder = [
+            self._vector(features, enc_len + i, False)
+            for i in range(self.feature_config.DECODER_LENGTH)
+        ]
+        return (
+            np.array([encoder], dtype=np.float32),
+            np.array([decoder], dtype=np.float32),
+        )
+
+    def _vector(self, features, time_idx, is_encoder):
+        return [
+            self._value(features, fname, time_idx, is_encoder)
+            for fname in self.feature_config.FEATURE_ORDER
+        ]
+
+    def _value(self, features, feature_name, time_idx, is_encoder):
+        config = self.feature_config
+        if feature_name == 'encoder_length':
+            return float(config.ENCODER_LENGTH)
+        elif feature_name == 'close_scale':
+            return config.DEFAULT_SCALE_VALUE
+        elif feature_name == 'close_center':
+            if 'close' in features and time_idx < len(features['close']):
+                return features['close'][time_idx]
+            return config.DEFAULT_CLOSE_VALUE
+        elif feature_name == 'time_idx':
+            return float(time_idx)
+        elif feature_name == 'day_of_year':
+            if is_encoder:
+                target = datetime.now() - timedelta(days=config.ENCODER_LENGTH - time_idx)
+            else:
+                target = datetime.now() + timedelta(days=time_idx - config.ENCODER_LENGTH)
+            return float(target.timetuple().tm_yday)
+        elif feature_name == 'relative_time_idx':
+            total = config.ENCODER_LENGTH + config.DECODER_LENGTH
+            return float(time_idx) / float(total)
+        elif not is_encoder and feature_name not in config.KNOWN_FEATURES:
+            return 0.0
+        elif feature_name in features:
+            if time_idx < len(features[feature_name]):
+                return features[feature_name][time_idx]
+            return 0.0
+        return 0.0
+
+
+# ===========================================
+# Mock 데이터
+# ===========================================
+
+def create_mock_historical_data(days=60, seed=0, drop=()):
+    """feature_order 기준 랜덤 시계열 (일부 feature 누락 가능)"""
+    rng = np.random.default_rng(seed)
+    names = [
+        name for name in TFTFeatureConfig.FEATURE_ORDER
+        if name not in TFTFeatureConfig.KNOWN_FEATURES and name not in drop
+    ]
+    dates = [
+        str((datetime.now() - timedelta(days=days - i)).date()) for i in range(days)
+    ]
+    features = {name: (rng.normal(size=days) * 100).tolist() for name in names}
+    return {'dates': dates, 'features': features}
+
+
+CASES = [
+    ("60일 / override 없음", dict(days=60), None),
+    ("60일 / 거시 override", dict(days=60), {"10Y_Yield": 5.0, "USD_Index": 110.0}),
+    ("42일 (주말 제외)", dict(days=42), {"pdsi": -3.0}),
+    ("75일 (초과 구간)", dict(days=75), {"close": 480.0}),
+    ("feature 누락", dict(days=60, drop=('close', 'news_pca_3')), {"spi30d": -2.0}),
+]
+
+
+def test_builder_matches_legacy():
+    """벡터화 빌더 == 기존 빌더 (비트 단위, day_of_year 제외)"""
+    service = ONNXPredictionService()
+    legacy = LegacyTensorBuilder()
+    columns = [
+        i for i, fname in enumerate(TFTFeatureConfig.FEATURE_ORDER) if fname != 'day_of_year'
+    ]
+
+    for name, data_kwargs, overrides in CASES:
+        historical_data = create_mock_historical_data(**data_kwargs)
+        expected_enc, expected_dec = legacy.build(historical_data, overrides)
+        inputs = service._prepare_model_inputs(historical_data, overrides)
+
+        assert inputs['encoder_cont'].dtype == np.float32, name
+        assert inputs['encoder_cont'].shape == expected_enc.shape, name
+        assert inputs['decoder_cont'].shape == expected_dec.shape, name
+        assert inputs['encoder_cont'][..., columns].tobytes() == expected_enc[..., columns].tobytes(), name
+        assert inputs['decoder_cont'][..., columns].tobytes() == expected_dec[..., columns].tobytes(), name
+        print(f"✅ {name}: 동일")
+
+
+def test_calendar_features_from_dates():
+    """day_of_year는 실제 날짜(주말 공백 포함) + 기준일 이후 7일로 계산"""
+    service = ONNXPredictionService()
+    config = TFTFeatureConfig()
+    doy = TFTFeatureConfig.FEATURE_ORDER.index('day_of_year')
+
+    # 연말을 걸친 평일만의 윈도우 (2024-11-01 ~ 2024-12-31 중 평일 43일)
+    start = datetime(2024, 11, 1)
+    all_days = [start + timedelta(days=i) for i in range(61)]
+    dates = [str(d.date()) for d in all_days if d.weekday() < 5]
+    historical_data = create_mock_historical_data(len(dates))
+    historical_data['dates'] = dates
+    base_date = datetime(2024, 12, 31).date()
+
+    inputs = service._prepare_batch_inputs(historical_data, [None], base_date)
+    encoder_doy = inputs['encoder_cont'][0, :, doy]
+    decoder_doy = inputs['decoder_cont'][0, :, doy]
+
+    expected = [float(datetime.strptime(d, "%Y-%m-%d").timetuple().tm_yday) for d in dates]
+    assert encoder_doy[:len(dates)].tolist() == expected
+    # 관측이 모자란 뒤쪽 행은 마지막 관측일 이후로 하루씩
+    assert encoder_doy[len(dates)] == 1.0  # 2025-01-01
+    # 디코더: 2025-01-01 ~ 2025-01-07
+    assert decoder_doy.tolist() == [float(i) for i in range(1, config.DECODER_LENGTH + 1)]
+
+    # 같은 (기준일, 윈도우)는 캐시 재사용
+    hits = service.calendar_cache.stats()["hits"]
+    service._prepare_batch_inputs(historical_data, [None, {"pdsi": -1.0}], base_date)
+    assert service.calendar_cache.stats()["hits"] == hits + 1
+    print("✅ 달력 feature: 실제 날짜 / 연말 경계 / 캐시 재사용")
+
+
+def test_batch_rows_match_single():
+    """배치 입력의 각 행 == 시나리오별 단건 입력"""
+    service = ONNXPredictionService()
+    historical_data = create_mock_historical_data(60)
+    overrides_list = [None, {"USD_Index": 105.0}, {"USD_Index": 110.0, "pdsi": -2.0}]
+
+    batch_inputs = service._prepare_batch_inputs(historical_data, overrides_list)
+
+    for b, overrides in enumerate(overrides_list):
+        single_inputs = service._prepare_model_inputs(historical_data, overrides)
+        for name, array in single_inputs.items():
+            assert batch_inputs[name].shape[0] == len(overrides_list), name
+            assert batch_inputs[name][b:b + 1].tobytes() == array.tobytes(), name
+    print(f"✅ 배치 입력 {len(overrides_list)}행: 단건 입력과 동일")
+
+
+def benchmark(repeat=200):
+    """기존 빌더 vs 벡터화 빌더 소요 시간 비교"""
+    service = ONNXPredictionService()
+    legacy = LegacyTensorBuilder()
+    historical_data = create_mock_historical_data(60)
+    overrides = {"10Y_Yield": 5.0}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy.build(historical_data, overrides)
+    legacy_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        service._prepare_model_inputs(historical_data, overrides)
+    vectorized_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"\n⏱️ 텐서 빌드 ({repeat}회 평균)")
+    print(f"   기존 빌더:     {legacy_ms:8.3f} ms")
+    print(f"   벡터화 빌더:   {vectorized_ms:8.3f} ms")
+    print(f"   속도 향상:     {legacy_ms / vectorized_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    test_builder_matches_legacy()
+    test_calendar_features_from_dates()
+    test_batch_rows_match_single()
+    benchmark()